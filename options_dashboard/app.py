@@ -1,11 +1,9 @@
 from pathlib import Path
+import multiprocessing
 import os
 
 import customtkinter as ctk
 
-# Set appearance mode early (lightweight)
-ctk.set_appearance_mode("dark")  # "dark", "light", or "system"
-
 # Defer heavy imports until after root window is created
 # This allows the window to appear faster
 def initialize_app():
@@ -36,39 +34,28 @@ def initialize_app():
     
     return AuthMenu, Dashboard, get_state_value, save_app_state, STATE_FILE, schwab_tokens_exist, create_authenticated_client, is_refresh_token_valid
 
-# -----------------------------
-# Root window (create early for faster UI appearance)
-# -----------------------------
-root = ctk.CTk()
-root.title("Options Dashboard")
-root.geometry("1400x700")
-root.minsize(1200, 650)
+def main():
+    # Set appearance mode early (lightweight)
+    ctk.set_appearance_mode("dark")  # "dark", "light", or "system"
 
-# Initialize app components (deferred to after window creation)
-AuthMenu, Dashboard, get_state_value, save_app_state, STATE_FILE, schwab_tokens_exist, create_authenticated_client, is_refresh_token_valid = initialize_app()
-from style.custom_theme_controller import list_available_themes
+    # -----------------------------
+    # Root window (create early for faster UI appearance)
+    # -----------------------------
+    root = ctk.CTk()
+    root.title("Options Dashboard")
+    root.geometry("1400x700")
+    root.minsize(1200, 650)
 
-def start_dashboard(client):
-    # Create app_state.json if it doesn't exist (first-time user)
-    if not os.path.exists(STATE_FILE):
-        # Use cached themes if available, otherwise get them
-        themes = list_available_themes()
-        default_theme = themes[0] if themes else "breeze"
-        initial_state = {
-            "color_theme": default_theme,
-            "exposure_model": "Gamma"
-        }
-        save_app_state(initial_state)
-    
-    auth.destroy()
-    Dashboard(root, client)
+    # Initialize app components (deferred to after window creation)
+    AuthMenu, Dashboard, get_state_value, save_app_state, STATE_FILE, schwab_tokens_exist, create_authenticated_client, is_refresh_token_valid = initialize_app()
+    from style.custom_theme_controller import list_available_themes
+
+    auth = None
 
-if schwab_tokens_exist():
-    # Check if refresh token is still valid
-    if is_refresh_token_valid():
-        # Create app_state.json if it doesn't exist (for users upgrading)
+    def start_dashboard(client):
+        # Create app_state.json if it doesn't exist (first-time user)
         if not os.path.exists(STATE_FILE):
-            # Use cached themes if available
+            # Use cached themes if available, otherwise get them
             themes = list_available_themes()
             default_theme = themes[0] if themes else "breeze"
             initial_state = {
@@ -77,12 +64,36 @@ if schwab_tokens_exist():
             }
             save_app_state(initial_state)
         
-        client = create_authenticated_client()
+        auth.destroy()
         Dashboard(root, client)
+
+    if schwab_tokens_exist():
+        # Check if refresh token is still valid
+        if is_refresh_token_valid():
+            # Create app_state.json if it doesn't exist (for users upgrading)
+            if not os.path.exists(STATE_FILE):
+                # Use cached themes if available
+                themes = list_available_themes()
+                default_theme = themes[0] if themes else "breeze"
+                initial_state = {
+                    "color_theme": default_theme,
+                    "exposure_model": "Gamma"
+                }
+                save_app_state(initial_state)
+            
+            client = create_authenticated_client()
+            Dashboard(root, client)
+        else:
+            # Refresh token has expired, show login window
+            auth = AuthMenu(root, start_dashboard)
     else:
-        # Refresh token has expired, show login window
         auth = AuthMenu(root, start_dashboard)
-else:
-    auth = AuthMenu(root, start_dashboard)
 
-root.mainloop()
+    root.mainloop()
+
+
+# Worker processes (chart export, Heston multi-start) import this module
+# under the spawn start method; only the launching process runs the app.
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
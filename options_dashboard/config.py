@@ -7,3 +7,9 @@ CONTRACT_MULTIPLIER = 100
 MAX_TICKERS = 24
 PRESET_FILE = "preset_tickers.json"
 STATE_FILE = "app_state.json"
+
+# Live chart windows: redraw work per Tk tick is capped at this many
+# milliseconds (override with the "live_chart_frame_budget_ms" app setting);
+# windows still dirty after a tick wait LIVE_CHART_TICK_MS for the next one
+LIVE_CHART_FRAME_BUDGET_MS = 12
+LIVE_CHART_TICK_MS = 50
@@ -0,0 +1,162 @@
+"""
+Warm-start cache of calibrated Heston parameters.
+
+Fits are stored per (symbol, expiry bucket) with a timestamp and fit error,
+so an intraday recalibration can seed from the last solution and skip the
+optimizer entirely when the market has barely moved.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from models.data_analysis.pricing_models.heston import (
+    CALIBRATED_PARAMS,
+    _valid_quotes,
+    calibrate_heston_parameters,
+    calibration_error
+)
+
+
+# Expiry buckets (upper bound in calendar days, label)
+EXPIRY_BUCKETS = (
+    (7, "0-7d"),
+    (30, "8-30d"),
+    (90, "31-90d"),
+    (180, "91-180d"),
+    (float("inf"), "180d+"),
+)
+
+MAX_ENTRY_AGE = 24 * 3600        # Seconds before a cached fit is ignored
+REUSE_TOLERANCE = 0.25           # Reuse if per-quote error grew by less than 25%...
+MIN_ERROR_PER_QUOTE = 1e-4       # ...or is below this absolute floor
+WARM_START_MAXITER = 50          # Iteration cap when refining from a cached fit
+
+
+def get_calibration_cache_path():
+    """Get the absolute path to the calibration cache file"""
+    data_analysis_dir = Path(__file__).resolve().parent.parent
+    return data_analysis_dir / "settings" / "heston_calibrations.json"
+
+
+def expiry_bucket(T):
+    """Bucket label for a time to expiration in years"""
+    days = T * 365.0
+    for upper, label in EXPIRY_BUCKETS:
+        if days <= upper:
+            return label
+    return EXPIRY_BUCKETS[-1][1]
+
+
+class CalibrationCache:
+    """Per-(symbol, expiry bucket) calibrated parameters, persisted as JSON."""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_calibration_cache_path()
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _key(self, symbol, T):
+        return f"{symbol.upper()}|{expiry_bucket(T)}"
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            if self.path.exists():
+                try:
+                    with open(self.path, "r") as f:
+                        self._entries = json.load(f)
+                except Exception as e:
+                    print(f"Failed to load calibration cache: {e}")
+        return self._entries
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump(self._entries, f, indent=2)
+        except Exception as e:
+            print(f"Failed to save calibration cache: {e}")
+
+    def get(self, symbol, T, max_age=MAX_ENTRY_AGE, now=None):
+        """Cached entry for symbol/expiry bucket, or None if missing or stale"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._load().get(self._key(symbol, T))
+        if not entry or now - entry.get("timestamp", 0) > max_age:
+            return None
+        return entry
+
+    def put(self, symbol, T, result, n_quotes, spot):
+        """Store a calibration result dict for symbol/expiry bucket"""
+        entry = {name: float(result[name]) for name in CALIBRATED_PARAMS}
+        entry.update(
+            fun=float(result["fun"]),
+            n_quotes=int(n_quotes),
+            spot=float(spot),
+            timestamp=time.time(),
+        )
+        with self._lock:
+            self._load()[self._key(symbol, T)] = entry
+            self._save()
+        return entry
+
+
+_default_cache = None
+
+
+def get_calibration_cache():
+    """Process-wide calibration cache"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CalibrationCache()
+    return _default_cache
+
+
+def calibrate_with_warm_start(symbol, S0, strikes, market_prices, T, r, q, v0,
+                              cache=None, calibrate=calibrate_heston_parameters, **kwargs):
+    """
+    Calibrate, seeding from the cached fit for (symbol, expiry bucket).
+
+    If the cached parameters still price the current quotes about as well as
+    when they were fitted (per-quote error within REUSE_TOLERANCE, or below
+    MIN_ERROR_PER_QUOTE) they are returned without running the optimizer.
+    Otherwise the optimizer starts from them with a reduced iteration cap.
+    Fresh results are written back to the cache.
+
+    calibrate defaults to calibrate_heston_parameters and may be any
+    calibrator with the same signature (e.g. calibrate_heston_multistart).
+    The returned dict carries 'warm_start' (bool) and 'reused' (bool).
+    """
+    cache = cache or get_calibration_cache()
+    strikes, market_prices = _valid_quotes(strikes, market_prices)
+    engine = kwargs.get("engine")
+
+    entry = cache.get(symbol, T)
+    if entry is not None:
+        params = [entry[name] for name in CALIBRATED_PARAMS]
+        error = calibration_error(S0, strikes, market_prices, T, r, q, v0, params, engine=engine)
+        if len(strikes) and np.isfinite(error):
+            per_quote = error / len(strikes)
+            cached_per_quote = entry["fun"] / max(entry.get("n_quotes", len(strikes)), 1)
+            if per_quote <= max(cached_per_quote * (1 + REUSE_TOLERANCE), MIN_ERROR_PER_QUOTE):
+                result = dict(zip(CALIBRATED_PARAMS, params))
+                result.update(
+                    success=True,
+                    message="Market moved little since the cached fit; reused cached parameters",
+                    fun=float(error),
+                    nit=0,
+                    warm_start=True,
+                    reused=True,
+                )
+                return result
+
+        kwargs.update(zip(("kappa_init", "theta_init", "sigma_v_init", "rho_init"), params))
+        kwargs["maxiter"] = min(kwargs.get("maxiter", WARM_START_MAXITER), WARM_START_MAXITER)
+
+    result = calibrate(S0, strikes, market_prices, T, r, q, v0, **kwargs)
+    cache.put(symbol, T, result, n_quotes=len(strikes), spot=S0)
+    return dict(result, warm_start=entry is not None, reused=False)
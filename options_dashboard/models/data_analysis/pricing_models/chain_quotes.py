@@ -0,0 +1,59 @@
+"""
+Market inputs for Heston pricing read from one expiration's option chain.
+"""
+
+import numpy as np
+import pandas as pd
+
+from models.iv_surface import normalize_iv
+
+
+def numeric_column(df, column):
+    """Column as floats, with blanks/missing columns as 0"""
+    if column not in df.columns:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[column], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+
+def chain_call_quotes(df, S0, T, r, q):
+    """
+    Strikes and call mid prices from one expiration's option chain.
+
+    Uses the call mid where both call quotes are positive, otherwise the put
+    mid converted to a call price via put-call parity.
+    """
+    strikes = numeric_column(df, "Strike")
+    call_mid = (numeric_column(df, "Bid_Call") + numeric_column(df, "Ask_Call")) / 2.0
+    put_mid = (numeric_column(df, "Bid_Put") + numeric_column(df, "Ask_Put")) / 2.0
+    has_call = (numeric_column(df, "Bid_Call") > 0) & (numeric_column(df, "Ask_Call") > 0)
+    has_put = (numeric_column(df, "Bid_Put") > 0) & (numeric_column(df, "Ask_Put") > 0)
+    
+    parity_call = put_mid + S0 * np.exp(-q * T) - strikes * np.exp(-r * T)
+    prices = np.where(has_call, call_mid, parity_call)
+    valid = (strikes > 0) & (has_call | has_put) & (prices > 0)
+    return strikes[valid], prices[valid]
+
+
+def chain_v0(df):
+    """Initial variance: mean squared IV over calls and puts (None if no IVs)"""
+    ivs = normalize_iv(np.concatenate((numeric_column(df, "IV_Call"), numeric_column(df, "IV_Put"))))
+    ivs = ivs[ivs > 0]
+    if ivs.size == 0:
+        return None
+    return float(np.mean(ivs**2))
+
+
+def initial_variance(state, exp):
+    """
+    Heston v0 estimate for one expiration of a TickerState.
+
+    ATM-forward implied variance from the ticker's IV surface, falling back
+    to chain_v0 when the surface has no value.
+    """
+    from utils.time import time_to_expiration
+    
+    v0 = state.iv_surface().atm_variance(time_to_expiration(exp))
+    if v0 is not None and np.isfinite(v0) and v0 > 0:
+        return v0
+    df = state.exp_data_map.get(exp)
+    return chain_v0(df) if df is not None else None
@@ -0,0 +1,59 @@
+import numpy as np
+
+from models.data_analysis.pricing_models.heston import (
+    heston_call_price,
+    heston_call_prices,
+    heston_call_prices_with_gradient
+)
+from models.data_analysis.pricing_models.heston_fft import (
+    heston_fft_call_prices,
+    heston_fft_call_prices_with_gradient
+)
+
+
+# === PRICING ENGINE REGISTRY ===
+# Every engine prices a vector of call strikes with the signature
+#   engine(S, strikes, T, r, q, v0, kappa, theta, sigma, rho) -> np.ndarray
+
+def quad_call_prices(S, strikes, T, r, q, v0, kappa, theta, sigma, rho):
+    """Reference engine: adaptive quadrature, one strike at a time."""
+    strikes = np.asarray(strikes, dtype=float)
+    prices = [heston_call_price(S, K, T, r, q, v0, kappa, theta, sigma, rho) for K in strikes.ravel()]
+    return np.array(prices, dtype=float).reshape(strikes.shape)
+
+
+PRICING_ENGINES = {
+    "fft": heston_fft_call_prices,
+    "laguerre": heston_call_prices,
+    "quad": quad_call_prices,
+}
+
+# Engines that also return analytic derivatives w.r.t. (kappa, theta, sigma_v, rho, v0):
+#   engine(...) -> (prices, jac) with jac shaped (5, n_strikes)
+GRADIENT_ENGINES = {
+    "fft": heston_fft_call_prices_with_gradient,
+    "laguerre": heston_call_prices_with_gradient,
+}
+
+# Labels shown in the Heston window, keyed by engine name
+ENGINE_LABELS = {
+    "fft": "Carr-Madan FFT",
+    "laguerre": "Gauss-Laguerre",
+    "quad": "Adaptive Quadrature",
+}
+
+DEFAULT_ENGINE = "fft"
+
+
+def get_pricing_engine(name=None):
+    """Return the pricing function for an engine name (default: FFT)."""
+    name = name or DEFAULT_ENGINE
+    try:
+        return PRICING_ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown pricing engine: {name!r} (choose from {', '.join(PRICING_ENGINES)})")
+
+
+def get_gradient_engine(name=None):
+    """Return the price-and-gradient function for an engine, or None if it has none."""
+    return GRADIENT_ENGINES.get(name or DEFAULT_ENGINE)
@@ -1,4 +1,10 @@
+import os
+import multiprocessing
+import queue as queue_module
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from scipy.integrate import quad
 from scipy.optimize import minimize
 from numpy import exp, log, sqrt, real
@@ -6,21 +12,80 @@ from math import pi
 
 # === HESTON PRICER CORE ===
 def heston_cf(u, S, T, r, q, v0, kappa, theta, sigma, rho):
-    """Characteristic function of log price under Heston."""
+    """
+    Characteristic function of log price under Heston.
+
+    Uses the "little Heston trap" form (Albrecher et al.): exp(-d*T) and
+    g = (b - d)/(b + d) keep the complex log on its principal branch, so the
+    CF stays continuous in u for long maturities.
+    """
     i = complex(0, 1)
     a = kappa * theta
-    b = kappa
-    d = np.sqrt((rho*sigma*i*u - b)**2 - sigma**2*(2*i*u*u + u**2))
-    g = (b - rho*sigma*i*u + d)/(b - rho*sigma*i*u - d)
-    C = (r - q)*i*u*T + (a/sigma**2)*((b - rho*sigma*i*u + d)*T - 2*np.log((1-g*np.exp(d*T))/(1-g)))
-    D = ((b - rho*sigma*i*u + d)/sigma**2)*((1 - np.exp(d*T))/(1 - g*np.exp(d*T)))
+    b = kappa - rho*sigma*i*u
+    d = np.sqrt(b**2 + sigma**2*(i*u + u**2))
+    g = (b - d)/(b + d)
+    e = np.exp(-d*T)
+    C = (r - q)*i*u*T + (a/sigma**2)*((b - d)*T - 2*np.log((1 - g*e)/(1 - g)))
+    D = ((b - d)/sigma**2)*((1 - e)/(1 - g*e))
     return np.exp(C + D*v0 + i*u*np.log(S))
 
+# Parameters fitted by single-expiry calibration
+CALIBRATED_PARAMS = ("kappa", "theta", "sigma_v", "rho")
+# Row order of the analytic gradients (v0 is also fitted by surface calibration)
+GRADIENT_PARAMS = CALIBRATED_PARAMS + ("v0",)
+
+def heston_cf_gradient(u, S, T, r, q, v0, kappa, theta, sigma, rho):
+    """
+    Heston CF and its analytic derivatives w.r.t. kappa, theta, sigma, rho, v0.
+
+    Differentiates the little-trap form of heston_cf term by term. Returns
+    (phi, dphi) where dphi has one row per entry of GRADIENT_PARAMS.
+    """
+    i = complex(0, 1)
+    u = np.asarray(u)
+    iu = i*u
+    a = kappa * theta
+    b = kappa - rho*sigma*iu
+    h = iu + u**2
+    d = np.sqrt(b**2 + sigma**2*h)
+    g = (b - d)/(b + d)
+    e = np.exp(-d*T)
+    one_ge = 1 - g*e
+    L = np.log(one_ge/(1 - g))
+    F = (1 - e)/one_ge
+    C = (r - q)*iu*T + (a/sigma**2)*((b - d)*T - 2*L)
+    D = ((b - d)/sigma**2)*F
+    phi = np.exp(C + D*v0 + iu*np.log(S))
+
+    zero = np.zeros_like(b)
+    # d(b)/dp and d(a/sigma^2)/dp for p = kappa, theta, sigma, rho
+    db = (np.ones_like(b), zero, -rho*iu, -sigma*iu)
+    da = (theta/sigma**2, kappa/sigma**2, -2*a/sigma**3, 0.0)
+
+    dphi = np.empty((5,) + b.shape, dtype=complex)
+    for k in range(4):
+        dd = (b*db[k] + (sigma*h if k == 2 else 0))/d
+        dg = 2*(d*db[k] - b*dd)/(b + d)**2
+        de = -T*e*dd
+        dL = -(dg*e + g*de)/one_ge + dg/(1 - g)
+        dF = (-de*one_ge + (1 - e)*(dg*e + g*de))/one_ge**2
+        dC = da[k]*((b - d)*T - 2*L) + (a/sigma**2)*((db[k] - dd)*T - 2*dL)
+        dbd = (db[k] - dd)/sigma**2
+        if k == 2:
+            dbd = dbd - 2*(b - d)/sigma**3
+        dD = dbd*F + ((b - d)/sigma**2)*dF
+        dphi[k] = phi*(dC + v0*dD)
+    dphi[4] = phi*D
+    return phi, dphi
+
 def heston_prob(j, S, K, T, r, q, v0, kappa, theta, sigma, rho):
     """P1 and P2 integrals."""
     i = complex(0, 1)
+    # P1 is taken under the share measure, so phi(u - i) is normalised by
+    # phi(-i) = S*exp((r - q)*T), the forward price.
+    norm = S*np.exp((r - q)*T) if j == 1 else 1.0
     def integrand(u):
-        phi = heston_cf(u - i*(j==1), S, T, r, q, v0, kappa, theta, sigma, rho)
+        phi = heston_cf(u - i*(j==1), S, T, r, q, v0, kappa, theta, sigma, rho) / norm
         num = np.exp(-i*u*np.log(K))*phi
         denom = i*u
         return real(num/denom)
@@ -34,62 +99,218 @@ def heston_call_price(S, K, T, r, q, v0, kappa, theta, sigma, rho):
     P2 = heston_prob(2, S, K, T, r, q, v0, kappa, theta, sigma, rho)
     return S*np.exp(-q*T)*P1 - K*np.exp(-r*T)*P2
 
-# === NUMERICAL GREEKS ===
-def heston_greeks(S, K, T, r, q, v0, kappa, theta, sigma, rho, greek="gamma", h=1e-4):
-    """Finite difference approximation of chosen Greek."""
-    if greek.lower() == "gamma":
-        C_plus = heston_call_price(S*(1+h), K, T, r, q, v0, kappa, theta, sigma, rho)
-        C_0    = heston_call_price(S,       K, T, r, q, v0, kappa, theta, sigma, rho)
-        C_minus= heston_call_price(S*(1-h), K, T, r, q, v0, kappa, theta, sigma, rho)
-        return (C_plus - 2*C_0 + C_minus)/(S*h)**2
-    elif greek.lower() == "vega":
-        C_plus = heston_call_price(S, K, T, r, q, v0*(1+h), kappa, theta, sigma, rho)
-        C_minus= heston_call_price(S, K, T, r, q, v0*(1-h), kappa, theta, sigma, rho)
-        return (C_plus - C_minus)/(2*v0*h)
-    elif greek.lower() == "vanna":
-        dS = S*h
-        dV = v0*h
-        C_pp = heston_call_price(S+dS, K, T, r, q, v0+dV, kappa, theta, sigma, rho)
-        C_pm = heston_call_price(S+dS, K, T, r, q, v0-dV, kappa, theta, sigma, rho)
-        C_mp = heston_call_price(S-dS, K, T, r, q, v0+dV, kappa, theta, sigma, rho)
-        C_mm = heston_call_price(S-dS, K, T, r, q, v0-dV, kappa, theta, sigma, rho)
-        return (C_pp - C_pm - C_mp + C_mm)/(4*dS*dV)
-    elif greek.lower() == "charm":
-        C_plus = heston_call_price(S, K, T*(1+h), r, q, v0, kappa, theta, sigma, rho)
-        C_minus= heston_call_price(S, K, T*(1-h), r, q, v0, kappa, theta, sigma, rho)
-        return (C_plus - C_minus)/(2*T*h)
-    else:
-        raise ValueError("Unknown greek: choose 'gamma', 'vega', 'vanna', 'charm'")
+# === VECTORIZED PRICER (FIXED GAUSS-LAGUERRE GRID) ===
+DEFAULT_LAGUERRE_NODES = 96
+_laguerre_grids = {}
+
+def laguerre_grid(n_nodes=DEFAULT_LAGUERRE_NODES):
+    """
+    Gauss-Laguerre nodes and weights for integrals over [0, inf).
+
+    The weights are pre-multiplied by exp(x) so that sum(w * f(x)) approximates
+    the plain integral of f. Grids are cached per node count.
+
+    Raises ValueError when NumPy cannot build the grid in double precision
+    (beyond about 185 nodes the outer weights underflow to zero).
+    """
+    grid = _laguerre_grids.get(n_nodes)
+    if grid is None:
+        if int(n_nodes) != n_nodes or n_nodes < 1:
+            raise ValueError(f"n_nodes must be a positive integer, got {n_nodes!r}")
+        with np.errstate(all='ignore'):
+            x, w = np.polynomial.laguerre.laggauss(int(n_nodes))
+            # exp(x) overflows on the outer nodes where w underflows; the product does not
+            scaled = np.exp(np.log(w) + x)
+        if not (np.all(np.isfinite(x)) and np.all(w > 0) and np.all(np.isfinite(scaled))):
+            raise ValueError(f"Gauss-Laguerre grid with {n_nodes} nodes is not representable in double precision")
+        grid = (x, scaled)
+        _laguerre_grids[n_nodes] = grid
+    return grid
+
+@lru_cache(maxsize=256)
+def _laguerre_cf(n_nodes, T, r, q, v0, kappa, theta, sigma, rho):
+    """
+    CF of the log return on the Laguerre grid for one (T, params) set.
+
+    Spot and strike only enter through exp(i*u*log(S/K)), so the result is
+    shared by every strike, both probabilities and any spot.
+    """
+    u, _ = laguerre_grid(n_nodes)
+    # One CF call covers both probabilities: phi(u - i) for P1, phi(u) for P2
+    phi = heston_cf(np.concatenate((u - 1j, u)), 1.0, T, r, q, v0, kappa, theta, sigma, rho)
+    phi1 = phi[:n_nodes] / np.exp((r - q)*T)
+    phi2 = phi[n_nodes:]
+    phi1.flags.writeable = False
+    phi2.flags.writeable = False
+    return phi1, phi2
+
+def heston_call_prices(S, strikes, T, r, q, v0, kappa, theta, sigma, rho,
+                       n_nodes=DEFAULT_LAGUERRE_NODES):
+    """
+    European call prices for a whole strike vector under Heston.
+
+    Same P1/P2 formulation as heston_call_price, but the characteristic
+    function is evaluated once on a fixed Gauss-Laguerre grid shared by every
+    strike, so pricing a smile is a handful of array operations instead of
+    two adaptive quadratures per strike.
+    """
+    strikes = np.asarray(strikes, dtype=float)
+    u, w = laguerre_grid(n_nodes)
+    phi1, phi2 = _laguerre_cf(n_nodes, float(T), float(r), float(q), float(v0),
+                              float(kappa), float(theta), float(sigma), float(rho))
+    kernel = np.exp(1j*np.outer(np.log(S/strikes).ravel(), u)) / (1j*u)
+    P1 = 0.5 + (real(kernel*phi1) @ w)/pi
+    P2 = 0.5 + (real(kernel*phi2) @ w)/pi
+    prices = S*np.exp(-q*T)*P1 - strikes.ravel()*np.exp(-r*T)*P2
+    return prices.reshape(strikes.shape)
+
+@lru_cache(maxsize=64)
+def _laguerre_cf_gradient(n_nodes, T, r, q, v0, kappa, theta, sigma, rho):
+    """Like _laguerre_cf, with the parameter derivatives of both CFs."""
+    u, _ = laguerre_grid(n_nodes)
+    phi, dphi = heston_cf_gradient(np.concatenate((u - 1j, u)), 1.0, T, r, q, v0, kappa, theta, sigma, rho)
+    fwd = np.exp((r - q)*T)
+    out = (phi[:n_nodes]/fwd, phi[n_nodes:], dphi[:, :n_nodes]/fwd, dphi[:, n_nodes:])
+    for arr in out:
+        arr.flags.writeable = False
+    return out
+
+def heston_call_prices_with_gradient(S, strikes, T, r, q, v0, kappa, theta, sigma, rho,
+                                     n_nodes=DEFAULT_LAGUERRE_NODES):
+    """
+    heston_call_prices plus analytic price derivatives.
+
+    Returns (prices, jac) where jac[k, j] is the derivative of the price at
+    strikes[j] w.r.t. GRADIENT_PARAMS[k].
+    """
+    strikes = np.asarray(strikes, dtype=float).ravel()
+    u, w = laguerre_grid(n_nodes)
+    phi1, phi2, dphi1, dphi2 = _laguerre_cf_gradient(
+        n_nodes, float(T), float(r), float(q), float(v0),
+        float(kappa), float(theta), float(sigma), float(rho)
+    )
+    kernel = np.exp(1j*np.outer(np.log(S/strikes), u)) / (1j*u)
+    P1 = 0.5 + (real(kernel*phi1) @ w)/pi
+    P2 = 0.5 + (real(kernel*phi2) @ w)/pi
+    # dP/dp = (1/pi) * sum_u w * Re(kernel * dphi), for all params at once
+    dP1 = np.einsum('ju,ku,u->kj', kernel, dphi1, w).real/pi
+    dP2 = np.einsum('ju,ku,u->kj', kernel, dphi2, w).real/pi
+    disc_S = S*np.exp(-q*T)
+    disc_K = strikes*np.exp(-r*T)
+    return disc_S*P1 - disc_K*P2, disc_S*dP1 - disc_K*dP2
+
+# === ANALYTIC GREEKS ===
+HESTON_GREEKS = ("delta", "gamma", "vega", "vanna", "volga", "charm")
+
+def _heston_cf_terms(u, T, r, q, v0, kappa, theta, sigma, rho):
+    """
+    Unit-spot Heston CF with the pieces needed for Greeks.
+
+    Returns (phi, D, dlogphi_dT): D = d(log phi)/dv0 and dlogphi_dT is the
+    time derivative of log phi at fixed v0, both from the little-trap form.
+    """
+    i = complex(0, 1)
+    iu = i*u
+    a = kappa * theta
+    b = kappa - rho*sigma*iu
+    d = np.sqrt(b**2 + sigma**2*(iu + u**2))
+    g = (b - d)/(b + d)
+    e = np.exp(-d*T)
+    one_ge = 1 - g*e
+    C = (r - q)*iu*T + (a/sigma**2)*((b - d)*T - 2*np.log(one_ge/(1 - g)))
+    D = ((b - d)/sigma**2)*((1 - e)/one_ge)
+    dC_dT = (r - q)*iu + (a/sigma**2)*((b - d) - 2*g*d*e/one_ge)
+    dD_dT = ((b - d)/sigma**2)*d*e*(1 - g)/one_ge**2
+    return np.exp(C + D*v0), D, dC_dT + v0*dD_dT
+
+@lru_cache(maxsize=64)
+def _laguerre_greek_terms(n_nodes, T, r, q, v0, kappa, theta, sigma, rho):
+    """CF terms for P1 (share measure) and P2 on the Laguerre grid, cached per (T, params)."""
+    u, _ = laguerre_grid(n_nodes)
+    phi, D, dT = _heston_cf_terms(np.concatenate((u - 1j, u)), T, r, q, v0, kappa, theta, sigma, rho)
+    out = (
+        phi[:n_nodes]/np.exp((r - q)*T), D[:n_nodes], dT[:n_nodes] - (r - q),
+        phi[n_nodes:], D[n_nodes:],
+    )
+    for arr in out:
+        arr.flags.writeable = False
+    return out
+
+def heston_call_greeks(S, strikes, T, r, q, v0, kappa, theta, sigma, rho,
+                       n_nodes=DEFAULT_LAGUERRE_NODES):
+    """
+    Heston call price and Greeks for a whole strike vector.
+
+    Differentiates the P1/P2 Fourier integrals of heston_call_prices under
+    the integral sign, so every Greek is a weighted sum over the same
+    Gauss-Laguerre grid (no bumping, one CF evaluation per (T, params)).
+    S may be a scalar or an array broadcastable against strikes.
+
+    Volatility Greeks are taken w.r.t. the instantaneous volatility
+    sqrt(v0), so they are on the same scale as the Black-Scholes ones in
+    models.greeks; charm is -dDelta/dT, the daily drift of delta per year.
+
+    Returns a dict of arrays shaped like the broadcast of S and strikes,
+    keyed by 'price' and HESTON_GREEKS.
+    """
+    S, strikes = np.broadcast_arrays(np.asarray(S, dtype=float), np.asarray(strikes, dtype=float))
+    shape = strikes.shape
+    S, strikes = S.ravel(), strikes.ravel()
+    u, w = laguerre_grid(n_nodes)
+    phi1, D1, G1, phi2, D2 = _laguerre_greek_terms(
+        n_nodes, float(T), float(r), float(q), float(v0),
+        float(kappa), float(theta), float(sigma), float(rho)
+    )
+    wave = np.exp(1j*np.outer(np.log(S/strikes), u))
+    kernel = wave / (1j*u)
+    
+    def integral(values, k=kernel):
+        return (real(k*values) @ w)/pi
+    
+    P1 = 0.5 + integral(phi1)
+    P2 = 0.5 + integral(phi2)
+    dP1_dx = integral(phi1, wave)                 # x = log(S/K)
+    dP1_dv, dP2_dv = integral(phi1*D1), integral(phi2*D2)
+    d2P1_dv2, d2P2_dv2 = integral(phi1*D1**2), integral(phi2*D2**2)
+    dP1_dT = integral(phi1*G1)
+    
+    disc_S = S*np.exp(-q*T)
+    disc_K = strikes*np.exp(-r*T)
+    dC_dv = disc_S*dP1_dv - disc_K*dP2_dv
+    d2C_dv2 = disc_S*d2P1_dv2 - disc_K*d2P2_dv2
+    vol = np.sqrt(v0)
+    greeks = {
+        "price": disc_S*P1 - disc_K*P2,
+        "delta": np.exp(-q*T)*P1,
+        "gamma": np.exp(-q*T)*dP1_dx/S,
+        "vega": 2*vol*dC_dv,
+        "vanna": 2*vol*np.exp(-q*T)*dP1_dv,
+        "volga": 2*dC_dv + 4*v0*d2C_dv2,
+        "charm": np.exp(-q*T)*(q*P1 - dP1_dT),
+    }
+    return {name: value.reshape(shape) for name, value in greeks.items()}
+
+def heston_greeks(S, K, T, r, q, v0, kappa, theta, sigma, rho, greek="gamma"):
+    """Single Heston call Greek (see heston_call_greeks for conventions)."""
+    greek = greek.lower()
+    if greek not in HESTON_GREEKS:
+        raise ValueError(f"Unknown greek: choose from {', '.join(HESTON_GREEKS)}")
+    value = heston_call_greeks(S, K, T, r, q, v0, kappa, theta, sigma, rho)[greek]
+    return float(value) if np.ndim(value) == 0 else value
 
 # === CALIBRATION ===
 def black_scholes_iv_call(S, K, T, r, q, market_price, sigma_min=0.001, sigma_max=5.0):
     """
     Calculate implied volatility from market price using Black-Scholes.
-    Uses Brent's method for root finding.
+    Uses the vectorized Halley solver in models.greeks; returns None when
+    there is no solution in [sigma_min, sigma_max].
     """
-    from scipy.optimize import brentq
-    from scipy.stats import norm
+    from models.greeks import implied_volatility
     
-    def bs_call_price(sigma):
-        """Black-Scholes call price for given volatility"""
-        if sigma <= 0:
-            return 0
-        try:
-            d1 = (np.log(S / K) + (r - q + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-            d2 = d1 - sigma * np.sqrt(T)
-            return S * np.exp(-q * T) * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-        except:
-            return 0
-    
-    def iv_error(sigma):
-        """Error between market price and BS price"""
-        return bs_call_price(sigma) - market_price
-    
-    try:
-        iv = brentq(iv_error, sigma_min, sigma_max, maxiter=100)
-        return iv
-    except:
+    iv = float(implied_volatility(market_price, S, K, T, r, q, is_call=True))
+    if not np.isfinite(iv) or not sigma_min <= iv <= sigma_max:
         return None
+    return iv
 
 def calibrate_heston_parameters(
     S0, strikes, market_prices, T, r, q, v0,
@@ -100,7 +321,8 @@ def calibrate_heston_parameters(
     rho_bounds=(-0.99, 0.99),
     method='L-BFGS-B',
     maxiter=200,
-    callback=None
+    callback=None,
+    engine=None
 ):
     """
     Calibrate Heston model parameters to market option prices using bounded optimization.
@@ -138,11 +360,15 @@ def calibrate_heston_parameters(
     rho_bounds : tuple, optional
         Bounds for rho (default: (-0.99, 0.99))
     method : str, optional
-        Optimization method (default: 'L-BFGS-B' for bounded optimization)
+        Optimization method (default: 'L-BFGS-B' for bounded optimization).
+        Pass 'lm' for a Levenberg-Marquardt least-squares fit of the residuals
     maxiter : int, optional
         Maximum number of iterations (default: 200)
     callback : callable, optional
         Callback function called after each iteration (default: None)
+    engine : str, optional
+        Pricing engine used by the objective: 'fft', 'laguerre' or 'quad'
+        (default: None, which selects the FFT engine)
     
     Returns:
     --------
@@ -157,18 +383,19 @@ def calibrate_heston_parameters(
         - 'fun': final objective function value
         - 'nit': number of iterations
     """
-    # Convert inputs to numpy arrays
-    strikes = np.array(strikes, dtype=float)
-    market_prices = np.array(market_prices, dtype=float)
-    
-    # Filter out invalid data
-    valid_mask = (strikes > 0) & (market_prices > 0) & np.isfinite(strikes) & np.isfinite(market_prices)
-    strikes = strikes[valid_mask]
-    market_prices = market_prices[valid_mask]
+    # Convert inputs to numpy arrays and filter out invalid data
+    strikes, market_prices = _valid_quotes(strikes, market_prices)
     
     if len(strikes) < 3:
         raise ValueError("Need at least 3 valid option prices for calibration")
     
+    from models.data_analysis.pricing_models.engines import get_pricing_engine, get_gradient_engine
+    price_strikes = get_pricing_engine(engine)
+    price_with_gradient = get_gradient_engine(engine)
+    
+    # Weight by inverse of market price to give equal relative importance
+    weights = 1.0 / (market_prices + 1e-6)  # Add small epsilon to avoid division by zero
+    
     # Objective function: sum of squared errors between market and model prices
     def objective(params):
         """Objective function to minimize"""
@@ -178,25 +405,30 @@ def calibrate_heston_parameters(
         if 2 * kappa * theta <= sigma_v**2:
             return 1e10  # Penalize invalid parameter combinations
         
-        # Calculate model prices for all strikes
-        model_prices = []
-        for K in strikes:
-            try:
-                price = heston_call_price(S0, K, T, r, q, v0, kappa, theta, sigma_v, rho)
-                model_prices.append(price)
-            except:
-                return 1e10  # Return large penalty if pricing fails
-        
-        model_prices = np.array(model_prices)
-        
-        # Calculate squared errors (with weighting by price to normalize)
-        errors = (model_prices - market_prices) ** 2
-        # Weight by inverse of market price to give equal relative importance
-        weights = 1.0 / (market_prices + 1e-6)  # Add small epsilon to avoid division by zero
-        weighted_errors = errors * weights
+        # Calculate model prices for all strikes in one engine call
+        try:
+            model_prices = price_strikes(S0, strikes, T, r, q, v0, kappa, theta, sigma_v, rho)
+        except Exception:
+            return 1e10  # Return large penalty if pricing fails
+        if not np.all(np.isfinite(model_prices)):
+            return 1e10
         
         # Return sum of weighted squared errors
-        return np.sum(weighted_errors)
+        return np.sum(weights * (model_prices - market_prices) ** 2)
+    
+    def objective_and_gradient(params):
+        """Objective plus its analytic gradient from the CF derivatives"""
+        kappa, theta, sigma_v, rho = params
+        if 2 * kappa * theta <= sigma_v**2:
+            return 1e10, np.zeros(4)
+        try:
+            model_prices, jac = price_with_gradient(S0, strikes, T, r, q, v0, kappa, theta, sigma_v, rho)
+        except Exception:
+            return 1e10, np.zeros(4)
+        if not (np.all(np.isfinite(model_prices)) and np.all(np.isfinite(jac))):
+            return 1e10, np.zeros(4)
+        residual = weights * (model_prices - market_prices)
+        return np.sum(residual * (model_prices - market_prices)), 2 * (jac[:4] @ residual)
     
     # Initial parameter vector: [kappa, theta, sigma_v, rho]
     x0 = np.array([kappa_init, theta_init, sigma_v_init, rho_init])
@@ -206,14 +438,30 @@ def calibrate_heston_parameters(
     
     # Run optimization
     try:
-        result = minimize(
-            objective,
-            x0,
-            method=method,
-            bounds=bounds,
-            options={'maxiter': maxiter, 'disp': False},
-            callback=callback
-        )
+        if method.lower() == 'lm':
+            result = _least_squares_fit(
+                S0, strikes, market_prices, weights, T, r, q, v0, x0, bounds,
+                price_strikes, price_with_gradient, maxiter, callback
+            )
+        elif price_with_gradient is not None:
+            result = minimize(
+                objective_and_gradient,
+                x0,
+                method=method,
+                jac=True,
+                bounds=bounds,
+                options={'maxiter': maxiter, 'disp': False},
+                callback=callback
+            )
+        else:
+            result = minimize(
+                objective,
+                x0,
+                method=method,
+                bounds=bounds,
+                options={'maxiter': maxiter, 'disp': False},
+                callback=callback
+            )
         
         kappa_fit, theta_fit, sigma_v_fit, rho_fit = result.x
         
@@ -238,3 +486,332 @@ def calibrate_heston_parameters(
     except Exception as e:
         raise RuntimeError(f"Calibration failed: {str(e)}")
 
+# === MULTI-START CALIBRATION ===
+MULTISTART_DEFAULT = 8
+
+def latin_hypercube_starts(n_starts, bounds, seed=None):
+    """
+    Latin-hypercube starting points for (kappa, theta, sigma_v, rho).
+    
+    sigma_v is pulled back under the Feller bound sqrt(2*kappa*theta) so no
+    start begins against the penalty wall.
+    """
+    from scipy.stats import qmc
+    lo = np.array([b[0] for b in bounds], dtype=float)
+    hi = np.array([b[1] for b in bounds], dtype=float)
+    starts = qmc.scale(qmc.LatinHypercube(d=len(bounds), seed=seed).random(n_starts), lo, hi)
+    feller_max = np.sqrt(2 * starts[:, 0] * starts[:, 1]) * 0.95
+    starts[:, 2] = np.maximum(np.minimum(starts[:, 2], feller_max), lo[2])
+    return starts
+
+def _multistart_worker(start_index, calibration_kwargs, queue):
+    """Run one calibration start in a worker process, reporting iterations to queue"""
+    def callback(xk):
+        if queue is not None:
+            queue.put(start_index)
+    try:
+        result = calibrate_heston_parameters(callback=callback, **calibration_kwargs)
+    except Exception as e:
+        result = {'success': False, 'fun': np.inf, 'message': str(e)}
+    return start_index, result
+
+def calibrate_heston_multistart(
+    S0, strikes, market_prices, T, r, q, v0,
+    n_starts=MULTISTART_DEFAULT,
+    kappa_init=2.0, theta_init=0.04, sigma_v_init=0.3, rho_init=-0.7,
+    kappa_bounds=(0.1, 10.0),
+    theta_bounds=(0.001, 0.5),
+    sigma_v_bounds=(0.01, 1.0),
+    rho_bounds=(-0.99, 0.99),
+    seed=None,
+    max_workers=None,
+    progress=None,
+    **calibration_kwargs
+):
+    """
+    Multi-start calibrate_heston_parameters in a process pool, keeping the best fit.
+    
+    The caller's initial guess is always the first start; the rest are
+    Latin-hypercube samples over the bounds. Each start runs in its own
+    process, so N starts take about as long as one on an N-core machine.
+    Workers are spawned (the launching script must guard its entry point
+    with if __name__ == "__main__"); if the process pool cannot run, the
+    starts run on threads instead.
+    
+    progress(starts_done, n_starts, iterations, best) is called from the
+    calling thread whenever a start finishes or workers report iterations;
+    best is the best result dict so far (or None).
+    
+    Remaining keyword arguments (method, maxiter, engine) are passed to
+    calibrate_heston_parameters. The returned dict has the same keys plus
+    'n_starts' and 'best_start'.
+    """
+    bounds = [kappa_bounds, theta_bounds, sigma_v_bounds, rho_bounds]
+    starts = np.vstack((
+        [kappa_init, theta_init, sigma_v_init, rho_init],
+        latin_hypercube_starts(max(n_starts - 1, 0), bounds, seed=seed)
+    ))
+    base = dict(
+        S0=S0, strikes=np.asarray(strikes, dtype=float), market_prices=np.asarray(market_prices, dtype=float),
+        T=T, r=r, q=q, v0=v0,
+        kappa_bounds=kappa_bounds, theta_bounds=theta_bounds,
+        sigma_v_bounds=sigma_v_bounds, rho_bounds=rho_bounds,
+        **calibration_kwargs
+    )
+    if max_workers is None:
+        max_workers = min(len(starts), os.cpu_count() or 1)
+    
+    def run_starts(pool, queue):
+        best, best_start, done, iterations = None, None, 0, 0
+        pending = {
+            pool.submit(_multistart_worker, i, dict(base, kappa_init=k, theta_init=t, sigma_v_init=s, rho_init=p), queue)
+            for i, (k, t, s, p) in enumerate(starts)
+        }
+        while pending:
+            finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in finished:
+                start_index, result = future.result()
+                done += 1
+                if best is None or result['fun'] < best['fun']:
+                    best, best_start = result, start_index
+            if queue is not None:
+                while not queue.empty():
+                    queue.get_nowait()
+                    iterations += 1
+                progress(done, len(starts), iterations, best if best is not None and np.isfinite(best['fun']) else None)
+        return best, best_start
+    
+    context = multiprocessing.get_context("spawn")
+    try:
+        with context.Manager() as manager, ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+            best, best_start = run_starts(pool, manager.Queue() if progress is not None else None)
+    except (OSError, EOFError, BrokenProcessPool) as e:
+        print(f"Multi-start process pool failed ({e}); running the starts on threads")
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            best, best_start = run_starts(pool, queue_module.Queue() if progress is not None else None)
+    
+    if best is None or not np.isfinite(best['fun']):
+        raise RuntimeError(f"Calibration failed from all {len(starts)} starts")
+    return dict(best, n_starts=len(starts), best_start=best_start)
+
+def _valid_quotes(strikes, market_prices):
+    """Drop non-positive and non-finite (strike, price) pairs."""
+    strikes = np.array(strikes, dtype=float)
+    market_prices = np.array(market_prices, dtype=float)
+    valid_mask = (strikes > 0) & (market_prices > 0) & np.isfinite(strikes) & np.isfinite(market_prices)
+    return strikes[valid_mask], market_prices[valid_mask]
+
+def calibration_error(S0, strikes, market_prices, T, r, q, v0, params, engine=None):
+    """
+    Weighted squared price error of (kappa, theta, sigma_v, rho) on a set of quotes.
+    
+    Same weighting as the calibration objective, so the value is comparable
+    with a calibration result's 'fun'. Returns inf if pricing fails.
+    """
+    from models.data_analysis.pricing_models.engines import get_pricing_engine
+    strikes, market_prices = _valid_quotes(strikes, market_prices)
+    kappa, theta, sigma_v, rho = params
+    try:
+        model_prices = get_pricing_engine(engine)(S0, strikes, T, r, q, v0, kappa, theta, sigma_v, rho)
+    except Exception:
+        return np.inf
+    error = np.sum((model_prices - market_prices) ** 2 / (market_prices + 1e-6))
+    return float(error) if np.isfinite(error) else np.inf
+
+def calibrate_heston_surface(
+    S0, slices, r, q,
+    v0_init=0.04, kappa_init=2.0, theta_init=0.04, sigma_v_init=0.3, rho_init=-0.7,
+    v0_bounds=(0.001, 1.0),
+    kappa_bounds=(0.1, 10.0),
+    theta_bounds=(0.001, 0.5),
+    sigma_v_bounds=(0.01, 1.0),
+    rho_bounds=(-0.99, 0.99),
+    method='L-BFGS-B',
+    maxiter=200,
+    callback=None,
+    engine=None,
+    max_workers=None
+):
+    """
+    Jointly calibrate v0, kappa, theta, sigma_v and rho to several expirations.
+    
+    Each objective evaluation prices every (strike, expiry) pair: expirations
+    are priced as one vectorized batch each, in parallel on a thread pool
+    (the NumPy kernels release the GIL). Gradients come from the analytic CF
+    derivatives when the engine provides them.
+    
+    Parameters:
+    -----------
+    S0 : float
+        Current spot price
+    slices : iterable of (T, strikes, market_prices)
+        One entry per expiration, T in years
+    r, q : float
+        Risk-free rate and dividend yield
+    v0_init, kappa_init, theta_init, sigma_v_init, rho_init : float, optional
+        Initial guess (same defaults as calibrate_heston_parameters, v0=0.04)
+    *_bounds : tuple, optional
+        Parameter bounds
+    method, maxiter, callback, engine :
+        As for calibrate_heston_parameters ('lm' is not supported here)
+    max_workers : int, optional
+        Thread pool size (default: one per expiration, capped at the CPU count)
+    
+    Returns:
+    --------
+    result : dict
+        Same keys as calibrate_heston_parameters plus 'v0', 'n_expirations'
+        and 'n_quotes'
+    """
+    from models.data_analysis.pricing_models.engines import get_pricing_engine, get_gradient_engine
+    price_strikes = get_pricing_engine(engine)
+    price_with_gradient = get_gradient_engine(engine)
+    
+    prepared = []
+    for T, strikes, market_prices in slices:
+        strikes, market_prices = _valid_quotes(strikes, market_prices)
+        if T > 0 and len(strikes) >= 3:
+            prepared.append((float(T), strikes, market_prices, 1.0 / (market_prices + 1e-6)))
+    
+    n_quotes = sum(len(sl[1]) for sl in prepared)
+    if not prepared or n_quotes < 5:
+        raise ValueError("Need at least 5 valid option prices across expirations for surface calibration")
+    
+    if max_workers is None:
+        max_workers = min(len(prepared), os.cpu_count() or 1)
+    
+    penalty = (1e10, np.zeros(5))
+    
+    def slice_error(pool, params, with_gradient):
+        """Weighted SSE (and gradient) summed over all expirations"""
+        kappa, theta, sigma_v, rho, v0 = params
+        
+        def price_slice(sl):
+            T, strikes, market_prices, weights = sl
+            if with_gradient:
+                model_prices, jac = price_with_gradient(S0, strikes, T, r, q, v0, kappa, theta, sigma_v, rho)
+            else:
+                model_prices, jac = price_strikes(S0, strikes, T, r, q, v0, kappa, theta, sigma_v, rho), None
+            residual = weights * (model_prices - market_prices)
+            err = np.sum(residual * (model_prices - market_prices))
+            return err, (2 * (jac @ residual) if with_gradient else None)
+        
+        total, grad = 0.0, np.zeros(5)
+        for err, g in pool.map(price_slice, prepared):
+            total += err
+            if g is not None:
+                grad += g
+        return total, grad
+    
+    x0 = np.array([kappa_init, theta_init, sigma_v_init, rho_init, v0_init])
+    bounds = [kappa_bounds, theta_bounds, sigma_v_bounds, rho_bounds, v0_bounds]
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            def objective(params):
+                kappa, theta, sigma_v, rho, _ = params
+                if 2 * kappa * theta <= sigma_v**2:
+                    return penalty[0]
+                try:
+                    total, _ = slice_error(pool, params, False)
+                except Exception:
+                    return penalty[0]
+                return total if np.isfinite(total) else penalty[0]
+            
+            def objective_and_gradient(params):
+                kappa, theta, sigma_v, rho, _ = params
+                if 2 * kappa * theta <= sigma_v**2:
+                    return penalty
+                try:
+                    total, grad = slice_error(pool, params, True)
+                except Exception:
+                    return penalty
+                if not (np.isfinite(total) and np.all(np.isfinite(grad))):
+                    return penalty
+                return total, grad
+            
+            if price_with_gradient is not None:
+                result = minimize(
+                    objective_and_gradient, x0, method=method, jac=True, bounds=bounds,
+                    options={'maxiter': maxiter, 'disp': False}, callback=callback
+                )
+            else:
+                result = minimize(
+                    objective, x0, method=method, bounds=bounds,
+                    options={'maxiter': maxiter, 'disp': False}, callback=callback
+                )
+            
+            kappa_fit, theta_fit, sigma_v_fit, rho_fit, v0_fit = result.x
+            
+            # Validate Feller condition
+            if 2 * kappa_fit * theta_fit <= sigma_v_fit**2:
+                sigma_v_max = np.sqrt(2 * kappa_fit * theta_fit) * 0.99
+                if sigma_v_fit > sigma_v_max:
+                    sigma_v_fit = sigma_v_max
+                    result.fun = objective([kappa_fit, theta_fit, sigma_v_fit, rho_fit, v0_fit])
+        
+        return {
+            'v0': float(v0_fit),
+            'kappa': float(kappa_fit),
+            'theta': float(theta_fit),
+            'sigma_v': float(sigma_v_fit),
+            'rho': float(rho_fit),
+            'success': result.success,
+            'message': result.message,
+            'fun': float(result.fun),
+            'nit': int(result.nit) if hasattr(result, 'nit') else None,
+            'n_expirations': len(prepared),
+            'n_quotes': n_quotes
+        }
+    except Exception as e:
+        raise RuntimeError(f"Surface calibration failed: {str(e)}")
+
+def _least_squares_fit(S0, strikes, market_prices, weights, T, r, q, v0, x0, bounds,
+                       price_strikes, price_with_gradient, maxiter, callback):
+    """
+    Levenberg-Marquardt fit of the weighted price residuals.
+
+    LM itself is unbounded, so each parameter is mapped onto its bounds with
+    p = lo + (hi - lo)*(1 + sin(x))/2. Returns a result object shaped like
+    scipy's minimize output (x, fun, success, message, nit).
+    """
+    from scipy.optimize import least_squares, OptimizeResult
+    
+    lo = np.array([b[0] for b in bounds], dtype=float)
+    hi = np.array([b[1] for b in bounds], dtype=float)
+    sqrt_w = np.sqrt(weights)
+    
+    def to_params(x):
+        return lo + (hi - lo) * (1 + np.sin(x)) / 2
+    
+    def residuals(x):
+        kappa, theta, sigma_v, rho = to_params(x)
+        try:
+            model_prices = price_strikes(S0, strikes, T, r, q, v0, kappa, theta, sigma_v, rho)
+        except Exception:
+            return np.full(len(strikes), 1e5)
+        return np.nan_to_num(sqrt_w * (model_prices - market_prices), nan=1e5, posinf=1e5, neginf=-1e5)
+    
+    def jacobian(x):
+        params = to_params(x)
+        if callback is not None:
+            callback(params)
+        _, jac = price_with_gradient(S0, strikes, T, r, q, v0, *params)
+        dparams = (hi - lo) * np.cos(x) / 2
+        return np.nan_to_num((jac[:4] * dparams[:, None]).T * sqrt_w[:, None])
+    
+    x0 = np.clip(2 * (np.asarray(x0, dtype=float) - lo) / (hi - lo) - 1, -1.0, 1.0)
+    fit = least_squares(
+        residuals,
+        np.arcsin(x0),
+        jac=jacobian if price_with_gradient is not None else '2-point',
+        method='lm',
+        max_nfev=maxiter * 10
+    )
+    return OptimizeResult(
+        x=to_params(fit.x),
+        fun=float(np.sum(fit.fun**2)),
+        success=fit.success,
+        message=fit.message,
+        nit=fit.njev if fit.njev is not None else fit.nfev
+    )
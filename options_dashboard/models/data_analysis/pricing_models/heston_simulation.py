@@ -1,10 +1,112 @@
 import numpy as np
-from scipy.stats import norm
+from scipy.special import ndtr
 
 
-def simulate_heston_paths(S0, v0, T, r, q, kappa, theta, sigma_v, rho, n_steps, n_paths=1, random_seed=None):
+# QE switching threshold between the quadratic and exponential branches
+QE_PSI_CRITICAL = 1.5
+# Time steps of normals drawn per RNG call
+RNG_BLOCK_STEPS = 64
+
+
+def make_rng(random_seed=None):
+    """np.random.Generator from a seed, SeedSequence or existing Generator (None = fresh entropy)"""
+    if isinstance(random_seed, np.random.Generator):
+        return random_seed
+    return np.random.default_rng(random_seed)
+
+
+def _normal_blocks(rng, n_steps, n_paths, antithetic, dtype):
+    """
+    Yield (steps, 2, n_paths) blocks of independent standard normals.
+
+    With antithetic variates only half the paths are drawn; the other half
+    are their negatives.
+    """
+    n_draw = (n_paths + 1) // 2 if antithetic else n_paths
+    for start in range(0, n_steps, RNG_BLOCK_STEPS):
+        steps = min(RNG_BLOCK_STEPS, n_steps - start)
+        Z = rng.standard_normal((steps, 2, n_draw), dtype=dtype)
+        if antithetic:
+            Z = np.concatenate((Z, -Z), axis=2)[:, :, :n_paths]
+        yield Z
+
+
+def qe_variance_step(v, Zv, kappa, theta, sigma_v, dt):
+    """
+    One step of Andersen's quadratic-exponential (QE) variance scheme.
+
+    Uses moment matching against the exact CIR transition: a squared
+    Gaussian when the variance is well away from zero (psi <= 1.5), and a
+    mass at zero plus an exponential tail otherwise. Zv drives both
+    branches (via U = N(Zv)), so antithetic normals carry over.
+    """
+    ekt = np.exp(-kappa * dt)
+    m = theta + (v - theta) * ekt
+    s2 = v * sigma_v**2 * ekt / kappa * (1 - ekt) + theta * sigma_v**2 / (2 * kappa) * (1 - ekt)**2
+    psi = s2 / np.maximum(m * m, 1e-300)
+
+    # Both branches are evaluated on the full arrays and blended with
+    # np.where, which is cheaper than masked gathers/scatters per step
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        inv = 2.0 / psi
+        b2 = inv - 1 + np.sqrt(inv) * np.sqrt(np.maximum(inv - 1, 0))
+        quad_v = m / (1 + b2) * (np.sqrt(b2) + Zv)**2
+
+        p = (psi - 1) / (psi + 1)
+        U = ndtr(Zv)
+        tail = np.log((1 - p) / np.maximum(1 - U, 1e-300)) * m / (1 - p)
+        exp_v = np.where(U <= p, 0.0, tail)
+    v_next = np.where(psi <= QE_PSI_CRITICAL, quad_v, exp_v)
+    return v_next
+
+
+def heston_steps(rng, S0, v0, T, r, q, kappa, theta, sigma_v, rho, n_steps, n_paths,
+                 scheme="qe", antithetic=False, dtype=np.float64):
+    """
+    Advance n_paths Heston paths one step at a time.
+
+    Yields (S, v) arrays after each of the n_steps steps. State is kept in
+    float64 and only the current step lives in memory, so callers decide
+    what to store (full paths, or streaming statistics).
     """
-    Simulate Heston model paths using Euler-Maruyama discretization.
+    dt = T / n_steps
+    log_S = np.full(n_paths, np.log(S0))
+    v = np.full(n_paths, float(v0))
+    drift = (r - q) * dt
+    
+    if scheme == "qe":
+        K0 = -rho * kappa * theta * dt / sigma_v
+        K1 = 0.5 * dt * (kappa * rho / sigma_v - 0.5) - rho / sigma_v
+        K2 = 0.5 * dt * (kappa * rho / sigma_v - 0.5) + rho / sigma_v
+        K3 = 0.5 * dt * (1 - rho**2)
+    elif scheme != "euler":
+        raise ValueError(f"Unknown scheme: {scheme!r} (choose 'qe' or 'euler')")
+    
+    for Z in _normal_blocks(rng, n_steps, n_paths, antithetic, dtype):
+        for Zv, Zs in Z:
+            if scheme == "qe":
+                v_next = qe_variance_step(v, Zv, kappa, theta, sigma_v, dt)
+                log_S += drift + K0 + K1 * v + K2 * v_next + np.sqrt(K3 * (v + v_next)) * Zs
+            else:
+                # Full truncation: use max(v, 0) in both drift and diffusion
+                v_pos = np.maximum(v, 0)
+                W2 = np.sqrt(dt) * Zv
+                W1 = np.sqrt(dt) * (rho * Zv + np.sqrt(1 - rho**2) * Zs)
+                log_S += drift - 0.5 * v_pos * dt + np.sqrt(v_pos) * W1
+                v_next = v + kappa * (theta - v_pos) * dt + sigma_v * np.sqrt(v_pos) * W2
+            v = v_next
+            yield np.exp(log_S), np.maximum(v, 0)
+
+
+def simulate_heston_paths(S0, v0, T, r, q, kappa, theta, sigma_v, rho, n_steps, n_paths=1, random_seed=None,
+                          scheme="qe", antithetic=False, dtype=np.float64):
+    """
+    Simulate Heston model paths.
+    
+    Normals come from a local np.random.Generator and are drawn in blocks of
+    time steps; all paths advance together. The default scheme is Andersen's
+    QE discretisation with the central (gamma1 = gamma2 = 0.5) log-price
+    step; scheme="euler" selects full-truncation Euler-Maruyama.
     
     Parameters:
     - S0: Initial stock price
@@ -18,49 +120,216 @@ def simulate_heston_paths(S0, v0, T, r, q, kappa, theta, sigma_v, rho, n_steps,
     - rho: Correlation between price and variance
     - n_steps: Number of time steps
     - n_paths: Number of paths to simulate
-    - random_seed: Optional random seed for reproducibility (None = random each time)
+    - random_seed: Optional seed, SeedSequence or Generator for reproducibility
+      (None = random each time). Global NumPy RNG state is never touched.
+    - scheme: "qe" (default) or "euler"
+    - antithetic: Pair every path with its antithetic (negated normals) path
+    - dtype: Output dtype; np.float32 halves memory and draws float32 normals
     
     Returns:
     - times: Array of time points
     - S_paths: Stock price paths (n_paths x n_steps+1)
     - v_paths: Variance paths (n_paths x n_steps+1)
     """
-    # Set random seed if provided for reproducibility
-    if random_seed is not None:
-        np.random.seed(random_seed)
-    
+    rng = make_rng(random_seed)
     dt = T / n_steps
     times = np.linspace(0, T, n_steps + 1)
     
-    # Initialize arrays
-    S_paths = np.zeros((n_paths, n_steps + 1))
-    v_paths = np.zeros((n_paths, n_steps + 1))
+    # Step-major buffers so each step writes one contiguous row in place
+    S_buf = np.empty((n_steps + 1, n_paths), dtype=dtype)
+    v_buf = np.empty((n_steps + 1, n_paths), dtype=dtype)
+    S_buf[0] = S0
+    v_buf[0] = v0
     
-    S_paths[:, 0] = S0
-    v_paths[:, 0] = v0
+    steps = heston_steps(rng, S0, v0, T, r, q, kappa, theta, sigma_v, rho, n_steps, n_paths,
+                         scheme=scheme, antithetic=antithetic, dtype=dtype)
+    for i, (S, v) in enumerate(steps, start=1):
+        S_buf[i] = S
+        v_buf[i] = v
     
-    # Generate correlated random numbers
-    for i in range(n_steps):
-        # Generate correlated Brownian motions
-        Z1 = norm.rvs(size=n_paths)
-        Z2 = norm.rvs(size=n_paths)
-        W1 = np.sqrt(dt) * Z1
-        W2 = np.sqrt(dt) * (rho * Z1 + np.sqrt(1 - rho**2) * Z2)
-        
-        # Update variance (with Feller condition check)
-        v_prev = np.maximum(v_paths[:, i], 0)  # Ensure non-negative
-        v_new = v_prev + kappa * (theta - v_prev) * dt + sigma_v * np.sqrt(v_prev) * W2
-        v_paths[:, i+1] = np.maximum(v_new, 0)  # Ensure non-negative
-        
-        # Update stock price
-        S_prev = S_paths[:, i]
-        S_new = S_prev * np.exp((r - q - 0.5 * v_prev) * dt + np.sqrt(v_prev) * W1)
-        S_paths[:, i+1] = S_new
+    return times, S_buf.T, v_buf.T
+
+
+# === STREAMING MONTE CARLO STATISTICS ===
+STREAM_CHUNK_PATHS = 10000
+FAN_PERCENTILES = (5, 25, 50, 75, 95)
+FAN_BINS = 512           # Per-step histogram bins used to read off percentiles
+FAN_RANGE_SD = 8.0       # Histogram half-width in standard deviations of log return
+
+
+def _log_return_scale(v0, theta, times):
+    """Per-step scale of log(S/S0) used to place the fixed histogram grids"""
+    return np.sqrt(max(v0, theta, 1e-8) * np.maximum(times, times[1] if len(times) > 1 else 1.0))
+
+
+def _pair_antithetic(samples, n_paths):
+    """
+    Average each path with its antithetic partner (see _normal_blocks).
+
+    Path i was drawn with the negated normals of path i + (n_paths + 1) // 2;
+    with an odd n_paths the middle path's partner was cut off, so it stays a
+    sample of its own.
+    """
+    n_draw = (n_paths + 1) // 2
+    n_pairs = n_paths - n_draw
+    pairs = 0.5 * (samples[:n_pairs] + samples[n_draw:])
+    return np.concatenate((pairs, samples[n_pairs:n_draw]))
+
+
+def _simulate_chunk(seed, n_paths, model, n_steps, scheme, antithetic, strikes, n_hist_bins):
+    """
+    Simulate one chunk of paths and return only its statistic accumulators.
+
+    Runs in a worker process; memory is O(n_paths + n_steps * FAN_BINS).
+    """
+    S0, v0, T, r, q, kappa, theta, sigma_v, rho = model
+    rng = np.random.default_rng(seed)
+    times = np.linspace(0, T, n_steps + 1)
+    scale = _log_return_scale(v0, theta, times)
+    
+    fan_counts = np.zeros((n_steps + 1, FAN_BINS), dtype=np.int64)
+    fan_counts[0, FAN_BINS // 2] = n_paths
+    sum_S = np.zeros(n_steps + 1)
+    sum_S[0] = S0 * n_paths
+    
+    S = np.full(n_paths, float(S0))
+    steps = heston_steps(rng, S0, v0, T, r, q, kappa, theta, sigma_v, rho, n_steps, n_paths,
+                         scheme=scheme, antithetic=antithetic)
+    for i, (S, _) in enumerate(steps, start=1):
+        z = np.log(S / S0) / scale[i]
+        idx = ((z / FAN_RANGE_SD + 1) * 0.5 * FAN_BINS).astype(np.int64)
+        fan_counts[i] = np.bincount(np.clip(idx, 0, FAN_BINS - 1), minlength=FAN_BINS)
+        sum_S[i] = S.sum()
+    
+    # Terminal distribution on a fixed log-price grid (edges are rebuilt by the caller)
+    z_T = np.log(S / S0) / scale[-1]
+    hist_idx = ((z_T / FAN_RANGE_SD + 1) * 0.5 * n_hist_bins).astype(np.int64)
+    terminal_counts = np.bincount(np.clip(hist_idx, 0, n_hist_bins - 1), minlength=n_hist_bins)
+    
+    # Discounted payoffs; antithetic pairs are averaged first so the standard
+    # error reflects the variance reduction
+    disc = np.exp(-r * T)
+    call = disc * np.maximum(S[:, None] - strikes[None, :], 0.0)
+    put = disc * np.maximum(strikes[None, :] - S[:, None], 0.0)
+    if antithetic and n_paths > 1:
+        call, put = _pair_antithetic(call, n_paths), _pair_antithetic(put, n_paths)
+    
+    return {
+        "fan_counts": fan_counts,
+        "sum_S": sum_S,
+        "terminal_counts": terminal_counts,
+        "n_samples": len(call),
+        "call_sum": call.sum(axis=0), "call_sumsq": (call**2).sum(axis=0),
+        "put_sum": put.sum(axis=0), "put_sumsq": (put**2).sum(axis=0),
+    }
+
+
+def _percentiles_from_counts(counts, percentiles):
+    """Interpolated percentiles (0-100) of a histogram row per step, in bin units"""
+    cdf = np.cumsum(counts, axis=1) / counts.sum(axis=1, keepdims=True)
+    out = np.empty((len(percentiles), counts.shape[0]))
+    centres = np.arange(counts.shape[1]) + 0.5
+    for j, pct in enumerate(percentiles):
+        for i in range(counts.shape[0]):
+            out[j, i] = np.interp(pct / 100.0, cdf[i], centres)
+    return out
+
+
+def simulate_heston_statistics(S0, v0, T, r, q, kappa, theta, sigma_v, rho, n_steps, n_paths,
+                               strikes=(), percentiles=FAN_PERCENTILES, hist_bins=100,
+                               chunk_paths=STREAM_CHUNK_PATHS, random_seed=None,
+                               scheme="qe", antithetic=True, max_workers=None):
+    """
+    Monte Carlo statistics for large Heston runs without materialising paths.
+    
+    Paths are advanced in chunks of chunk_paths. Each chunk gets an
+    independent RNG stream spawned from one SeedSequence (so results do not
+    depend on the worker count) and runs in a process pool. Chunks return
+    only fixed-size accumulators, so memory stays flat in n_paths.
     
-    return times, S_paths, v_paths
+    Fan percentiles are read from per-step histograms of log(S/S0) on a grid
+    of +/- FAN_RANGE_SD standard deviations (FAN_BINS bins); values outside
+    the grid are clamped into the edge bins.
+    
+    Returns a dict with:
+    - times: Time points (n_steps+1)
+    - percentiles: Dict percentile -> price band over time
+    - mean: Mean price over time
+    - hist_edges, hist_counts: Terminal price histogram
+    - strikes, call_prices, call_stderr, put_prices, put_stderr: MC option
+      prices and standard errors for the requested strikes
+    - n_paths: Number of simulated paths
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+    import os
+    
+    strikes = np.asarray(strikes, dtype=float).ravel()
+    model = (S0, v0, T, r, q, kappa, theta, sigma_v, rho)
+    sizes = [chunk_paths] * (n_paths // chunk_paths)
+    if n_paths % chunk_paths:
+        sizes.append(n_paths % chunk_paths)
+    seeds = np.random.SeedSequence(random_seed).spawn(len(sizes))
+    jobs = [(seed, size, model, n_steps, scheme, antithetic, strikes, hist_bins) for seed, size in zip(seeds, sizes)]
+    
+    if max_workers is None:
+        max_workers = min(len(jobs), os.cpu_count() or 1)
+    
+    totals = None
+    
+    def accumulate(part):
+        nonlocal totals
+        if totals is None:
+            totals = part
+        else:
+            for key, value in part.items():
+                totals[key] = totals[key] + value
+    
+    if max_workers <= 1:
+        for job in jobs:
+            accumulate(_simulate_chunk(*job))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for part in pool.map(_simulate_chunk, *zip(*jobs)):
+                accumulate(part)
+    
+    times = np.linspace(0, T, n_steps + 1)
+    scale = _log_return_scale(v0, theta, times)
+    
+    # Bin units -> prices for the fan bands
+    bands = _percentiles_from_counts(totals["fan_counts"], percentiles)
+    z = (bands / FAN_BINS * 2 - 1) * FAN_RANGE_SD
+    bands = S0 * np.exp(z * scale[None, :])
+    bands[:, 0] = S0
+    
+    hist_z = np.linspace(-FAN_RANGE_SD, FAN_RANGE_SD, hist_bins + 1)
+    n = totals["n_samples"]
+    
+    def mean_and_stderr(total, total_sq):
+        mean = total / n
+        var = np.maximum(total_sq / n - mean**2, 0.0) * n / max(n - 1, 1)
+        return mean, np.sqrt(var / n)
+    
+    call_prices, call_stderr = mean_and_stderr(totals["call_sum"], totals["call_sumsq"])
+    put_prices, put_stderr = mean_and_stderr(totals["put_sum"], totals["put_sumsq"])
+    
+    return {
+        "times": times,
+        "percentiles": {pct: bands[j] for j, pct in enumerate(percentiles)},
+        "mean": totals["sum_S"] / n_paths,
+        "hist_edges": S0 * np.exp(hist_z * scale[-1]),
+        "hist_counts": totals["terminal_counts"],
+        "strikes": strikes,
+        "call_prices": call_prices,
+        "call_stderr": call_stderr,
+        "put_prices": put_prices,
+        "put_stderr": put_stderr,
+        "n_paths": n_paths,
+    }
 
 
-def calculate_implied_volatility_smile(S, K_list, T, r, q, v0, kappa, theta, sigma_v, rho, heston_call_price):
+def calculate_implied_volatility_smile(S, K_list, T, r, q, v0, kappa, theta, sigma_v, rho,
+                                       heston_call_price=None, engine=None):
     """
     Calculate implied volatility smile for a range of strikes.
     
@@ -72,46 +341,32 @@ def calculate_implied_volatility_smile(S, K_list, T, r, q, v0, kappa, theta, sig
     - q: Dividend yield
     - v0: Initial variance
     - kappa, theta, sigma_v, rho: Heston parameters
-    - heston_call_price: Function to calculate Heston call price
+    - heston_call_price: Optional per-strike pricing function; when omitted the
+      whole strike vector is priced at once with the selected engine
+    - engine: Pricing engine name ('fft', 'laguerre', 'quad'; default FFT)
     
     Returns:
     - strikes: Array of strikes
     - implied_vols: Array of implied volatilities
     """
-    from scipy.optimize import brentq
-    from models.greeks import d1, d2
-    from scipy.stats import norm
-    
-    implied_vols = []
-    valid_strikes = []
-    
-    for K in K_list:
-        try:
-            # Calculate Heston call price
-            heston_price = heston_call_price(S, K, T, r, q, v0, kappa, theta, sigma_v, rho)
-            
-            # Invert Black-Scholes to get implied volatility
-            def bs_iv_error(sigma):
-                if sigma <= 0:
-                    return 1e10
-                try:
-                    d1_val = d1(S, K, T, r, q, sigma)
-                    d2_val = d2(S, K, T, r, q, sigma)
-                    bs_price = S * np.exp(-q * T) * norm.cdf(d1_val) - K * np.exp(-r * T) * norm.cdf(d2_val)
-                    return bs_price - heston_price
-                except:
-                    return 1e10
-            
-            # Find implied volatility using Brent's method
+    from models.greeks import implied_volatility
+    
+    K_list = np.asarray(K_list, dtype=float)
+    if heston_call_price is None:
+        from models.data_analysis.pricing_models.engines import get_pricing_engine
+        prices = get_pricing_engine(engine)(S, K_list, T, r, q, v0, kappa, theta, sigma_v, rho)
+    else:
+        prices = []
+        for K in K_list:
             try:
-                iv = brentq(bs_iv_error, 0.001, 2.0, maxiter=100)
-                implied_vols.append(iv)
-                valid_strikes.append(K)
-            except:
-                # If inversion fails, skip this strike
-                continue
-        except:
-            continue
+                prices.append(heston_call_price(S, K, T, r, q, v0, kappa, theta, sigma_v, rho))
+            except Exception:
+                prices.append(np.nan)
+        prices = np.array(prices, dtype=float)
     
-    return np.array(valid_strikes), np.array(implied_vols)
-
+    # Invert Black-Scholes for the whole smile at once
+    implied_vols = implied_volatility(prices, S, K_list, T, r, q, is_call=True)
+    
+    # Keep strikes whose inversion succeeded within the usual 0.1%-200% range
+    valid = np.isfinite(implied_vols) & (implied_vols >= 0.001) & (implied_vols <= 2.0)
+    return K_list[valid], implied_vols[valid]
@@ -5,20 +5,29 @@ import os
 import threading
 import tkinter as tk
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
 
 from models.data_analysis.pricing_models.heston import (
-    heston_call_price,
-    calibrate_heston_parameters
+    MULTISTART_DEFAULT,
+    calibrate_heston_multistart,
+    calibrate_heston_parameters,
+    calibrate_heston_surface
 )
 from models.data_analysis.pricing_models.heston_simulation import (
     simulate_heston_paths,
+    simulate_heston_statistics,
     calculate_implied_volatility_smile
 )
+from models.data_analysis.pricing_models.calibration_cache import calibrate_with_warm_start
+from models.data_analysis.pricing_models.chain_quotes import chain_call_quotes, initial_variance, numeric_column
+from models.data_analysis.pricing_models.engines import (
+    DEFAULT_ENGINE,
+    ENGINE_LABELS,
+    PRICING_ENGINES
+)
 from utils.time import time_to_expiration
 from config import RISK_FREE_RATE, DIVIDEND_YIELD
 from ui import dialogs
@@ -40,9 +49,24 @@ FACTORY_DEFAULTS = {
     "simulation_days": 30,
     "time_steps": 100,
     "use_fixed_seed": False,
-    "seed_value": 42
+    "seed_value": 42,
+    "pricing_engine": DEFAULT_ENGINE,
+    "calibration_method": "L-BFGS-B",
+    "multi_start": False
+}
+
+# Calibration optimizers offered in the window, keyed by display label
+CALIBRATION_METHODS = {
+    "L-BFGS-B (gradient)": "L-BFGS-B",
+    "Levenberg-Marquardt": "lm",
 }
 
+# Open Heston charts refresh this long after the last slider move
+CHART_DEBOUNCE_MS = 250
+# Strikes per smile batch drawn while the chart fills in
+SMILE_CHUNK = 16
+FAN_PATHS = 10000            # Paths behind the price chart's percentile fan (one in-process chunk)
+
 def load_heston_params():
     """Load Heston model parameters from JSON file"""
     params_path = get_heston_params_file_path()
@@ -58,8 +82,9 @@ def load_heston_params():
 
 
 def save_heston_params(params):
-    """Save Heston model parameters to JSON file"""
+    """Save Heston model parameters to JSON file (merged over the saved values)"""
     try:
+        params = {**load_heston_params(), **params}
         params_path = get_heston_params_file_path()
         with open(params_path, "w") as f:
             json.dump(params, f, indent=2)
@@ -67,6 +92,12 @@ def save_heston_params(params):
         print(f"Failed to save Heston parameters: {e}")
 
 
+def chart_strikes(df, S0):
+    """Sorted unique chain strikes within 50%-150% of spot"""
+    strikes = np.unique(numeric_column(df, "Strike"))
+    return strikes[(strikes >= 0.5 * S0) & (strikes <= 1.5 * S0)]
+
+
 def open_heston_window(dashboard):
     """Open the Heston model configuration window"""
     # Check if we're in single view or multi view
@@ -168,6 +199,13 @@ def open_heston_window(dashboard):
     default_steps = saved_params.get("time_steps", FACTORY_DEFAULTS["time_steps"])
     default_use_fixed_seed = saved_params.get("use_fixed_seed", FACTORY_DEFAULTS["use_fixed_seed"])
     default_seed_value = saved_params.get("seed_value", FACTORY_DEFAULTS["seed_value"])
+    default_engine = saved_params.get("pricing_engine", FACTORY_DEFAULTS["pricing_engine"])
+    if default_engine not in PRICING_ENGINES:
+        default_engine = DEFAULT_ENGINE
+    default_method = saved_params.get("calibration_method", FACTORY_DEFAULTS["calibration_method"])
+    if default_method not in CALIBRATION_METHODS.values():
+        default_method = FACTORY_DEFAULTS["calibration_method"]
+    default_multi_start = saved_params.get("multi_start", FACTORY_DEFAULTS["multi_start"])
     
     # Parameter sliders
     params = {}
@@ -260,6 +298,7 @@ def open_heston_window(dashboard):
             })
         except (ValueError, tk.TclError):
             pass  # Ignore errors when values are invalid
+        schedule_chart_refresh()
     
     def update_theta_label(value):
         params['theta'][1].configure(text=f"{value:.4f}")
@@ -276,6 +315,7 @@ def open_heston_window(dashboard):
             })
         except (ValueError, tk.TclError):
             pass
+        schedule_chart_refresh()
     
     def update_sigma_v_label(value):
         params['sigma_v'][1].configure(text=f"{value:.3f}")
@@ -292,6 +332,7 @@ def open_heston_window(dashboard):
             })
         except (ValueError, tk.TclError):
             pass
+        schedule_chart_refresh()
     
     def update_rho_label(value):
         params['rho'][1].configure(text=f"{value:.3f}")
@@ -308,6 +349,7 @@ def open_heston_window(dashboard):
             })
         except (ValueError, tk.TclError):
             pass
+        schedule_chart_refresh()
     
     kappa_slider.configure(command=update_kappa_label)
     theta_slider.configure(command=update_theta_label)
@@ -347,6 +389,7 @@ def open_heston_window(dashboard):
                 })
         except (ValueError, tk.TclError):
             pass  # Ignore errors when value is empty or invalid
+        schedule_chart_refresh()
     days_var.trace("w", update_days)
     
     # Number of time steps
@@ -382,6 +425,7 @@ def open_heston_window(dashboard):
                 })
         except (ValueError, tk.TclError):
             pass  # Ignore errors when value is empty or invalid
+        schedule_chart_refresh()
     steps_var.trace("w", update_steps)
     
     # Fixed seed option for reproducible results
@@ -454,6 +498,68 @@ def open_heston_window(dashboard):
             pass  # Ignore errors when value is empty or invalid
     seed_var.trace("w", update_seed)
     
+    # Pricing engine used by the volatility smile and the calibrator
+    engine_label = ctk.CTkLabel(
+        main_frame,
+        text="Pricing Engine:",
+        font=ctk.CTkFont(weight="bold")
+    )
+    engine_label.pack(pady=(10, 5))
+    
+    engine_names = {label: name for name, label in ENGINE_LABELS.items()}
+    engine_var = ctk.StringVar(value=ENGINE_LABELS[default_engine])
+    
+    def get_engine():
+        return engine_names.get(engine_var.get(), DEFAULT_ENGINE)
+    
+    def update_engine(label):
+        save_heston_params({"pricing_engine": engine_names.get(label, DEFAULT_ENGINE)})
+    
+    engine_menu = ctk.CTkOptionMenu(
+        main_frame,
+        values=list(ENGINE_LABELS.values()),
+        variable=engine_var,
+        command=update_engine,
+        width=200
+    )
+    engine_menu.pack(pady=(5, 10))
+    
+    # Optimizer used by "Calibrate to Market Data"
+    method_label = ctk.CTkLabel(
+        main_frame,
+        text="Calibration Method:",
+        font=ctk.CTkFont(weight="bold")
+    )
+    method_label.pack(pady=(10, 5))
+    
+    method_labels = {method: label for label, method in CALIBRATION_METHODS.items()}
+    method_var = ctk.StringVar(value=method_labels[default_method])
+    
+    def get_method():
+        return CALIBRATION_METHODS.get(method_var.get(), FACTORY_DEFAULTS["calibration_method"])
+    
+    def update_method(label):
+        save_heston_params({"calibration_method": CALIBRATION_METHODS.get(label, FACTORY_DEFAULTS["calibration_method"])})
+    
+    method_menu = ctk.CTkOptionMenu(
+        main_frame,
+        values=list(CALIBRATION_METHODS.keys()),
+        variable=method_var,
+        command=update_method,
+        width=200
+    )
+    method_menu.pack(pady=(5, 10))
+    
+    # Multi-start: Latin-hypercube starts fitted in parallel worker processes
+    multi_start_var = ctk.BooleanVar(value=default_multi_start)
+    multi_start_checkbox = ctk.CTkCheckBox(
+        main_frame,
+        text=f"Multi-Start Calibration ({MULTISTART_DEFAULT} starts in parallel)",
+        variable=multi_start_var,
+        command=lambda: save_heston_params({"multi_start": multi_start_var.get()})
+    )
+    multi_start_checkbox.pack(pady=(5, 10))
+    
     # Reset to defaults function
     def reset_to_defaults():
         """Reset all parameters to factory default values"""
@@ -475,6 +581,9 @@ def open_heston_window(dashboard):
         use_fixed_seed_var.set(FACTORY_DEFAULTS["use_fixed_seed"])
         seed_var.set(FACTORY_DEFAULTS["seed_value"])
         seed_entry.configure(state="normal" if FACTORY_DEFAULTS["use_fixed_seed"] else "disabled")
+        engine_var.set(ENGINE_LABELS[FACTORY_DEFAULTS["pricing_engine"]])
+        method_var.set(method_labels[FACTORY_DEFAULTS["calibration_method"]])
+        multi_start_var.set(FACTORY_DEFAULTS["multi_start"])
         
         # Update labels
         params['kappa'][1].configure(text=f"{FACTORY_DEFAULTS['kappa']:.2f}")
@@ -863,6 +972,157 @@ def open_heston_window(dashboard):
     )
     help_btn.pack(side="right")
     
+    # Calibration helpers shared by single-expiry and surface calibration
+    def show_calibration_progress(title, text):
+        """Show the calibration progress dialog (light red background while in progress)"""
+        progress_win = ctk.CTkToplevel(win)
+        progress_win.title(title)
+        progress_win.geometry("400x150")
+        progress_win.resizable(False, False)
+        progress_win.configure(fg_color="#ffe6e6")
+        
+        # Center the window
+        progress_win.update_idletasks()
+        screen_w = progress_win.winfo_screenwidth()
+        screen_h = progress_win.winfo_screenheight()
+        win_w = progress_win.winfo_width()
+        win_h = progress_win.winfo_height()
+        x = (screen_w // 2) - (win_w // 2)
+        y = (screen_h // 2) - (win_h // 2)
+        progress_win.geometry(f"{win_w}x{win_h}+{x}+{y}")
+        
+        progress_label = ctk.CTkLabel(
+            progress_win,
+            text=text,
+            font=ctk.CTkFont(size=12),
+            fg_color="#ffe6e6"
+        )
+        progress_label.pack(pady=20)
+        
+        progress_bar = ctk.CTkProgressBar(progress_win, width=300)
+        progress_bar.pack(pady=10)
+        progress_bar.set(0)
+        
+        status_label = ctk.CTkLabel(
+            progress_win,
+            text="Starting optimization...",
+            font=ctk.CTkFont(size=11),
+            fg_color="#ffe6e6"
+        )
+        status_label.pack(pady=5)
+        
+        progress_win.update()
+        return {"win": progress_win, "bar": progress_bar, "label": progress_label, "status": status_label}
+    
+    def apply_calibration_result(result):
+        """Push fitted parameters into the sliders and save them"""
+        kappa_var.set(result['kappa'])
+        theta_var.set(result['theta'])
+        sigma_v_var.set(result['sigma_v'])
+        rho_var.set(result['rho'])
+        
+        params['kappa'][1].configure(text=f"{result['kappa']:.4f}")
+        params['theta'][1].configure(text=f"{result['theta']:.6f}")
+        params['sigma_v'][1].configure(text=f"{result['sigma_v']:.4f}")
+        params['rho'][1].configure(text=f"{result['rho']:.4f}")
+        
+        fitted = {
+            "kappa": result['kappa'],
+            "theta": result['theta'],
+            "sigma_v": result['sigma_v'],
+            "rho": result['rho'],
+            "simulation_days": safe_get_int(days_var, default_days),
+            "time_steps": safe_get_int(steps_var, default_steps),
+            "use_fixed_seed": use_fixed_seed_var.get(),
+            "seed_value": safe_get_int(seed_var, default_seed_value)
+        }
+        if 'v0' in result:
+            fitted["v0"] = result['v0']
+        save_heston_params(fitted)
+    
+    def finish_calibration(progress, result):
+        """Mark the progress dialog complete and report the fitted parameters"""
+        progress["bar"].set(1.0)
+        progress["status"].configure(text="Calibration complete!")
+        # Change to light green background for completion
+        for widget in (progress["win"], progress["label"], progress["status"]):
+            widget.configure(fg_color="#e6ffe6")
+        progress["win"].update()
+        progress["win"].after(500, progress["win"].destroy)
+        
+        # Update parameters even if not fully converged
+        apply_calibration_result(result)
+        
+        if result['success']:
+            surface_text = ""
+            if result.get('reused'):
+                surface_text = "Market moved little since the last fit: reused cached parameters.\n"
+            elif result.get('warm_start'):
+                surface_text = "Warm-started from the cached fit for this expiry.\n"
+            if 'v0' in result:
+                surface_text += (
+                    f"v0 (Initial Variance): {result['v0']:.6f}\n"
+                    f"Expirations: {result['n_expirations']} ({result['n_quotes']} quotes)\n"
+                )
+            dialogs.info(
+                "Calibration Complete",
+                f"Fitted parameters:\n\n"
+                f"κ (Kappa): {result['kappa']:.4f}\n"
+                f"θ (Theta): {result['theta']:.6f}\n"
+                f"σ_v (Sigma_v): {result['sigma_v']:.4f}\n"
+                f"ρ (Rho): {result['rho']:.4f}\n"
+                f"{surface_text}\n"
+                f"Final error: {result['fun']:.6f}\n"
+                f"Iterations: {result.get('nit', 'N/A')}"
+            )
+        else:
+            dialogs.warning(
+                "Calibration Warning",
+                f"Optimization did not fully converge:\n\n"
+                f"{result.get('message', 'Unknown error')}\n\n"
+                f"Results may still be usable. Check the fitted parameters."
+            )
+    
+    def start_calibration(progress, fit, max_iterations=200):
+        """Run fit(callback) on a worker thread, streaming progress back to Tk"""
+        iteration_count = [0]
+        
+        def update_progress(xk=None, fraction=None, text=None):
+            """Callback to update progress during optimization (worker thread)"""
+            iteration_count[0] += 1
+            n = iteration_count[0]
+            if fraction is None:
+                fraction = n / max_iterations
+            if text is None:
+                text = f"Iteration {n}..."
+            
+            def show():
+                if progress["win"].winfo_exists():
+                    progress["bar"].set(min(fraction, 0.95))  # Cap at 95% until done
+                    progress["status"].configure(text=text)
+            win.after(0, show)
+        
+        def run_calibration():
+            try:
+                result = fit(update_progress)
+            except Exception as e:
+                def show_error():
+                    progress["win"].destroy()
+                    dialogs.error(
+                        "Calibration Error",
+                        f"Failed to calibrate parameters:\n\n{str(e)}\n\n"
+                        "Please check that:\n"
+                        "- Option data is valid\n"
+                        "- Strikes and prices are reasonable\n"
+                        "- Initial parameters are within bounds"
+                    )
+                win.after(0, show_error)
+                return
+            win.after(0, lambda: finish_calibration(progress, result))
+        
+        # Run calibration in thread to avoid blocking
+        threading.Thread(target=run_calibration, daemon=True).start()
+    
     # Calibration function
     def calibrate_parameters():
         """Calibrate Heston parameters to market option prices"""
@@ -883,32 +1143,8 @@ def open_heston_window(dashboard):
                 dialogs.warning("No Data", "No options data available for this expiration.")
                 return
             
-            # Extract strikes and market prices
-            strikes = []
-            market_prices = []
-            
-            for row in df.itertuples(index=False):
-                K = float(row.Strike) if hasattr(row, 'Strike') else 0
-                if K <= 0:
-                    continue
-                
-                # Try to get mid price (average of bid and ask)
-                call_bid = float(getattr(row, 'Bid_Call', 0) or 0)
-                call_ask = float(getattr(row, 'Ask_Call', 0) or 0)
-                put_bid = float(getattr(row, 'Bid_Put', 0) or 0)
-                put_ask = float(getattr(row, 'Ask_Put', 0) or 0)
-                
-                # Use call if available, otherwise put
-                if call_bid > 0 and call_ask > 0:
-                    mid_price = (call_bid + call_ask) / 2.0
-                    if mid_price > 0:
-                        strikes.append(K)
-                        market_prices.append(mid_price)
-                elif put_bid > 0 and put_ask > 0:
-                    mid_price = (put_bid + put_ask) / 2.0
-                    if mid_price > 0:
-                        strikes.append(K)
-                        market_prices.append(mid_price)
+            # Extract strikes and call mid prices
+            strikes, market_prices = chain_call_quotes(df, S0, T_exp, r, q)
             
             if len(strikes) < 3:
                 dialogs.warning(
@@ -919,12 +1155,9 @@ def open_heston_window(dashboard):
                 return
             
             # Filter to reasonable range around current price (0.7x to 1.3x)
-            filtered_strikes = []
-            filtered_prices = []
-            for K, price in zip(strikes, market_prices):
-                if 0.7 * S0 <= K <= 1.3 * S0:
-                    filtered_strikes.append(K)
-                    filtered_prices.append(price)
+            in_range = (strikes >= 0.7 * S0) & (strikes <= 1.3 * S0)
+            filtered_strikes = strikes[in_range]
+            filtered_prices = market_prices[in_range]
             
             if len(filtered_strikes) < 3:
                 dialogs.warning(
@@ -934,197 +1167,111 @@ def open_heston_window(dashboard):
                 return
             
             # Calculate initial variance from ATM IV
-            ivs = []
-            for row in df.itertuples(index=False):
-                call_iv = float(getattr(row, 'IV_Call', 0) or 0)
-                put_iv = float(getattr(row, 'IV_Put', 0) or 0)
-                if call_iv > 1:
-                    call_iv /= 100.0
-                if put_iv > 1:
-                    put_iv /= 100.0
-                if call_iv > 0:
-                    ivs.append(call_iv)
-                if put_iv > 0:
-                    ivs.append(put_iv)
-            
-            if not ivs:
+            v0 = initial_variance(state, exp)
+            if v0 is None:
                 dialogs.warning("No Data", "No implied volatility data available for initial variance.")
                 return
             
-            v0 = np.mean([iv**2 for iv in ivs])  # Initial variance
+            # Read the engine and initial guess on the UI thread before handing off to the worker
+            calibration_engine = get_engine()
+            calibration_method = get_method()
+            multi_start = multi_start_var.get()
+            initial = dict(
+                kappa_init=kappa_var.get(),
+                theta_init=theta_var.get(),
+                sigma_v_init=sigma_v_var.get(),
+                rho_init=rho_var.get()
+            )
             
-            # Show progress dialog (light red background for in-progress)
-            progress_win = ctk.CTkToplevel(win)
-            progress_win.title("Calibrating Heston Parameters")
-            progress_win.geometry("400x150")
-            progress_win.resizable(False, False)
+            progress = show_calibration_progress(
+                "Calibrating Heston Parameters",
+                "Calibrating parameters to market prices...\nThis may take a minute."
+            )
             
-            # Set light red background for in-progress dialog
-            progress_win.configure(fg_color="#ffe6e6")
+            def fit(callback):
+                if multi_start:
+                    def report(done, total, iterations, best):
+                        best_text = f", best error {best['fun']:.6f}" if best else ""
+                        callback(
+                            fraction=done / total,
+                            text=f"{done}/{total} starts finished, {iterations} iterations{best_text}"
+                        )
+                    calibrator, progress_kwargs = calibrate_heston_multistart, {"progress": report}
+                else:
+                    calibrator, progress_kwargs = calibrate_heston_parameters, {"callback": callback}
+                
+                # Seeds from (and may reuse) the cached fit for this symbol/expiry bucket
+                return calibrate_with_warm_start(
+                    state.symbol or symbol,
+                    S0, filtered_strikes, filtered_prices, T_exp, r, q, v0,
+                    calibrate=calibrator,
+                    engine=calibration_engine,
+                    method=calibration_method,
+                    **initial,
+                    **progress_kwargs
+                )
             
-            # Center the window
-            progress_win.update_idletasks()
-            screen_w = progress_win.winfo_screenwidth()
-            screen_h = progress_win.winfo_screenheight()
-            win_w = progress_win.winfo_width()
-            win_h = progress_win.winfo_height()
-            x = (screen_w // 2) - (win_w // 2)
-            y = (screen_h // 2) - (win_h // 2)
-            progress_win.geometry(f"{win_w}x{win_h}+{x}+{y}")
+            start_calibration(progress, fit)
             
-            progress_label = ctk.CTkLabel(
-                progress_win,
-                text="Calibrating parameters to market prices...\nThis may take a minute.",
-                font=ctk.CTkFont(size=12),
-                fg_color="#ffe6e6"
-            )
-            progress_label.pack(pady=20)
+        except Exception as e:
+            dialogs.error("Calibration Error", f"Failed to start calibration:\n\n{str(e)}")
+    
+    def calibrate_surface():
+        """Jointly calibrate v0, kappa, theta, sigma_v and rho to all loaded expirations"""
+        try:
+            S0 = state.price
+            r = RISK_FREE_RATE
+            q = DIVIDEND_YIELD
             
-            progress_bar = ctk.CTkProgressBar(progress_win, width=300)
-            progress_bar.pack(pady=10)
-            progress_bar.set(0)
+            if S0 <= 0:
+                dialogs.warning("Invalid Data", "Invalid spot price.")
+                return
             
-            status_label = ctk.CTkLabel(
-                progress_win,
-                text="Starting optimization...",
-                font=ctk.CTkFont(size=11),
-                fg_color="#ffe6e6"
-            )
-            status_label.pack(pady=5)
+            slices = []
+            for exp_key, exp_df in (state.exp_data_map or {}).items():
+                if exp_df is None or exp_df.empty:
+                    continue
+                T = time_to_expiration(exp_key)
+                if T <= 0:
+                    continue
+                strikes, market_prices = chain_call_quotes(exp_df, S0, T, r, q)
+                in_range = (strikes >= 0.7 * S0) & (strikes <= 1.3 * S0)
+                if in_range.sum() >= 3:
+                    slices.append((T, strikes[in_range], market_prices[in_range]))
+            
+            if len(slices) < 2:
+                dialogs.warning(
+                    "Insufficient Data",
+                    "Surface calibration needs at least 2 expirations with 3 or more\n"
+                    "option prices in the 70%-130% of spot range."
+                )
+                return
             
-            progress_win.update()
+            v0_init = initial_variance(state, exp)
             
-            # Track iteration count for progress
-            iteration_count = [0]
-            max_iterations = 200
+            calibration_engine = get_engine()
+            initial = dict(
+                v0_init=v0_init or FACTORY_DEFAULTS["theta"],
+                kappa_init=kappa_var.get(),
+                theta_init=theta_var.get(),
+                sigma_v_init=sigma_v_var.get(),
+                rho_init=rho_var.get()
+            )
             
-            def update_progress(xk):
-                """Callback to update progress during optimization"""
-                iteration_count[0] += 1
-                progress = min(iteration_count[0] / max_iterations, 0.95)  # Cap at 95% until done
-                progress_bar.set(progress)
-                status_label.configure(text=f"Iteration {iteration_count[0]}...")
-                progress_win.update()
+            progress = show_calibration_progress(
+                "Calibrating Heston Surface",
+                f"Calibrating to {len(slices)} expirations...\nThis may take a minute."
+            )
             
-            # Run calibration in a separate thread to avoid blocking UI
-            def run_calibration():
-                try:
-                    # Get current parameter values as initial guess
-                    kappa_init = kappa_var.get()
-                    theta_init = theta_var.get()
-                    sigma_v_init = sigma_v_var.get()
-                    rho_init = rho_var.get()
-                    
-                    result = calibrate_heston_parameters(
-                        S0=S0,
-                        strikes=filtered_strikes,
-                        market_prices=filtered_prices,
-                        T=T_exp,
-                        r=r,
-                        q=q,
-                        v0=v0,
-                        kappa_init=kappa_init,
-                        theta_init=theta_init,
-                        sigma_v_init=sigma_v_init,
-                        rho_init=rho_init,
-                        callback=update_progress
-                    )
-                    
-                    # Update UI with fitted parameters
-                    def update_ui_with_results():
-                        progress_bar.set(1.0)
-                        status_label.configure(text="Calibration complete!")
-                        # Change to light green background for completion
-                        progress_win.configure(fg_color="#e6ffe6")
-                        progress_label.configure(fg_color="#e6ffe6")
-                        status_label.configure(fg_color="#e6ffe6")
-                        progress_win.update()
-                        progress_win.after(500, progress_win.destroy)
-                        
-                        if result['success']:
-                            # Update parameter sliders
-                            kappa_var.set(result['kappa'])
-                            theta_var.set(result['theta'])
-                            sigma_v_var.set(result['sigma_v'])
-                            rho_var.set(result['rho'])
-                            
-                            # Update labels
-                            params['kappa'][1].configure(text=f"{result['kappa']:.4f}")
-                            params['theta'][1].configure(text=f"{result['theta']:.6f}")
-                            params['sigma_v'][1].configure(text=f"{result['sigma_v']:.4f}")
-                            params['rho'][1].configure(text=f"{result['rho']:.4f}")
-                            
-                            # Save fitted parameters
-                            save_heston_params({
-                                "kappa": result['kappa'],
-                                "theta": result['theta'],
-                                "sigma_v": result['sigma_v'],
-                                "rho": result['rho'],
-                                "simulation_days": safe_get_int(days_var, default_days),
-                                "time_steps": safe_get_int(steps_var, default_steps),
-                                "use_fixed_seed": use_fixed_seed_var.get(),
-                                "seed_value": safe_get_int(seed_var, default_seed_value)
-                            })
-                            
-                            # Show success message
-                            dialogs.info(
-                                "Calibration Complete",
-                                f"Fitted parameters:\n\n"
-                                f"κ (Kappa): {result['kappa']:.4f}\n"
-                                f"θ (Theta): {result['theta']:.6f}\n"
-                                f"σ_v (Sigma_v): {result['sigma_v']:.4f}\n"
-                                f"ρ (Rho): {result['rho']:.4f}\n\n"
-                                f"Final error: {result['fun']:.6f}\n"
-                                f"Iterations: {result.get('nit', 'N/A')}"
-                            )
-                        else:
-                            dialogs.warning(
-                                "Calibration Warning",
-                                f"Optimization did not fully converge:\n\n"
-                                f"{result.get('message', 'Unknown error')}\n\n"
-                                f"Results may still be usable. Check the fitted parameters."
-                            )
-                            
-                            # Still update parameters even if not fully converged
-                            kappa_var.set(result['kappa'])
-                            theta_var.set(result['theta'])
-                            sigma_v_var.set(result['sigma_v'])
-                            rho_var.set(result['rho'])
-                            
-                            params['kappa'][1].configure(text=f"{result['kappa']:.4f}")
-                            params['theta'][1].configure(text=f"{result['theta']:.6f}")
-                            params['sigma_v'][1].configure(text=f"{result['sigma_v']:.4f}")
-                            params['rho'][1].configure(text=f"{result['rho']:.4f}")
-                            
-                            save_heston_params({
-                                "kappa": result['kappa'],
-                                "theta": result['theta'],
-                                "sigma_v": result['sigma_v'],
-                                "rho": result['rho'],
-                                "simulation_days": safe_get_int(days_var, default_days),
-                                "time_steps": safe_get_int(steps_var, default_steps),
-                                "use_fixed_seed": use_fixed_seed_var.get(),
-                                "seed_value": safe_get_int(seed_var, default_seed_value)
-                            })
-                    
-                    win.after(0, update_ui_with_results)
-                    
-                except Exception as e:
-                    def show_error():
-                        progress_win.destroy()
-                        dialogs.error(
-                            "Calibration Error",
-                            f"Failed to calibrate parameters:\n\n{str(e)}\n\n"
-                            "Please check that:\n"
-                            "- Option data is valid\n"
-                            "- Strikes and prices are reasonable\n"
-                            "- Initial parameters are within bounds"
-                        )
-                    win.after(0, show_error)
+            def fit(callback):
+                return calibrate_heston_surface(
+                    S0, slices, r, q,
+                    callback=callback,
+                    engine=calibration_engine,
+                    **initial
+                )
             
-            # Run calibration in thread to avoid blocking
-            calibration_thread = threading.Thread(target=run_calibration, daemon=True)
-            calibration_thread.start()
+            start_calibration(progress, fit)
             
         except Exception as e:
             dialogs.error("Calibration Error", f"Failed to start calibration:\n\n{str(e)}")
@@ -1141,6 +1288,18 @@ def open_heston_window(dashboard):
     )
     calibrate_btn.pack(pady=(5, 5))
     
+    # Surface calibration button
+    calibrate_surface_btn = ctk.CTkButton(
+        main_frame,
+        text="Calibrate Surface (All Expirations)",
+        command=calibrate_surface,
+        width=200,
+        height=35,
+        font=ctk.CTkFont(size=12),
+        fg_color=("green", "darkgreen")
+    )
+    calibrate_surface_btn.pack(pady=(5, 5))
+    
     # Reset button
     reset_btn = ctk.CTkButton(
         main_frame,
@@ -1154,194 +1313,311 @@ def open_heston_window(dashboard):
     reset_btn.pack(pady=(5, 5))
     
     # Generate button
-    def generate_heston_chart():
-        """Generate Heston model charts: volatility smile and dynamics"""
+    # Chart computations run on a worker thread. Each run gets a cancel event;
+    # starting a new run cancels the previous one and results tagged with a
+    # stale run id are dropped when they reach the Tk thread.
+    chart_job = {"id": 0, "cancel": None, "after": None, "view": None}
+    
+    def collect_chart_inputs(interactive=True):
+        """Read sliders/entries and market data on the Tk thread (None if invalid)"""
+        warn = dialogs.warning if interactive else (lambda *args: None)
+        
         try:
-            # Get parameters
-            kappa = kappa_var.get()
-            theta = theta_var.get()
-            sigma_v = sigma_v_var.get()
-            rho = rho_var.get()
-            
-            # Safely get days and steps with validation
-            try:
-                n_days = safe_get_int(days_var, default_days)
-                n_steps = safe_get_int(steps_var, default_steps)
-            except (ValueError, tk.TclError):
-                dialogs.warning("Invalid Input", "Days and steps must be valid numbers.")
-                return
-            
-            if n_days <= 0 or n_steps <= 0:
-                dialogs.warning("Invalid Input", "Days and steps must be positive.")
-                return
-            
-            # Get market data
-            S0 = state.price
-            T_exp = time_to_expiration(exp)
-            r = RISK_FREE_RATE
-            q = DIVIDEND_YIELD
-            
-            if S0 <= 0 or T_exp <= 0:
-                dialogs.warning("Invalid Data", "Invalid spot price or expiration date.")
-                return
-            
-            # Get initial variance from market IV
-            df = state.exp_data_map[exp]
-            if df is None or df.empty:
-                dialogs.warning("No Data", "No options data available for this expiration.")
-                return
-            
-            # Calculate average IV for initial variance
-            ivs = []
-            for row in df.itertuples(index=False):
-                call_iv = float(getattr(row, 'IV_Call', 0) or 0)
-                put_iv = float(getattr(row, 'IV_Put', 0) or 0)
-                if call_iv > 1:
-                    call_iv /= 100.0
-                if put_iv > 1:
-                    put_iv /= 100.0
-                if call_iv > 0:
-                    ivs.append(call_iv)
-                if put_iv > 0:
-                    ivs.append(put_iv)
-            
-            if not ivs:
-                dialogs.warning("No Data", "No implied volatility data available.")
-                return
-            
-            v0 = np.mean([iv**2 for iv in ivs])  # Initial variance
-            
-            # Convert days to years for simulation
-            T_sim = n_days / 365.0
-            
-            # Simulate Heston paths
-            # Use fixed seed if checkbox is enabled, otherwise None for random results
-            random_seed = None
-            if use_fixed_seed_var.get():
-                try:
-                    random_seed = safe_get_int(seed_var, 42)
-                except (ValueError, tk.TclError):
-                    random_seed = 42  # Default seed if invalid
-            
-            times, S_paths, v_paths = simulate_heston_paths(
-                S0, v0, T_sim, r, q, kappa, theta, sigma_v, rho, n_steps, n_paths=1, random_seed=random_seed
-            )
-            
-            # Convert times to days
-            times_days = times * 365.0
-            
-            # Get strikes for volatility smile
-            strikes = []
-            for row in df.itertuples(index=False):
-                K = float(row.Strike) if hasattr(row, 'Strike') else 0
-                if K > 0:
-                    strikes.append(K)
-            
-            if not strikes:
-                dialogs.warning("No Data", "No strike prices available.")
-                return
-            
-            strikes = sorted(set(strikes))
-            # Limit to reasonable range around current price
-            strikes = [K for K in strikes if 0.5 * S0 <= K <= 1.5 * S0]
-            
-            if len(strikes) < 3:
-                dialogs.warning("No Data", "Not enough strikes for volatility smile.")
+            n_days = safe_get_int(days_var, default_days)
+            n_steps = safe_get_int(steps_var, default_steps)
+        except (ValueError, tk.TclError):
+            warn("Invalid Input", "Days and steps must be valid numbers.")
+            return None
+        
+        if n_days <= 0 or n_steps <= 0:
+            warn("Invalid Input", "Days and steps must be positive.")
+            return None
+        
+        S0 = state.price
+        T_exp = time_to_expiration(exp)
+        if S0 <= 0 or T_exp <= 0:
+            warn("Invalid Data", "Invalid spot price or expiration date.")
+            return None
+        
+        df = state.exp_data_map[exp]
+        if df is None or df.empty:
+            warn("No Data", "No options data available for this expiration.")
+            return None
+        
+        v0 = initial_variance(state, exp)  # Initial variance
+        if v0 is None:
+            warn("No Data", "No implied volatility data available.")
+            return None
+        
+        strikes = chart_strikes(df, S0)
+        if len(strikes) < 3:
+            warn("No Data", "Not enough strikes for volatility smile.")
+            return None
+        
+        # Use fixed seed if checkbox is enabled, otherwise None for random results
+        random_seed = None
+        if use_fixed_seed_var.get():
+            random_seed = safe_get_int(seed_var, 42)
+        
+        return {
+            "S0": S0, "T_exp": T_exp, "r": RISK_FREE_RATE, "q": DIVIDEND_YIELD, "v0": v0,
+            "kappa": kappa_var.get(), "theta": theta_var.get(),
+            "sigma_v": sigma_v_var.get(), "rho": rho_var.get(),
+            "n_days": n_days, "n_steps": n_steps, "random_seed": random_seed,
+            "strikes": strikes, "engine": get_engine(),
+        }
+    
+    def compute_heston_chart(spec, cancel, post):
+        """Worker thread: simulate the paths, then the smile in strike chunks"""
+        times, S_paths, v_paths = simulate_heston_paths(
+            spec["S0"], spec["v0"], spec["n_days"] / 365.0, spec["r"], spec["q"],
+            spec["kappa"], spec["theta"], spec["sigma_v"], spec["rho"], spec["n_steps"],
+            n_paths=1, random_seed=spec["random_seed"]
+        )
+        if cancel.is_set():
+            return
+        post("paths", (times * 365.0, S_paths[0], v_paths[0]))
+        
+        # Percentile fan around the sample path, streamed without storing paths
+        stats = simulate_heston_statistics(
+            spec["S0"], spec["v0"], spec["n_days"] / 365.0, spec["r"], spec["q"],
+            spec["kappa"], spec["theta"], spec["sigma_v"], spec["rho"], spec["n_steps"],
+            FAN_PATHS, random_seed=spec["random_seed"], max_workers=1
+        )
+        if cancel.is_set():
+            return
+        post("fan", (stats["times"] * 365.0, stats["percentiles"], stats["mean"]))
+        
+        strikes = spec["strikes"]
+        for start in range(0, len(strikes), SMILE_CHUNK):
+            if cancel.is_set():
                 return
-            
-            # Calculate volatility smile at current time
             smile_strikes, smile_ivs = calculate_implied_volatility_smile(
-                S0, strikes, T_exp, r, q, v0, kappa, theta, sigma_v, rho, heston_call_price
+                spec["S0"], strikes[start:start + SMILE_CHUNK], spec["T_exp"], spec["r"], spec["q"],
+                spec["v0"], spec["kappa"], spec["theta"], spec["sigma_v"], spec["rho"],
+                engine=spec["engine"]
             )
-            
-            # Create chart window with two subplots
-            chart_win = ctk.CTkToplevel(dashboard.root)
-            chart_win.geometry("1200x800")
-            current_time = datetime.datetime.now().strftime('%I:%M %p')
-            exp_date = exp.split(":")[0]
-            chart_win.title(f"{symbol} Heston Model Analysis - {exp_date} | {current_time}")
-            
-            # Create matplotlib figure with subplots
-            fig = Figure(figsize=(12, 8), dpi=100)
-            
-            # Plot 1: Volatility Smile
-            ax1 = fig.add_subplot(2, 2, 1)
-            ax1.plot(smile_strikes, smile_ivs * 100, 'o-', linewidth=2, markersize=4, color='blue')
-            ax1.axvline(x=S0, color='red', linestyle='--', linewidth=1, label=f'Spot: ${S0:.2f}')
-            ax1.set_title("Implied Volatility Smile", fontweight="bold", fontsize=12)
-            ax1.set_xlabel("Strike Price", fontweight="bold")
-            ax1.set_ylabel("Implied Volatility (%)", fontweight="bold")
-            ax1.grid(True, alpha=0.3)
-            ax1.legend()
-            
-            # Plot 2: Stock Price Dynamics
-            ax2 = fig.add_subplot(2, 2, 2)
-            ax2.plot(times_days, S_paths[0], linewidth=2, color='green', label='Stock Price')
-            ax2.axhline(y=S0, color='red', linestyle='--', linewidth=1, label=f'Initial: ${S0:.2f}')
-            ax2.set_title("Stock Price Dynamics", fontweight="bold", fontsize=12)
-            ax2.set_xlabel("Time (Days)", fontweight="bold")
-            ax2.set_ylabel("Stock Price ($)", fontweight="bold")
-            ax2.grid(True, alpha=0.3)
-            ax2.legend()
-            
-            # Plot 3: Volatility Dynamics
-            ax3 = fig.add_subplot(2, 2, 3)
+            post("smile", (smile_strikes, smile_ivs))
+        post("done", None)
+    
+    def close_chart_window():
+        if chart_job["cancel"] is not None:
+            chart_job["cancel"].set()
+        view = chart_job["view"]
+        chart_job["view"] = None
+        if view is not None:
+            view["win"].destroy()
+    
+    def create_chart_view():
+        """Chart window with empty artists that the worker results fill in"""
+        chart_win = ctk.CTkToplevel(dashboard.root)
+        chart_win.geometry("1200x800")
+        chart_win.protocol("WM_DELETE_WINDOW", close_chart_window)
+        
+        fig = Figure(figsize=(12, 8), dpi=100)
+        
+        # Plot 1: Volatility Smile
+        ax1 = fig.add_subplot(2, 2, 1)
+        smile_line, = ax1.plot([], [], 'o-', linewidth=2, markersize=4, color='blue')
+        spot_line = ax1.axvline(x=0, color='red', linestyle='--', linewidth=1, label='Spot')
+        ax1.set_title("Implied Volatility Smile", fontweight="bold", fontsize=12)
+        ax1.set_xlabel("Strike Price", fontweight="bold")
+        ax1.set_ylabel("Implied Volatility (%)", fontweight="bold")
+        ax1.grid(True, alpha=0.3)
+        
+        # Plot 2: Stock Price Dynamics
+        ax2 = fig.add_subplot(2, 2, 2)
+        price_line, = ax2.plot([], [], linewidth=2, color='green', label='Stock Price')
+        mean_line, = ax2.plot([], [], linewidth=1, color='gray', linestyle=':', label='Mean')
+        initial_price_line = ax2.axhline(y=0, color='red', linestyle='--', linewidth=1, label='Initial')
+        ax2.set_title("Stock Price Dynamics", fontweight="bold", fontsize=12)
+        ax2.set_xlabel("Time (Days)", fontweight="bold")
+        ax2.set_ylabel("Stock Price ($)", fontweight="bold")
+        ax2.grid(True, alpha=0.3)
+        
+        # Plot 3: Volatility Dynamics
+        ax3 = fig.add_subplot(2, 2, 3)
+        vol_line, = ax3.plot([], [], linewidth=2, color='purple', label='Volatility')
+        initial_vol_line = ax3.axhline(y=0, color='red', linestyle='--', linewidth=1, label='Initial')
+        long_run_vol_line = ax3.axhline(y=0, color='orange', linestyle='--', linewidth=1, label='Long-run')
+        ax3.set_title("Volatility Dynamics", fontweight="bold", fontsize=12)
+        ax3.set_xlabel("Time (Days)", fontweight="bold")
+        ax3.set_ylabel("Volatility (%)", fontweight="bold")
+        ax3.grid(True, alpha=0.3)
+        
+        # Plot 4: Variance Path
+        ax4 = fig.add_subplot(2, 2, 4)
+        var_line, = ax4.plot([], [], linewidth=2, color='blue', label='Variance')
+        initial_var_line = ax4.axhline(y=0, color='red', linestyle='--', linewidth=1, label='Initial')
+        long_run_var_line = ax4.axhline(y=0, color='orange', linestyle='--', linewidth=1, label='Long-run')
+        ax4.set_title("Variance Dynamics", fontweight="bold", fontsize=12)
+        ax4.set_xlabel("Time (Days)", fontweight="bold")
+        ax4.set_ylabel("Variance", fontweight="bold")
+        ax4.grid(True, alpha=0.3)
+        
+        # Embed in tkinter window
+        canvas = FigureCanvasTkAgg(fig, master=chart_win)
+        toolbar = NavigationToolbar2Tk(canvas, chart_win)
+        toolbar.update()
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+        
+        # Bring window to front (but don't block other windows)
+        chart_win.update_idletasks()
+        chart_win.lift()
+        chart_win.focus()
+        chart_win.after(50, lambda: chart_win.lift())
+        chart_win.after(150, lambda: chart_win.lift())
+        
+        return {
+            "win": chart_win, "fig": fig, "canvas": canvas, "axes": (ax1, ax2, ax3, ax4),
+            "smile": smile_line, "spot": spot_line,
+            "price": price_line, "initial_price": initial_price_line,
+            "mean": mean_line, "fan": [],
+            "vol": vol_line, "initial_vol": initial_vol_line, "long_run_vol": long_run_vol_line,
+            "var": var_line, "initial_var": initial_var_line, "long_run_var": long_run_var_line,
+        }
+    
+    def set_hline(line, y, label):
+        line.set_ydata([y, y])
+        line.set_label(label)
+    
+    def reset_chart_view(view, spec):
+        """Clear previous results and draw the reference lines for a new run"""
+        S0, v0, theta = spec["S0"], spec["v0"], spec["theta"]
+        current_time = datetime.datetime.now().strftime('%I:%M %p')
+        exp_date = exp.split(":")[0]
+        view["win"].title(f"{symbol} Heston Model Analysis - {exp_date} | {current_time}")
+        view["fig"].suptitle(
+            f"{symbol} Heston Model Analysis ({exp_date}) - {current_time}\n"
+            f"κ={spec['kappa']:.2f}, θ={theta:.4f}, σ_v={spec['sigma_v']:.3f}, ρ={spec['rho']:.3f}",
+            fontweight="bold",
+            fontsize=14
+        )
+        
+        view["smile_strikes"] = []
+        view["smile_ivs"] = []
+        view["smile"].set_data([], [])
+        view["spot"].set_xdata([S0, S0])
+        view["spot"].set_label(f'Spot: ${S0:.2f}')
+        
+        for name in ("price", "mean", "vol", "var"):
+            view[name].set_data([], [])
+        for band in view["fan"]:
+            band.remove()
+        view["fan"] = []
+        set_hline(view["initial_price"], S0, f'Initial: ${S0:.2f}')
+        initial_vol = np.sqrt(v0) * np.sqrt(252) * 100
+        long_run_vol = np.sqrt(theta) * np.sqrt(252) * 100
+        set_hline(view["initial_vol"], initial_vol, f'Initial: {initial_vol:.2f}%')
+        set_hline(view["long_run_vol"], long_run_vol, f'Long-run: {long_run_vol:.2f}%')
+        set_hline(view["initial_var"], v0, f'Initial: {v0:.4f}')
+        set_hline(view["long_run_var"], theta, f'Long-run: {theta:.4f}')
+        
+        # Smile axis: strike range known up front, IV range filled in as points arrive
+        ax1 = view["axes"][0]
+        ax1.set_xlim(spec["strikes"][0], spec["strikes"][-1])
+        for ax in view["axes"]:
+            ax.legend(loc="best")
+        view["fig"].tight_layout(rect=[0, 0.03, 1, 0.97])
+        view["canvas"].draw_idle()
+    
+    def apply_chart_update(job_id, kind, payload):
+        """Tk thread: draw a worker result unless it belongs to a stale run"""
+        view = chart_job["view"]
+        if job_id != chart_job["id"] or view is None or not view["win"].winfo_exists():
+            return
+        
+        if kind == "paths":
+            times_days, S_path, v_path = payload
+            view["price"].set_data(times_days, S_path)
             # Convert variance to volatility (annualized)
-            vol_paths = np.sqrt(v_paths[0]) * np.sqrt(252) * 100  # Annualized, in percentage
-            ax3.plot(times_days, vol_paths, linewidth=2, color='purple', label='Volatility')
-            initial_vol = np.sqrt(v0) * np.sqrt(252) * 100
-            ax3.axhline(y=initial_vol, color='red', linestyle='--', linewidth=1, label=f'Initial: {initial_vol:.2f}%')
-            long_run_vol = np.sqrt(theta) * np.sqrt(252) * 100
-            ax3.axhline(y=long_run_vol, color='orange', linestyle='--', linewidth=1, label=f'Long-run: {long_run_vol:.2f}%')
-            ax3.set_title("Volatility Dynamics", fontweight="bold", fontsize=12)
-            ax3.set_xlabel("Time (Days)", fontweight="bold")
-            ax3.set_ylabel("Volatility (%)", fontweight="bold")
-            ax3.grid(True, alpha=0.3)
-            ax3.legend()
+            view["vol"].set_data(times_days, np.sqrt(v_path) * np.sqrt(252) * 100)
+            view["var"].set_data(times_days, v_path)
+            for ax in view["axes"][1:]:
+                ax.relim()
+                ax.autoscale_view()
+        elif kind == "fan":
+            times_days, bands, mean = payload
+            ax2 = view["axes"][1]
+            for band in view["fan"]:
+                band.remove()
+            view["fan"] = [
+                ax2.fill_between(times_days, bands[5], bands[95], color='green', alpha=0.10, linewidth=0, label='5-95%'),
+                ax2.fill_between(times_days, bands[25], bands[75], color='green', alpha=0.20, linewidth=0, label='25-75%'),
+            ]
+            view["mean"].set_data(times_days, mean)
+            ax2.relim()
+            # relim() only sees lines; add the outer band's extent
+            ax2.update_datalim(np.column_stack((np.concatenate((times_days, times_days)),
+                                                np.concatenate((bands[5], bands[95])))))
+            ax2.autoscale_view()
+            ax2.legend(loc="best")
+        elif kind == "smile":
+            smile_strikes, smile_ivs = payload
+            view["smile_strikes"].extend(smile_strikes)
+            view["smile_ivs"].extend(smile_ivs * 100)
+            view["smile"].set_data(view["smile_strikes"], view["smile_ivs"])
+            ax1 = view["axes"][0]
+            ax1.relim()
+            ax1.autoscale_view(scalex=False)
+        elif kind == "error":
+            dialogs.error("Error", f"Failed to generate Heston chart: {payload}")
+            return
+        view["canvas"].draw_idle()
+    
+    def generate_heston_chart(interactive=True):
+        """Generate Heston model charts: volatility smile and dynamics"""
+        if chart_job["after"] is not None:
+            win.after_cancel(chart_job["after"])
+            chart_job["after"] = None
+        
+        if not interactive and chart_job["view"] is None:
+            return  # Chart was closed while a refresh was pending
+        
+        try:
+            spec = collect_chart_inputs(interactive)
+            if spec is None:
+                return
             
-            # Plot 4: Variance Path
-            ax4 = fig.add_subplot(2, 2, 4)
-            ax4.plot(times_days, v_paths[0], linewidth=2, color='blue', label='Variance')
-            ax4.axhline(y=v0, color='red', linestyle='--', linewidth=1, label=f'Initial: {v0:.4f}')
-            ax4.axhline(y=theta, color='orange', linestyle='--', linewidth=1, label=f'Long-run: {theta:.4f}')
-            ax4.set_title("Variance Dynamics", fontweight="bold", fontsize=12)
-            ax4.set_xlabel("Time (Days)", fontweight="bold")
-            ax4.set_ylabel("Variance", fontweight="bold")
-            ax4.grid(True, alpha=0.3)
-            ax4.legend()
+            # Cancel the previous run; its queued results are dropped by id
+            if chart_job["cancel"] is not None:
+                chart_job["cancel"].set()
+            cancel = threading.Event()
+            chart_job["id"] += 1
+            chart_job["cancel"] = cancel
+            job_id = chart_job["id"]
             
-            fig.suptitle(
-                f"{symbol} Heston Model Analysis ({exp_date}) - {current_time}\n"
-                f"κ={kappa:.2f}, θ={theta:.4f}, σ_v={sigma_v:.3f}, ρ={rho:.3f}",
-                fontweight="bold",
-                fontsize=14
-            )
-            fig.tight_layout(rect=[0, 0.03, 1, 0.97])
+            view = chart_job["view"]
+            if view is None or not view["win"].winfo_exists():
+                view = chart_job["view"] = create_chart_view()
+            elif interactive:
+                view["win"].lift()
+            reset_chart_view(view, spec)
             
-            # Embed in tkinter window
-            canvas = FigureCanvasTkAgg(fig, master=chart_win)
-            canvas.draw()
-            toolbar = NavigationToolbar2Tk(canvas, chart_win)
-            toolbar.update()
-            canvas.get_tk_widget().pack(fill="both", expand=True)
+            def post(kind, payload):
+                if cancel.is_set():
+                    return
+                try:
+                    win.after(0, lambda: apply_chart_update(job_id, kind, payload))
+                except (RuntimeError, tk.TclError):
+                    cancel.set()  # Heston window closed
+            
+            def run():
+                try:
+                    compute_heston_chart(spec, cancel, post)
+                except Exception as e:
+                    post("error", str(e))
             
-            # Bring window to front (but don't block other windows)
-            chart_win.update_idletasks()
-            chart_win.lift()
-            chart_win.focus()
-            # Ensure it comes to front after rendering, but don't use grab_set or topmost
-            # This allows other windows to be accessed while still bringing this one forward
-            chart_win.after(50, lambda: chart_win.lift())
-            chart_win.after(150, lambda: chart_win.lift())
+            threading.Thread(target=run, daemon=True).start()
             
             # Save parameters after generating chart (in case they were changed)
             save_heston_params({
-                "kappa": kappa,
-                "theta": theta,
-                "sigma_v": sigma_v,
-                "rho": rho,
-                "simulation_days": n_days,
-                "time_steps": n_steps,
+                "kappa": spec["kappa"],
+                "theta": spec["theta"],
+                "sigma_v": spec["sigma_v"],
+                "rho": spec["rho"],
+                "simulation_days": spec["n_days"],
+                "time_steps": spec["n_steps"],
                 "use_fixed_seed": use_fixed_seed_var.get(),
                 "seed_value": safe_get_int(seed_var, default_seed_value)
             })
@@ -1350,6 +1626,14 @@ def open_heston_window(dashboard):
             import traceback
             dialogs.error("Error", f"Failed to generate Heston chart: {str(e)}\n\n{traceback.format_exc()}")
     
+    def schedule_chart_refresh():
+        """Debounce slider moves: refresh an open chart once they settle"""
+        if chart_job["view"] is None:
+            return
+        if chart_job["after"] is not None:
+            win.after_cancel(chart_job["after"])
+        chart_job["after"] = win.after(CHART_DEBOUNCE_MS, lambda: generate_heston_chart(interactive=False))
+    
     generate_btn = ctk.CTkButton(
         main_frame,
         text="Generate Heston Chart",
@@ -0,0 +1,176 @@
+"""
+Accuracy checks for the vectorized Heston pricers.
+
+Run from the options_dashboard folder:
+    python -m pytest models/data_analysis/pricing_models/test_heston_pricing.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+_OPTIONS_DASHBOARD = Path(__file__).resolve().parents[3]
+for path in (_OPTIONS_DASHBOARD, _OPTIONS_DASHBOARD.parent):
+    path_str = str(path)
+    if path_str not in sys.path:
+        sys.path.insert(0, path_str)
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+from scipy.integrate import quad  # noqa: E402
+
+from models.data_analysis.pricing_models.engines import (  # noqa: E402
+    GRADIENT_ENGINES,
+    get_pricing_engine,
+)
+from models.data_analysis.pricing_models.heston import (  # noqa: E402
+    GRADIENT_PARAMS,
+    HESTON_GREEKS,
+    heston_call_greeks,
+    heston_call_prices,
+    heston_cf,
+    heston_greeks,
+    laguerre_grid,
+)
+from models.data_analysis.pricing_models.heston_fft import heston_fft_call_prices  # noqa: E402
+
+S0, R, Q = 100.0, 0.03, 0.01
+STRIKES = np.linspace(70.0, 140.0, 15)
+
+# (T, (v0, kappa, theta, sigma, rho)): short, typical and long-dated smiles
+CASES = [
+    (0.1, (0.02, 3.0, 0.03, 0.3, -0.3)),
+    (0.5, (0.04, 2.0, 0.04, 0.5, -0.7)),
+    (2.0, (0.09, 1.5, 0.06, 0.8, -0.5)),
+]
+
+
+def quad_reference(K, T, v0, kappa, theta, sigma, rho):
+    """
+    Call price from tight adaptive quadrature over [0, inf).
+
+    The quad engine in engines.py truncates at u = 100 with 1e-6 tolerances,
+    which is too loose to check the fixed-grid pricers against.
+    """
+    def probability(j):
+        norm = S0*np.exp((R - Q)*T) if j == 1 else 1.0
+
+        def integrand(u):
+            phi = heston_cf(u - 1j*(j == 1), S0, T, R, Q, v0, kappa, theta, sigma, rho) / norm
+            return (np.exp(-1j*u*np.log(K))*phi/(1j*u)).real
+
+        return 0.5 + quad(integrand, 0, np.inf, limit=500, epsabs=1e-13, epsrel=1e-13)[0]/np.pi
+
+    return S0*np.exp(-Q*T)*probability(1) - K*np.exp(-R*T)*probability(2)
+
+
+@pytest.mark.parametrize("T, params", CASES)
+def test_laguerre_prices_match_quad(T, params):
+    expected = np.array([quad_reference(K, T, *params) for K in STRIKES])
+    prices = heston_call_prices(S0, STRIKES, T, R, Q, *params)
+    np.testing.assert_allclose(prices, expected, rtol=0, atol=1e-6)
+
+
+def test_laguerre_prices_keep_strike_shape():
+    T, params = CASES[1]
+    grid = STRIKES.reshape(3, 5)
+    prices = heston_call_prices(S0, grid, T, R, Q, *params)
+    assert prices.shape == grid.shape
+    np.testing.assert_allclose(prices.ravel(), heston_call_prices(S0, STRIKES, T, R, Q, *params))
+
+
+@pytest.mark.parametrize("n_nodes", [64, 128, 185])
+def test_laguerre_prices_are_stable_in_node_count(n_nodes):
+    T, params = CASES[1]
+    np.testing.assert_allclose(heston_call_prices(S0, STRIKES, T, R, Q, *params, n_nodes=n_nodes),
+                               heston_call_prices(S0, STRIKES, T, R, Q, *params), rtol=0, atol=1e-6)
+
+
+@pytest.mark.parametrize("n_nodes", [0, 2.5, 200, 400])
+def test_laguerre_grid_rejects_unusable_node_counts(n_nodes):
+    with pytest.raises(ValueError):
+        laguerre_grid(n_nodes)
+
+
+@pytest.mark.parametrize("T, params", CASES)
+def test_fft_prices_match_quad(T, params):
+    expected = np.array([quad_reference(K, T, *params) for K in STRIKES])
+    prices = heston_fft_call_prices(S0, STRIKES, T, R, Q, *params)
+    np.testing.assert_allclose(prices, expected, rtol=0, atol=2e-6)
+
+
+def test_little_trap_cf_is_continuous_for_long_maturities():
+    # Vol-of-vol and maturity large enough for the original Heston form to
+    # jump branches of the complex log
+    T, params = 10.0, (0.04, 0.5, 0.04, 1.0, -0.9)
+    u = np.linspace(0.01, 20.0, 20000)
+    phi = heston_cf(u, 1.0, T, R, Q, *params)
+    assert np.all(np.isfinite(phi))
+    assert np.abs(np.diff(phi)).max() < 1e-3
+    # Martingale condition: phi(-i) is the forward
+    forward = heston_cf(np.array([-1j]), S0, T, R, Q, *params)[0]
+    assert forward == pytest.approx(S0*np.exp((R - Q)*T), rel=1e-12)
+
+
+# Keyword name in the pricer signatures for each row of the gradient
+PRICER_ARGS = {"kappa": "kappa", "theta": "theta", "sigma_v": "sigma", "rho": "rho", "v0": "v0"}
+
+
+@pytest.mark.parametrize("engine", sorted(GRADIENT_ENGINES))
+def test_price_gradient_matches_finite_differences(engine):
+    T, (v0, kappa, theta, sigma, rho) = CASES[1]
+    params = dict(v0=v0, kappa=kappa, theta=theta, sigma=sigma, rho=rho)
+    price = get_pricing_engine(engine)
+    prices, jac = GRADIENT_ENGINES[engine](S0, STRIKES, T, R, Q, **params)
+
+    np.testing.assert_allclose(prices, price(S0, STRIKES, T, R, Q, **params), rtol=0, atol=1e-10)
+    assert jac.shape == (len(GRADIENT_PARAMS), len(STRIKES))
+    h = 1e-5
+    for row, name in enumerate(GRADIENT_PARAMS):
+        arg = PRICER_ARGS[name]
+        up = dict(params, **{arg: params[arg] + h})
+        down = dict(params, **{arg: params[arg] - h})
+        central = (price(S0, STRIKES, T, R, Q, **up) - price(S0, STRIKES, T, R, Q, **down))/(2*h)
+        np.testing.assert_allclose(jac[row], central, rtol=1e-6, atol=1e-6, err_msg=name)
+
+
+def bumped_greeks(S, T, v0, kappa, theta, sigma, rho):
+    """Central-difference Greeks, with volatility Greeks w.r.t. sqrt(v0)"""
+    vol = np.sqrt(v0)
+
+    def price(spot=S, tau=T, v=vol):
+        return heston_call_prices(spot, STRIKES, tau, R, Q, v**2, kappa, theta, sigma, rho)
+
+    hS, hv, hT = 0.01, 1e-4, 1e-5
+    return {
+        "delta": (price(S + hS) - price(S - hS))/(2*hS),
+        "gamma": (price(S + hS) - 2*price() + price(S - hS))/hS**2,
+        "vega": (price(v=vol + hv) - price(v=vol - hv))/(2*hv),
+        "vanna": (price(S + hS, v=vol + hv) - price(S - hS, v=vol + hv)
+                  - price(S + hS, v=vol - hv) + price(S - hS, v=vol - hv))/(4*hS*hv),
+        "volga": (price(v=vol + hv) - 2*price() + price(v=vol - hv))/hv**2,
+        "charm": -(price(S + hS, tau=T + hT) - price(S - hS, tau=T + hT)
+                   - price(S + hS, tau=T - hT) + price(S - hS, tau=T - hT))/(4*hS*hT),
+    }
+
+
+@pytest.mark.parametrize("T, params", CASES)
+def test_greeks_match_finite_differences(T, params):
+    greeks = heston_call_greeks(S0, STRIKES, T, R, Q, *params)
+    np.testing.assert_allclose(greeks["price"], heston_call_prices(S0, STRIKES, T, R, Q, *params), atol=1e-10)
+    expected = bumped_greeks(S0, T, *params)
+    assert set(expected) == set(HESTON_GREEKS)
+    for name, value in expected.items():
+        scale = max(1.0, np.abs(value).max())
+        np.testing.assert_allclose(greeks[name], value, rtol=0, atol=1e-5*scale, err_msg=name)
+
+
+def test_single_greek_matches_vector_greeks():
+    T, params = CASES[1]
+    greeks = heston_call_greeks(S0, STRIKES, T, R, Q, *params)
+    assert heston_greeks(S0, 100.0, T, R, Q, *params, greek="Gamma") == pytest.approx(
+        float(heston_call_greeks(S0, 100.0, T, R, Q, *params)["gamma"]))
+    np.testing.assert_allclose(heston_greeks(S0, STRIKES, T, R, Q, *params, greek="vanna"), greeks["vanna"])
+    with pytest.raises(ValueError):
+        heston_greeks(S0, 100.0, T, R, Q, *params, greek="rho")
@@ -0,0 +1,85 @@
+"""
+Bias checks for the Heston Monte Carlo simulators.
+
+Monte Carlo prices are compared with the Gauss-Laguerre price; with fixed
+seeds, a 4 standard error bound leaves room only for real bias.
+
+Run from the options_dashboard folder:
+    python -m pytest models/data_analysis/pricing_models/test_heston_simulation.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+_OPTIONS_DASHBOARD = Path(__file__).resolve().parents[3]
+for path in (_OPTIONS_DASHBOARD, _OPTIONS_DASHBOARD.parent):
+    path_str = str(path)
+    if path_str not in sys.path:
+        sys.path.insert(0, path_str)
+
+import numpy as np  # noqa: E402
+
+from models.data_analysis.pricing_models.heston import heston_call_prices  # noqa: E402
+from models.data_analysis.pricing_models.heston_simulation import (  # noqa: E402
+    _normal_blocks,
+    _pair_antithetic,
+    simulate_heston_paths,
+    simulate_heston_statistics,
+)
+
+S0, R, Q, T = 100.0, 0.03, 0.01, 1.0
+V0, KAPPA, THETA, SIGMA_V, RHO = 0.04, 2.0, 0.04, 0.5, -0.7
+STRIKES = np.array([80.0, 100.0, 120.0])
+MAX_Z = 4.0
+
+
+def analytic_calls():
+    return heston_call_prices(S0, STRIKES, T, R, Q, V0, KAPPA, THETA, SIGMA_V, RHO)
+
+
+def test_qe_call_prices_are_unbiased():
+    _, S, _ = simulate_heston_paths(S0, V0, T, R, Q, KAPPA, THETA, SIGMA_V, RHO,
+                                    n_steps=32, n_paths=40000, random_seed=11)
+    payoffs = np.exp(-R*T)*np.maximum(S[:, -1, None] - STRIKES[None, :], 0.0)
+    stderr = payoffs.std(axis=0, ddof=1)/np.sqrt(len(payoffs))
+    z = (payoffs.mean(axis=0) - analytic_calls())/stderr
+    assert np.all(np.abs(z) < MAX_Z), z
+
+
+def test_qe_discounted_spot_is_a_martingale():
+    _, S, _ = simulate_heston_paths(S0, V0, T, R, Q, KAPPA, THETA, SIGMA_V, RHO,
+                                    n_steps=32, n_paths=40000, random_seed=12)
+    discounted = S[:, -1]*np.exp(-(R - Q)*T)
+    z = (discounted.mean() - S0)/(discounted.std(ddof=1)/np.sqrt(len(discounted)))
+    assert abs(z) < MAX_Z
+
+
+def test_seeded_paths_are_reproducible_and_leave_global_rng_alone():
+    state = np.random.get_state()[1].copy()
+    first = simulate_heston_paths(S0, V0, T, R, Q, KAPPA, THETA, SIGMA_V, RHO, n_steps=8, n_paths=10, random_seed=3)
+    second = simulate_heston_paths(S0, V0, T, R, Q, KAPPA, THETA, SIGMA_V, RHO, n_steps=8, n_paths=10, random_seed=3)
+    np.testing.assert_array_equal(first[1], second[1])
+    np.testing.assert_array_equal(first[2], second[2])
+    np.testing.assert_array_equal(np.random.get_state()[1], state)
+
+
+def test_antithetic_pairs_match_their_negated_draws():
+    # Odd path count: paths i and i + 3 are partners, path 2 has none
+    n_paths = 5
+    Z = next(_normal_blocks(np.random.default_rng(0), 1, n_paths, True, np.float64))
+    np.testing.assert_array_equal(Z[..., :2], -Z[..., 3:])
+    paired = _pair_antithetic(Z[0, 0], n_paths)
+    assert len(paired) == 3
+    np.testing.assert_array_equal(paired[:2], 0.0)
+    assert paired[2] == Z[0, 0, 2]
+
+
+def test_antithetic_statistics_are_unbiased_for_odd_chunks():
+    # A tiny odd chunk size makes every chunk carry an unpaired path
+    result = simulate_heston_statistics(S0, V0, T, R, Q, KAPPA, THETA, SIGMA_V, RHO,
+                                        n_steps=20, n_paths=15000, strikes=STRIKES,
+                                        chunk_paths=5, random_seed=1, max_workers=1)
+    z = (result["call_prices"] - analytic_calls())/result["call_stderr"]
+    assert np.all(np.abs(z) < MAX_Z), z
@@ -8,6 +8,7 @@ from matplotlib.figure import Figure
 from scipy.stats import norm
 
 from models.greeks import gamma
+from models.iv_surface import normalize_iv
 from utils.time import time_to_expiration
 from config import RISK_FREE_RATE, DIVIDEND_YIELD
 
@@ -17,9 +18,7 @@ def calc_gamma_exposure(S, K, vol, T, r, q, opt_type, OI):
     if T == 0 or vol == 0:
         return 0
     
-    # Convert IV from percentage to decimal if needed
-    if vol > 1:
-        vol = vol / 100.0
+    vol = normalize_iv(vol)
     
     dp = (np.log(S / K) + (r - q + 0.5 * vol**2) * T) / (vol * np.sqrt(T))
     
@@ -33,6 +32,100 @@ def calc_gamma_exposure(S, K, vol, T, r, q, opt_type, OI):
         return OI * 100 * S * S * 0.01 * gamma_val * -1  # Negative for puts
 
 
+def gamma_exposure_profile(levels, strikes, call_iv, put_iv, call_oi, put_oi, T, r, q):
+    """
+    Net gamma exposure at each spot level, summed over the chain.
+
+    Vectorized form of calc_gamma_exposure over (levels x strikes); options
+    without a usable IV contribute nothing.
+    """
+    S = np.asarray(levels, dtype=float)[:, None]
+    K = np.asarray(strikes, dtype=float)
+    sqrt_T = np.sqrt(T)
+
+    call_vol, put_vol = normalize_iv(np.asarray(call_iv, dtype=float)), normalize_iv(np.asarray(put_iv, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dp = (np.log(S / K) + (r - q + 0.5 * call_vol**2) * T) / (call_vol * sqrt_T)
+        call_gamma = np.exp(-q * T) * norm.pdf(dp) / (S * call_vol * sqrt_T)
+        dm = (np.log(S / K) + (r - q - 0.5 * put_vol**2) * T) / (put_vol * sqrt_T)
+        put_gamma = K * np.exp(-r * T) * norm.pdf(dm) / (S * S * put_vol * sqrt_T)
+    scale = 100 * S * S * 0.01
+    calls = np.where(call_vol > 0, call_oi * scale * call_gamma, 0.0)
+    puts = np.where(put_vol > 0, put_oi * scale * put_gamma, 0.0)
+    # Puts are negative; NaN quotes are skipped like the DataFrame sums did
+    return np.nansum(calls, axis=1) - np.nansum(puts, axis=1)
+
+
+def compute_gamma_profile(state, expiration, n_levels=60):
+    """
+    Gamma profile of one expiration over 80%-120% of spot.
+
+    Returns a dict with levels, total_gamma (Bn per 1% move), zero_gamma,
+    spot and the level range, or None when the chain has no usable strikes.
+    """
+    df = state.exp_data_map.get(expiration)
+    spot_price = state.price
+    if df is None or df.empty or spot_price <= 0:
+        return None
+    
+    # Calculate strike range (80% to 120% of spot)
+    from_strike = 0.8 * spot_price
+    to_strike = 1.2 * spot_price
+    
+    # Calculate time to expiration
+    T = time_to_expiration(expiration)
+    if T <= 0:
+        # For 0DTE options, set to 1 day to avoid exclusion
+        T = 1 / 262
+    
+    # Quoted IVs are replaced by the ticker's IV surface
+    strikes = pd.to_numeric(df["Strike"], errors="coerce").fillna(0).to_numpy(dtype=float) if "Strike" in df.columns else np.zeros(len(df))
+    keep = ~(strikes <= 0)
+    if not keep.any():
+        return None
+    
+    def column(name):
+        if name not in df.columns:
+            return np.zeros(keep.sum())
+        return pd.to_numeric(df[name], errors="coerce").fillna(0).to_numpy(dtype=float)[keep]
+    
+    strikes = strikes[keep]
+    call_iv, put_iv = column("IV_Call"), column("IV_Put")
+    surface_iv = state.iv_surface().iv(strikes, T)
+    use_surface = surface_iv > 0
+    call_iv = np.where(use_surface & (call_iv > 0), surface_iv, call_iv)
+    put_iv = np.where(use_surface & (put_iv > 0), surface_iv, put_iv)
+    
+    # Calculate gamma profile at different spot levels, in billions
+    levels = np.linspace(from_strike, to_strike, n_levels)
+    total_gamma = gamma_exposure_profile(
+        levels, strikes, call_iv, put_iv, column("OI_Call"), column("OI_Put"),
+        T, RISK_FREE_RATE, DIVIDEND_YIELD
+    ) / 1e9
+    
+    # Find Gamma Flip Point (zero crossing)
+    zero_cross_idx = np.where(np.diff(np.sign(total_gamma)))[0]
+    
+    if len(zero_cross_idx) > 0:
+        neg_gamma = total_gamma[zero_cross_idx[0]]
+        pos_gamma = total_gamma[zero_cross_idx[0] + 1]
+        neg_strike = levels[zero_cross_idx[0]]
+        pos_strike = levels[zero_cross_idx[0] + 1]
+        
+        zero_gamma = pos_strike - ((pos_strike - neg_strike) * pos_gamma / (pos_gamma - neg_gamma))
+    else:
+        zero_gamma = None
+    
+    return {
+        "levels": levels,
+        "total_gamma": total_gamma,
+        "zero_gamma": zero_gamma,
+        "spot": spot_price,
+        "from_strike": from_strike,
+        "to_strike": to_strike,
+    }
+
+
 def is_third_friday(d):
     """Check if date is the third Friday of the month"""
     return d.weekday() == 4 and 15 <= d.day <= 21
@@ -64,102 +157,49 @@ def generate_gamma_profile(dashboard, symbol, state, expiration):
         dialogs.warning("Invalid Price", "Invalid spot price for this ticker.")
         return
     
-    # Calculate strike range (80% to 120% of spot)
-    from_strike = 0.8 * spot_price
-    to_strike = 1.2 * spot_price
-    
-    # Get today's date
-    today_date = datetime.datetime.now()
-    
-    # Calculate time to expiration
-    T = time_to_expiration(expiration)
-    if T <= 0:
-        # For 0DTE options, set to 1 day to avoid exclusion
-        T = 1 / 262
-    
-    # Parse expiration date
-    try:
-        exp_datetime = datetime.datetime.strptime(expiration.split(":")[0], "%Y-%m-%d")
-    except:
-        exp_datetime = today_date
-    
-    # Prepare data rows
-    all_rows = []
-    for _, row in df.iterrows():
-        strike = float(row.get("Strike", 0) or 0)
-        if strike <= 0:
-            continue
-        
-        call_iv = float(row.get("IV_Call", 0) or 0)
-        put_iv = float(row.get("IV_Put", 0) or 0)
-        call_oi = float(row.get("OI_Call", 0) or 0)
-        put_oi = float(row.get("OI_Put", 0) or 0)
-        
-        all_rows.append({
-            "Strike": strike,
-            "CallIV": call_iv,
-            "PutIV": put_iv,
-            "CallOI": call_oi,
-            "PutOI": put_oi,
-            "ExpirationDate": exp_datetime,
-            "daysTillExp": T,
-            "ExpirationKey": expiration
-        })
-    
-    if not all_rows:
+    profile = compute_gamma_profile(state, expiration)
+    if profile is None:
         from ui import dialogs
         dialogs.warning("No Data", "No valid options data found.")
         return
     
-    df = pd.DataFrame(all_rows)
-    
-    # Calculate gamma profile at different spot levels
-    levels = np.linspace(from_strike, to_strike, 60)
-    
-    total_gamma = []
-    
-    # For each spot level, calculate gamma exposure
-    for level in levels:
-        df['callGammaEx'] = df.apply(
-            lambda row: calc_gamma_exposure(
-                level, row['Strike'], row['CallIV'], 
-                row['daysTillExp'], RISK_FREE_RATE, DIVIDEND_YIELD, 
-                "call", row['CallOI']
-            ), axis=1
-        )
-        
-        df['putGammaEx'] = df.apply(
-            lambda row: calc_gamma_exposure(
-                level, row['Strike'], row['PutIV'], 
-                row['daysTillExp'], RISK_FREE_RATE, DIVIDEND_YIELD, 
-                "put", row['PutOI']
-            ), axis=1
-        )
-        
-        # Total gamma (calls - puts, puts are already negative in calc_gamma_exposure)
-        total_gamma.append(df['callGammaEx'].sum() + df['putGammaEx'].sum())
+    # Regenerating an open profile refreshes it in place instead of opening another window
+    if not hasattr(dashboard, '_gamma_profile_views'):
+        dashboard._gamma_profile_views = {}
+    key = (symbol, expiration)
+    view = dashboard._gamma_profile_views.get(key)
+    if view is not None and view["win"].winfo_exists():
+        update_gamma_profile_view(view, symbol, expiration, profile)
+        view["win"].lift()
+        view["win"].focus()
+        return
     
-    # Convert to billions
-    total_gamma = np.array(total_gamma) / 1e9
+    view = create_gamma_profile_view(dashboard, key)
+    update_gamma_profile_view(view, symbol, expiration, profile)
     
-    # Find Gamma Flip Point (zero crossing)
-    zero_cross_idx = np.where(np.diff(np.sign(total_gamma)))[0]
+    # Redraw when the refresh loops bring a new chain or price for this ticker
+    def refresh(changes):
+        live_state = dashboard.ticker_data.get(symbol)
+        if not live_state or expiration not in live_state.exp_data_map:
+            return
+        live_profile = compute_gamma_profile(live_state, expiration)
+        if live_profile is not None:
+            update_gamma_profile_view(view, symbol, expiration, live_profile)
     
-    if len(zero_cross_idx) > 0:
-        neg_gamma = total_gamma[zero_cross_idx[0]]
-        pos_gamma = total_gamma[zero_cross_idx[0] + 1]
-        neg_strike = levels[zero_cross_idx[0]]
-        pos_strike = levels[zero_cross_idx[0] + 1]
-        
-        zero_gamma = pos_strike - ((pos_strike - neg_strike) * pos_gamma / (pos_gamma - neg_gamma))
-    else:
-        zero_gamma = None
+    from ui.dashboard.live_charts import subscribe_chart_window
+    subscribe_chart_window(dashboard, view["win"], state.symbol, refresh)
     
-    # Create the chart window
+    # Bring window to front
+    win = view["win"]
+    win.update_idletasks()
+    win.lift()
+    win.focus()
+
+
+def create_gamma_profile_view(dashboard, key):
+    """Gamma profile window with artists that update_gamma_profile_view fills in"""
     win = ctk.CTkToplevel(dashboard.root)
     win.geometry("1000x700")
-    current_time = datetime.datetime.now().strftime('%I:%M %p')
-    win.title(f"{symbol} Gamma Profile | {current_time}")
     
     # Ensure window stays in front
     win.lift()
@@ -170,49 +210,95 @@ def generate_gamma_profile(dashboard, symbol, state, expiration):
     # Create matplotlib figure
     fig = Figure(figsize=(10, 6), dpi=100)
     ax = fig.add_subplot(111)
-    
-    # Plot the gamma profile
-    exp_date_str = expiration.split(":")[0]
-    ax.plot(levels, total_gamma, label=f"Expiration: {exp_date_str}", linewidth=2)
-    
-    # Add vertical lines
-    ax.axvline(x=spot_price, color='r', lw=2, label=f"Spot: ${spot_price:,.0f}")
-    if zero_gamma:
-        ax.axvline(x=zero_gamma, color='g', lw=2, label=f"Gamma Flip: ${zero_gamma:,.0f}")
+    profile_line, = ax.plot([], [], linewidth=2)
+    spot_line = ax.axvline(x=0, color='r', lw=2)
+    flip_line = ax.axvline(x=0, color='g', lw=2)
     ax.axhline(y=0, color='grey', lw=1, linestyle='--')
     
-    # Add shaded regions
-    trans = ax.get_xaxis_transform()
-    if zero_gamma:
-        ax.fill_between(
-            [from_strike, zero_gamma], 
-            min(total_gamma), max(total_gamma), 
-            facecolor='red', alpha=0.1, transform=trans
-        )
-        ax.fill_between(
-            [zero_gamma, to_strike], 
-            min(total_gamma), max(total_gamma), 
-            facecolor='green', alpha=0.1, transform=trans
-        )
-    
-    # Formatting
-    chart_title = f"Gamma Exposure Profile, {symbol}, {today_date.strftime('%d %b %Y')}"
-    ax.set_title(chart_title, fontweight="bold", fontsize=16)
     ax.set_xlabel('Index Price', fontweight="bold")
     ax.set_ylabel('Gamma Exposure ($ billions/1% move)', fontweight="bold")
-    ax.set_xlim([from_strike, to_strike])
     ax.grid(True, alpha=0.3)
-    ax.legend()
     
     # Embed in tkinter window
     canvas = FigureCanvasTkAgg(fig, master=win)
-    canvas.draw()
     toolbar = NavigationToolbar2Tk(canvas, win)
     toolbar.update()
     canvas.get_tk_widget().pack(fill="both", expand=True)
     
-    # Bring window to front
-    win.update_idletasks()
-    win.lift()
-    win.focus()
+    view = {
+        "win": win, "fig": fig, "ax": ax, "canvas": canvas,
+        "profile": profile_line, "spot": spot_line, "flip": flip_line,
+        "regions": [], "drawn": False,
+    }
+    dashboard._gamma_profile_views[key] = view
+    
+    def on_destroy(event):
+        # <Destroy> also fires for every child widget of the window
+        if event.widget is not win:
+            return
+        if dashboard._gamma_profile_views.get(key) is view:
+            del dashboard._gamma_profile_views[key]
+        fig.clear()
+    
+    win.bind("<Destroy>", on_destroy, add="+")
+    return view
 
+
+def update_gamma_profile_view(view, symbol, expiration, profile):
+    """Point the view's line, spot/flip markers and shading at a new profile"""
+    levels = profile["levels"]
+    total_gamma = profile["total_gamma"]
+    zero_gamma = profile["zero_gamma"]
+    spot_price = profile["spot"]
+    from_strike, to_strike = profile["from_strike"], profile["to_strike"]
+    ax = view["ax"]
+    
+    current_time = datetime.datetime.now().strftime('%I:%M %p')
+    view["win"].title(f"{symbol} Gamma Profile | {current_time}")
+    
+    exp_date_str = expiration.split(":")[0]
+    view["profile"].set_data(levels, total_gamma)
+    view["profile"].set_label(f"Expiration: {exp_date_str}")
+    view["spot"].set_xdata([spot_price, spot_price])
+    view["spot"].set_label(f"Spot: ${spot_price:,.0f}")
+    
+    # Shaded regions are rebuilt (two artists); the flip line is moved or hidden
+    for region in view["regions"]:
+        region.remove()
+    view["regions"] = []
+    handles = [view["profile"], view["spot"]]
+    if zero_gamma:
+        view["flip"].set_xdata([zero_gamma, zero_gamma])
+        view["flip"].set_label(f"Gamma Flip: ${zero_gamma:,.0f}")
+        view["flip"].set_visible(True)
+        handles.append(view["flip"])
+        trans = ax.get_xaxis_transform()
+        view["regions"] = [
+            ax.fill_between(
+                [from_strike, zero_gamma], 
+                min(total_gamma), max(total_gamma), 
+                facecolor='red', alpha=0.1, transform=trans
+            ),
+            ax.fill_between(
+                [zero_gamma, to_strike], 
+                min(total_gamma), max(total_gamma), 
+                facecolor='green', alpha=0.1, transform=trans
+            ),
+        ]
+    else:
+        view["flip"].set_visible(False)
+    
+    # Formatting
+    today_date = datetime.datetime.now()
+    chart_title = f"Gamma Exposure Profile, {symbol}, {today_date.strftime('%d %b %Y')}"
+    ax.set_title(chart_title, fontweight="bold", fontsize=16)
+    ax.set_xlim([from_strike, to_strike])
+    ax.relim(visible_only=True)
+    ax.autoscale_view(scalex=False)
+    ax.legend(handles=handles)
+    
+    if view["drawn"]:
+        view["canvas"].draw_idle()
+    else:
+        view["canvas"].draw()
+        view["drawn"] = True
@@ -1,36 +1,48 @@
 import numpy as np
-from models.greeks import gamma
 from models.exposure import gamma_exposure
+from scipy.stats import norm
 
-def total_gamma_at_spot(df, spot, T, r, q):
-    total = 0.0
+def _chain_arrays(df, T, surface=None):
+    """Strikes, call/put IVs and OI as arrays; IVs from the IV surface when given"""
+    from models.data_analysis.pricing_models.chain_quotes import numeric_column
+    
+    strikes = numeric_column(df, "Strike")
+    call_iv = numeric_column(df, "IV_Call")
+    put_iv = numeric_column(df, "IV_Put")
+    call_oi = numeric_column(df, "OI_Call")
+    put_oi = numeric_column(df, "OI_Put")
+    if surface is not None:
+        surface_iv = surface.iv(strikes, T)
+        call_iv = np.where((call_iv > 0) & np.isfinite(surface_iv), surface_iv, call_iv)
+        put_iv = np.where((put_iv > 0) & np.isfinite(surface_iv), surface_iv, put_iv)
+    return strikes, call_iv, put_iv, call_oi, put_oi
 
-    # Use itertuples() instead of iterrows() for better performance
-    for row in df.itertuples(index=False):
-        strike = float(row.Strike) if hasattr(row, 'Strike') else 0
-        if strike <= 0:
-            continue
-        call_iv = float(getattr(row, 'IV_Call', 0) or 0)
-        put_iv  = float(getattr(row, 'IV_Put', 0) or 0)
-        call_oi = float(getattr(row, 'OI_Call', 0) or 0)
-        put_oi  = float(getattr(row, 'OI_Put', 0) or 0)
-        if call_iv > 0 and call_oi > 0:
-            g_call = gamma(spot, strike, T, r, q, call_iv)
-            total += gamma_exposure(g_call, spot, call_oi)
 
-        if put_iv > 0 and put_oi > 0:
-            g_put = gamma(spot, strike, T, r, q, put_iv)
-            total -= gamma_exposure(g_put, spot, put_oi)
+def _gamma(spot, strikes, T, r, q, iv):
+    """Black-Scholes gamma for arrays of strikes/IVs (0 where IV or strike is invalid)"""
+    valid = (strikes > 0) & (iv > 0)
+    safe_iv = np.where(valid, iv, 1.0)
+    safe_K = np.where(valid, strikes, 1.0)
+    d1 = (np.log(spot / safe_K) + (r - q + 0.5 * safe_iv**2) * T) / (safe_iv * np.sqrt(T))
+    g = np.exp(-q * T) * norm.pdf(d1) / (spot * safe_iv * np.sqrt(T))
+    return np.where(valid, g, 0.0)
 
-    return total
 
+def total_gamma_at_spot(df, spot, T, r, q, surface=None):
+    if T <= 0 or spot <= 0:
+        return 0.0
+    strikes, call_iv, put_iv, call_oi, put_oi = _chain_arrays(df, T, surface)
+    calls = gamma_exposure(_gamma(spot, strikes, T, r, q, call_iv), spot, np.where(call_oi > 0, call_oi, 0.0))
+    puts = gamma_exposure(_gamma(spot, strikes, T, r, q, put_iv), spot, np.where(put_oi > 0, put_oi, 0.0))
+    return float(calls.sum() - puts.sum())
 
-def find_zero_gamma(df, spot_min, spot_max, steps, T, r, q):
+
+def find_zero_gamma(df, spot_min, spot_max, steps, T, r, q, surface=None):
     spots = np.linspace(spot_min, spot_max, steps)
     prev_val = None
     prev_spot = None
     for s in spots:
-        g = total_gamma_at_spot(df, s, T, r, q)
+        g = total_gamma_at_spot(df, s, T, r, q, surface)
         if prev_val is not None and g * prev_val < 0:
             return (s + prev_spot) / 2.0
         prev_val = g
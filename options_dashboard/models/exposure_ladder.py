@@ -0,0 +1,144 @@
+"""
+Dealer exposures precomputed on a ladder of spot prices.
+
+The spot-scenario slider used to rebuild the whole chart for every move.
+Instead, the exposures of one expiration are computed once on a grid of
+spots around the current price (all four models in one broadcast over
+spots x options) and slider moves interpolate between grid points.
+"""
+
+import numpy as np
+from scipy.stats import norm
+
+from models.exposure import gamma_exposure, vanna_exposure, volga_exposure, charm_exposure
+from models.data_analysis.pricing_models.chain_quotes import numeric_column
+from models.data_analysis.pricing_models.heston import heston_call_greeks
+from models.iv_surface import normalize_iv
+
+
+EXPOSURE_MODELS = ("Gamma", "Vanna", "Volga", "Charm")
+LADDER_WIDTH = 0.15          # Spots from (1 - width) to (1 + width) x spot...
+LADDER_STEP = 0.0025         # ...in steps of this fraction of spot
+FLIP_SEARCH_WIDTH = 0.10     # Dealer flip is searched within +/- 10% of the scenario spot
+
+
+def _black_scholes_greeks(S, K, T, r, q, iv):
+    """Black-Scholes gamma, vanna, volga, vega and call charm broadcast over S and K/iv"""
+    sqrt_T = np.sqrt(T)
+    d1 = (np.log(S / K) + (r - q + 0.5 * iv**2) * T) / (iv * sqrt_T)
+    d2 = d1 - iv * sqrt_T
+    disc_q = np.exp(-q * T)
+    pdf = norm.pdf(d1)
+    vega = S * disc_q * pdf * sqrt_T
+    return {
+        "gamma": disc_q * pdf / (S * iv * sqrt_T),
+        "vanna": disc_q * pdf * d2 / iv,
+        "volga": vega * d1 * d2 / iv,
+        "vega": vega,
+        "charm": q * disc_q * norm.cdf(d1) - disc_q * pdf * (2 * (r - q) * T - d2 * iv * sqrt_T) / (2 * T * iv * sqrt_T),
+    }
+
+
+class ExposureLadder:
+    """Per-option exposures of one expiration for every spot on a grid."""
+
+    def __init__(self, spots, strikes, types, exposures, total_gamma):
+        self.spots = spots                # (n_spots,), uniform
+        self.strikes = strikes            # (n_options,) calls first, then puts
+        self.types = types                # (n_options,) "CALL" / "PUT"
+        self.exposures = exposures        # model -> (n_spots, n_options)
+        self.total_gamma = total_gamma    # (n_spots,) net Black-Scholes gamma, for the dealer flip
+
+    def _position(self, spot):
+        x = np.clip((spot - self.spots[0]) / (self.spots[1] - self.spots[0]), 0, len(self.spots) - 1)
+        i = min(int(x), len(self.spots) - 2)
+        return i, x - i
+
+    def covers(self, spot):
+        return self.spots[0] <= spot <= self.spots[-1]
+
+    def exposures_at(self, spot, model_name):
+        """Exposure of every option at spot, interpolated linearly between ladder points"""
+        values = self.exposures[model_name]
+        if len(self.spots) == 1:
+            return values[0]
+        i, f = self._position(spot)
+        return values[i] * (1 - f) + values[i + 1] * f
+
+    def rows_at(self, spot, model_name):
+        """Exposure rows (Strike, Type, Exposure) as built by the chart pipeline"""
+        return [
+            {"Strike": float(K), "Type": opt, "Exposure": float(value)}
+            for K, opt, value in zip(self.strikes, self.types, self.exposures_at(spot, model_name))
+        ]
+
+    def zero_gamma_at(self, spot, width=FLIP_SEARCH_WIDTH):
+        """
+        Dealer flip for a spot scenario: the first sign change of net gamma
+        scanning up from (1 - width) x spot, like models.dealer.find_zero_gamma.
+        """
+        inside = np.flatnonzero((self.spots >= spot * (1 - width)) & (self.spots <= spot * (1 + width)))
+        if len(inside) < 2:
+            return None
+        g = self.total_gamma[inside]
+        crossings = np.flatnonzero(g[:-1] * g[1:] < 0)
+        if not len(crossings):
+            return None
+        j = crossings[0]
+        s0, s1 = self.spots[inside[j]], self.spots[inside[j + 1]]
+        return float(s0 + (s1 - s0) * g[j] / (g[j] - g[j + 1]))
+
+
+def build_exposure_ladder(df, spot, T, r, q, surface=None, heston_params=None,
+                          width=LADDER_WIDTH, step=LADDER_STEP):
+    """
+    Exposures of every option in one expiration on a grid of spot prices.
+
+    Options are kept and scaled as in the chart's exposure pipeline (IV and
+    OI must be positive, calls positive and puts negative, IVs from the IV
+    surface when given). With heston_params (v0, kappa, theta, sigma_v, rho)
+    the Greeks come from the calibrated Heston model, otherwise from
+    Black-Scholes. All four exposure models are filled in one pass.
+    """
+    n_steps = int(round(width / step))
+    spots = spot * (1 + step * np.arange(-n_steps, n_steps + 1))
+
+    strikes = numeric_column(df, "Strike")
+    surface_iv = surface.iv(strikes, T) if surface is not None else np.full(len(strikes), np.nan)
+    K, iv, surf_iv, oi, sign, types = [], [], [], [], [], []
+    for opt in ("CALL", "PUT"):
+        opt_key = opt.capitalize()
+        row_iv = numeric_column(df, f"IV_{opt_key}")
+        row_oi = numeric_column(df, f"OI_{opt_key}")
+        keep = (strikes > 0) & (row_iv > 0) & (row_oi > 0)
+        K.append(strikes[keep])
+        iv.append(row_iv[keep])
+        surf_iv.append(surface_iv[keep])
+        oi.append(row_oi[keep])
+        sign.append(np.full(keep.sum(), 1.0 if opt == "CALL" else -1.0))
+        types.append(np.full(keep.sum(), opt))
+    K, iv, surf_iv, oi, sign, types = (np.concatenate(a) for a in (K, iv, surf_iv, oi, sign, types))
+    bs_iv = np.where(surf_iv > 0, surf_iv, normalize_iv(iv))
+
+    S = spots[:, None]
+    bs = _black_scholes_greeks(S, K, T, r, q, bs_iv)
+    total_gamma = (sign * gamma_exposure(bs["gamma"], S, oi)).sum(axis=1)
+
+    if heston_params is None or not len(K):
+        greeks = bs
+    else:
+        # Heston Greeks per unique strike, then gathered per option
+        unique_strikes = np.unique(K)
+        greeks = heston_call_greeks(S, unique_strikes, T, r, q, *heston_params)
+        index = np.searchsorted(unique_strikes, K)
+        greeks = {name: values[:, index] for name, values in greeks.items()}
+
+    # Both models give call charm; put charm follows from put-call parity
+    charm = np.where(sign < 0, greeks["charm"] - q * np.exp(-q * T), greeks["charm"])
+    exposures = {
+        "Gamma": sign * gamma_exposure(greeks["gamma"], S, oi),
+        "Vanna": sign * vanna_exposure(np.abs(greeks["vanna"]), S, bs_iv, oi),
+        "Volga": sign * volga_exposure(np.abs(greeks["volga"]), greeks["vega"], oi),
+        "Charm": sign * charm_exposure(np.abs(charm), S, oi),
+    }
+    return ExposureLadder(spots, K, types, exposures, total_gamma)
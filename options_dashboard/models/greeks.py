@@ -30,18 +30,20 @@ def volga(S, K, T, r, q, sigma):
     v = vega(S, K, T, r, q, sigma)
     return v * d1(S, K, T, r, q, sigma) * d2(S, K, T, r, q, sigma) / sigma
 
-def charm(S, K, T, r, q, sigma):
+def charm(S, K, T, r, q, sigma, is_call=True):
+    """Charm (-dDelta/dT); the put's is the call's minus q*exp(-q*T) by put-call parity"""
     if T <= 0 or sigma <= 0:
         return 0.0
     d1v = d1(S, K, T, r, q, sigma)
     d2v = d2(S, K, T, r, q, sigma)
-    return (
+    call_charm = (
         q * exp(-q * T) * norm.cdf(d1v)
         - exp(-q * T) * norm.pdf(d1v)
         * ((2 * (r - q) * T - d2v * sigma * sqrt(T)) / (2 * T * sigma * sqrt(T)))
     )
+    return call_charm if is_call else call_charm - q * exp(-q * T)
 
-def calculate_prob_itm(df, S, T, r):
+def calculate_prob_itm(df, S, T, r, surface=None):
     """
     Calculate Probability ITM for calls and puts.
     
@@ -55,10 +57,14 @@ def calculate_prob_itm(df, S, T, r):
         S: Current stock price
         T: Time to expiration in years
         r: Risk-free rate
+        surface: Optional IVSurface; when given σ is read from it, falling
+            back to the row's IVs where the surface has no value
     
     Returns:
         DataFrame with Prob_ITM_Call and Prob_ITM_Put columns added
     """
+    from models.iv_surface import normalize_iv
+    
     df = df.copy()
     
     # Ensure numeric types
@@ -66,56 +72,118 @@ def calculate_prob_itm(df, S, T, r):
     df['IV_Put'] = pd.to_numeric(df['IV_Put'], errors='coerce')
     df['Strike'] = pd.to_numeric(df['Strike'], errors='coerce')
     
-    # Initialize Prob ITM columns
-    df['Prob_ITM_Call'] = np.nan
-    df['Prob_ITM_Put'] = np.nan
+    # Use the same volatility for both call and put at the same strike:
+    # average of the two when both are valid, otherwise whichever exists
+    iv_call = normalize_iv(df['IV_Call'].to_numpy())
+    iv_put = normalize_iv(df['IV_Put'].to_numpy())
+    has_call = iv_call > 0
+    has_put = iv_put > 0
+    sigma = np.where(has_call & has_put, (iv_call + iv_put) / 2.0, np.where(has_call, iv_call, iv_put))
     
-    # Calculate d2 and Prob ITM for each row
-    for idx in df.index:
-        K = df.loc[idx, 'Strike']
-        iv_call = df.loc[idx, 'IV_Call']
-        iv_put = df.loc[idx, 'IV_Put']
-        
-        # Skip if invalid data
-        if pd.isna(K) or K <= 0 or T <= 0 or S <= 0:
-            continue
-        
-        # Convert IV from percentage to decimal if needed (if IV > 1, assume it's percentage)
-        if not pd.isna(iv_call) and iv_call > 0:
-            if iv_call > 1:
-                iv_call = iv_call / 100.0
-        else:
-            iv_call = None
-            
-        if not pd.isna(iv_put) and iv_put > 0:
-            if iv_put > 1:
-                iv_put = iv_put / 100.0
-        else:
-            iv_put = None
+    K = df['Strike'].to_numpy(dtype=float)
+    if surface is not None and T > 0:
+        surface_iv = surface.iv(K, T)
+        sigma = np.where(np.isfinite(surface_iv), surface_iv, sigma)
+    
+    valid = (K > 0) & (sigma > 0) & (T > 0) & (S > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d2_val = (np.log(S / K) + (r - 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+    
+    # Lower strikes (K < S) have higher call Prob ITM, higher strikes higher put Prob ITM
+    df['Prob_ITM_Call'] = np.where(valid, norm.cdf(d2_val), np.nan)
+    df['Prob_ITM_Put'] = np.where(valid, norm.cdf(-d2_val), np.nan)
+    
+    return df
+
+def bs_price(S, K, T, r, q, sigma, is_call=True):
+    """
+    Black-Scholes price, vectorized over any broadcastable inputs.
+    
+    is_call may be a scalar or a boolean array (True for calls, False for puts).
+    """
+    S, K, T, sigma = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, T, sigma)))
+    sqrt_T = np.sqrt(T)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1v = (np.log(S / K) + (r - q + 0.5 * sigma**2) * T) / (sigma * sqrt_T)
+    d2v = d1v - sigma * sqrt_T
+    disc_S = S * np.exp(-q * T)
+    disc_K = K * np.exp(-r * T)
+    call = disc_S * norm.cdf(d1v) - disc_K * norm.cdf(d2v)
+    put = disc_K * norm.cdf(-d2v) - disc_S * norm.cdf(-d1v)
+    return np.where(is_call, call, put)
+
+def implied_volatility(price, S, K, T, r, q, is_call=True, tol=1e-10, max_iter=40):
+    """
+    Black-Scholes implied volatility for whole arrays of option prices.
+    
+    Each price is mapped to the equivalent out-of-the-money option via
+    put-call parity and inverted in normalized Black form on total
+    volatility s = sigma*sqrt(T):
+    - initial guess from the Corrado-Miller rational approximation,
+    - safeguarded Halley iterations inside a per-element bracket, falling
+      back to bisection whenever a step leaves the bracket,
+    - per-element convergence masks, so converged entries stop updating.
+    
+    Prices outside the no-arbitrage bounds (or with T <= 0) give NaN.
+    """
+    price, S, K, T, is_call = np.broadcast_arrays(
+        np.asarray(price, dtype=float), np.asarray(S, dtype=float),
+        np.asarray(K, dtype=float), np.asarray(T, dtype=float), np.asarray(is_call, dtype=bool)
+    )
+    iv = np.full(price.shape, np.nan)
+    valid = (T > 0) & (S > 0) & (K > 0) & np.isfinite(price)
+    if not valid.any():
+        return iv
+    
+    price, S, K, T, is_call = (a[valid] for a in (price, S, K, T, is_call))
+    # Undiscounted (forward) prices
+    F = S * np.exp((r - q) * T)
+    target = price * np.exp(r * T)
+    call = np.where(is_call, target, target + F - K)  # put-call parity
+    
+    # Invert the OTM option: call when K >= F, put otherwise
+    otm = np.where(K >= F, call, call - (F - K))
+    intrinsic_call = np.maximum(F - K, 0.0)
+    ok = (call > intrinsic_call) & (call < F) & (otm > 0)
+    
+    x = np.log(F / K)
+    is_otm_call = K >= F
+    
+    # Corrado-Miller initial guess for s = sigma*sqrt(T)
+    half = call - (F - K) / 2
+    root = np.sqrt(np.maximum(half**2 - (F - K)**2 / np.pi, 0.0))
+    s = np.sqrt(2 * np.pi) / (F + K) * (half + root)
+    s = np.clip(np.where(np.isfinite(s) & (s > 0), s, 0.2), 1e-4, 5.0)
+    
+    lo = np.full(s.shape, 1e-8)
+    hi = np.full(s.shape, 10.0)
+    active = ok.copy()
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        sa, xa, Fa, Ka = s[active], x[active], F[active], K[active]
+        d1v = xa / sa + sa / 2
+        d2v = d1v - sa
+        c = Fa * norm.cdf(d1v) - Ka * norm.cdf(d2v)
+        model = np.where(is_otm_call[active], c, c - (Fa - Ka))
+        diff = model - otm[active]
+        vega = Fa * norm.pdf(d1v)
         
-        # Use the same volatility for both call and put at the same strike
-        # Prefer IV_Call, fallback to IV_Put, or use average if both available
-        if iv_call is not None and iv_put is not None:
-            sigma = (iv_call + iv_put) / 2.0
-        elif iv_call is not None:
-            sigma = iv_call
-        elif iv_put is not None:
-            sigma = iv_put
-        else:
-            continue  # Skip if no valid IV
+        # Shrink the bracket around the root (price is increasing in s)
+        lo[active] = np.where(diff < 0, sa, lo[active])
+        hi[active] = np.where(diff > 0, sa, hi[active])
         
-        # Calculate d2 (same for both calls and puts at same strike)
-        try:
-            d2_val = (np.log(S / K) + (r - 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-            
-            # For calls: Prob ITM = N(d2)
-            # Lower strikes (K < S) should have higher Prob ITM
-            df.loc[idx, 'Prob_ITM_Call'] = norm.cdf(d2_val)
-            
-            # For puts: Prob ITM = N(-d2)
-            # Higher strikes (K > S) should have higher Prob ITM
-            df.loc[idx, 'Prob_ITM_Put'] = norm.cdf(-d2_val)
-        except (ValueError, ZeroDivisionError):
-            pass
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = diff / vega
+            step = newton / (1 - 0.5 * newton * d1v * d2v / sa)  # Halley correction
+        new_s = sa - step
+        bisect = ~np.isfinite(new_s) | (new_s < lo[active]) | (new_s > hi[active])
+        done = (diff == 0) | (~bisect & (np.abs(step) <= tol * sa))
+        new_s = np.where(done, sa, np.where(bisect, 0.5 * (lo[active] + hi[active]), new_s))
+        s[active] = new_s
+        idx = np.flatnonzero(active)
+        active[idx[done]] = False
     
-    return df
+    out = np.where(ok, s / np.sqrt(T), np.nan)
+    iv[valid] = out
+    return iv
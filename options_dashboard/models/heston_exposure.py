@@ -0,0 +1,95 @@
+"""
+Dealer exposures from Heston Greeks.
+
+Uses the calibrated parameters cached per (symbol, expiry bucket) by the
+Heston window, so exposure charts can switch from Black-Scholes Greeks to
+the calibrated stochastic-volatility model.
+"""
+
+import numpy as np
+from functools import lru_cache
+
+from models.exposure import gamma_exposure, vanna_exposure, volga_exposure, charm_exposure
+from models.data_analysis.pricing_models.calibration_cache import get_calibration_cache
+from models.data_analysis.pricing_models.chain_quotes import chain_v0, numeric_column
+from models.data_analysis.pricing_models.heston import CALIBRATED_PARAMS, heston_call_greeks
+from models.iv_surface import normalize_iv
+
+
+def heston_exposure_params(symbol, df, T, surface=None):
+    """
+    Calibrated (v0, kappa, theta, sigma_v, rho) for symbol/expiry, or None.
+
+    v0 comes from the cached fit when present (surface calibration),
+    otherwise from the IV surface's ATM variance or the chain's IVs.
+    """
+    entry = get_calibration_cache().get(symbol.replace(" (CSV)", ""), T)
+    if entry is None:
+        return None
+    v0 = entry.get("v0") or (surface.atm_variance(T) if surface is not None else None) or chain_v0(df)
+    if v0 is None:
+        return None
+    return (float(v0),) + tuple(float(entry[name]) for name in CALIBRATED_PARAMS)
+
+
+@lru_cache(maxsize=256)
+def _chain_greeks(params, spot, T, r, q, strikes):
+    """Heston call Greeks for a strike tuple, memoized per (params, spot, expiry)"""
+    greeks = heston_call_greeks(spot, np.array(strikes), T, r, q, *params)
+    for values in greeks.values():
+        values.flags.writeable = False
+    return greeks
+
+
+def heston_exposure_rows(df, symbol, spot, T, model_name, r, q, surface=None):
+    """
+    Exposure rows (Strike, Type, Exposure) priced with calibrated Heston Greeks.
+
+    Follows the Black-Scholes exposure pipeline: same scaling per model and
+    the same sign convention (calls positive, puts negative). Put Greeks
+    come from put-call parity: gamma, vanna, volga and vega equal the call
+    values and put charm is the call charm minus q*exp(-q*T). Vanna is
+    scaled by the same decimal IV as the Black-Scholes path (the surface's,
+    else the row's normalized IV).
+
+    Returns None when no calibration is cached for the symbol and expiry.
+    """
+    params = heston_exposure_params(symbol, df, T, surface)
+    if params is None:
+        return None
+    
+    strikes = numeric_column(df, "Strike")
+    valid = strikes > 0
+    if not valid.any():
+        return []
+    unique_strikes = np.unique(strikes[valid])
+    greeks = _chain_greeks(params, float(spot), float(T), float(r), float(q), tuple(unique_strikes))
+    index = np.searchsorted(unique_strikes, strikes[valid])
+    surface_iv = surface.iv(strikes[valid], T) if surface is not None else np.full(valid.sum(), np.nan)
+    
+    rows = []
+    for opt in ("CALL", "PUT"):
+        opt_key = opt.capitalize()
+        iv = numeric_column(df, f"IV_{opt_key}")[valid]
+        oi = numeric_column(df, f"OI_{opt_key}")[valid]
+        sign = 1 if opt == "CALL" else -1
+        
+        if model_name == "Gamma":
+            exposure = sign * gamma_exposure(greeks["gamma"][index], spot, oi)
+        elif model_name == "Vanna":
+            scale_iv = np.where(surface_iv > 0, surface_iv, normalize_iv(iv))
+            exposure = sign * vanna_exposure(np.abs(greeks["vanna"][index]), spot, scale_iv, oi)
+        elif model_name == "Volga":
+            exposure = sign * volga_exposure(np.abs(greeks["volga"][index]), greeks["vega"][index], oi)
+        else:  # Charm
+            charm = greeks["charm"][index]
+            if opt == "PUT":
+                charm = charm - q * np.exp(-q * T)
+            exposure = sign * charm_exposure(np.abs(charm), spot, oi)
+        
+        keep = (iv > 0) & (oi > 0)
+        rows.extend(
+            {"Strike": float(K), "Type": opt, "Exposure": float(value)}
+            for K, value in zip(strikes[valid][keep], exposure[keep])
+        )
+    return rows
@@ -0,0 +1,237 @@
+"""
+Per-ticker implied volatility surface.
+
+Built once per stored chain from every expiration in a ticker's
+exp_data_map, kept on its TickerState and shared by all analytics
+(probability ITM, dealer gamma, gamma profile, exposure charts, Heston
+v0), so IV cleaning and the percent/decimal convention live in one place.
+
+The surface stores total implied variance w = iv^2 * T on a uniform grid
+of log forward moneyness k = log(K / F(T)) for each expiry. Expiries with
+an SVI/SSVI fit (models.svi) are evaluated from the fitted smile instead,
+which smooths quote noise and extrapolates the wings past the fetched
+strikes. Lookups are vectorized: linear in k, linear in T on total
+variance (flat implied volatility outside the expiry range).
+"""
+
+import numpy as np
+import pandas as pd
+
+from models.svi import fit_smiles, svi_total_variance
+from utils.time import time_to_expiration
+
+
+GRID_POINTS = 201            # Log-moneyness grid size
+MAX_LOG_MONEYNESS = 3.0      # Grid is clipped to |k| <= this
+MIN_IV = 0.005               # Quotes outside [MIN_IV, MAX_IV] are dropped
+MAX_IV = 5.0
+MIN_QUOTES = 3               # Expiries with fewer clean quotes are skipped
+OUTLIER_WINDOW = 5           # Quotes are compared with the median of this many neighbours...
+OUTLIER_LOG_RATIO = 0.5      # ...and dropped when |log(iv / median)| exceeds this
+FIT_SMILES = True            # Smooth/extrapolate expiries with SVI/SSVI fits
+
+
+def normalize_iv(values):
+    """
+    Implied volatilities as decimals.
+
+    The chain sources mix conventions, so values above 1 are taken to be
+    percentages. Missing or non-numeric entries become NaN.
+    """
+    iv = pd.to_numeric(pd.Series(np.atleast_1d(values)), errors="coerce").to_numpy(dtype=float)
+    iv = np.where(iv > 1, iv / 100.0, iv)
+    return iv if np.ndim(values) else float(iv[0])
+
+
+def reject_outliers(iv, window=OUTLIER_WINDOW, max_log_ratio=OUTLIER_LOG_RATIO):
+    """
+    Mask of quotes consistent with their neighbours along the strike axis.
+
+    A quote is an outlier when it is more than exp(max_log_ratio) times
+    above or below the median of the window of strikes centred on it (the
+    median is robust to the outlier itself).
+    """
+    if len(iv) < window:
+        return np.ones(len(iv), dtype=bool)
+    half = window // 2
+    padded = np.pad(np.log(iv), half, mode="reflect")
+    median = np.median(np.lib.stride_tricks.sliding_window_view(padded, window), axis=1)
+    return np.abs(np.log(iv) - median) <= max_log_ratio
+
+
+def chain_smile(df, forward):
+    """
+    Cleaned (strikes, ivs) for one expiration.
+
+    Uses the out-of-the-money side at each strike (puts below the forward,
+    calls above) and the other side where that quote is missing. Quotes
+    outside [MIN_IV, MAX_IV] or far from their neighbours (reject_outliers)
+    are dropped.
+    """
+    strikes = pd.to_numeric(df.get("Strike"), errors="coerce").to_numpy(dtype=float)
+    call_iv = normalize_iv(df["IV_Call"].to_numpy()) if "IV_Call" in df.columns else np.full(len(df), np.nan)
+    put_iv = normalize_iv(df["IV_Put"].to_numpy()) if "IV_Put" in df.columns else np.full(len(df), np.nan)
+    call_ok = (call_iv >= MIN_IV) & (call_iv <= MAX_IV)
+    put_ok = (put_iv >= MIN_IV) & (put_iv <= MAX_IV)
+
+    use_call = np.where(strikes >= forward, call_ok, call_ok & ~put_ok)
+    iv = np.where(use_call, call_iv, put_iv)
+    valid = (strikes > 0) & (use_call | put_ok)
+    strikes, iv = strikes[valid], iv[valid]
+
+    # One quote per strike (chains can repeat strikes across roots)
+    order = np.argsort(strikes)
+    strikes, iv = strikes[order], iv[order]
+    unique, start = np.unique(strikes, return_index=True)
+    iv = np.maximum.reduceat(iv, start) if len(start) else iv
+    keep = reject_outliers(iv)
+    return unique[keep], iv[keep]
+
+
+def butterfly_violations(k, w):
+    """
+    Grid points where a smile fails Durrleman's no-butterfly condition g(k) >= 0.
+    """
+    dw = np.gradient(w, k)
+    d2w = np.gradient(dw, k)
+    g = (1 - k * dw / (2 * w))**2 - dw**2 / 4 * (1 / w + 0.25) + d2w / 2
+    return int(np.count_nonzero(g < -1e-8))
+
+
+class IVSurface:
+    """Total implied variance on a (log forward moneyness, T) grid."""
+
+    def __init__(self, spot, r, q, expiries, times, log_moneyness, total_variance, smiles, fits=None):
+        self.spot = float(spot)
+        self.r = r
+        self.q = q
+        self.expiries = list(expiries)          # Expiration keys, sorted by T
+        self.times = np.asarray(times)          # (n_T,)
+        self.log_moneyness = np.asarray(log_moneyness)   # (n_k,), uniform
+        self.total_variance = np.array(total_variance, dtype=float)  # (n_T, n_k)
+        self.smiles = smiles                    # exp -> (strikes, ivs) cleaned quotes
+        self.fits = fits or {}                  # exp -> (kind, raw SVI params)
+
+        # Raw SVI parameters per expiry (NaN rows: no fit, use the grid)
+        self.svi = np.full((len(self.expiries), 5), np.nan)
+        for row, exp in enumerate(self.expiries):
+            if exp in self.fits:
+                self.svi[row] = self.fits[exp][1]
+                self.total_variance[row] = svi_total_variance(self.svi[row], self.log_moneyness)
+
+        # Calendar arbitrage: total variance must not decrease with T
+        ordered = np.maximum.accumulate(self.total_variance, axis=0)
+        self.calendar_fixes = int(np.count_nonzero(ordered > self.total_variance))
+        self.total_variance = ordered
+        self.butterfly_violations = {
+            exp: butterfly_violations(self.log_moneyness, w)
+            for exp, w in zip(self.expiries, self.total_variance)
+        }
+
+    @property
+    def empty(self):
+        return len(self.times) == 0
+
+    def _slice_variance(self, j, k, grid_w):
+        """Fitted smile of slice(s) j at k where available, else the grid value"""
+        params = self.svi[j]
+        fitted = np.isfinite(params[..., 0])
+        if not fitted.any():
+            return grid_w
+        w = svi_total_variance(np.where(fitted[..., None], params, 0.0), k)
+        return np.where(fitted, w, grid_w)
+
+    def forward(self, T):
+        return self.spot * np.exp((self.r - self.q) * np.asarray(T, dtype=float))
+
+    def total_variance_at(self, k, T):
+        """Total implied variance at log forward moneyness k and maturity T (vectorized)"""
+        k, T = np.broadcast_arrays(np.asarray(k, dtype=float), np.asarray(T, dtype=float))
+        if self.empty:
+            return np.full(k.shape, np.nan)
+
+        # Linear in k on the uniform grid (flat beyond the ends)
+        grid = self.log_moneyness
+        x = np.clip((k - grid[0]) / (grid[1] - grid[0]), 0, len(grid) - 1)
+        i = np.minimum(x.astype(np.intp), len(grid) - 2)
+        fk = x - i
+
+        # Linear in T on total variance; flat implied vol outside [T_min, T_max]
+        times = self.times
+        if len(times) == 1:
+            w = self.total_variance[0, i] * (1 - fk) + self.total_variance[0, i + 1] * fk
+            return self._slice_variance(0, k, w) * T / times[0]
+        j = np.clip(np.searchsorted(times, T) - 1, 0, len(times) - 2)
+        t0, t1 = times[j], times[j + 1]
+        w0 = self.total_variance[j, i] * (1 - fk) + self.total_variance[j, i + 1] * fk
+        w1 = self.total_variance[j + 1, i] * (1 - fk) + self.total_variance[j + 1, i + 1] * fk
+        w0 = self._slice_variance(j, k, w0)
+        w1 = np.maximum(self._slice_variance(j + 1, k, w1), w0)  # No calendar arbitrage
+        ft = (T - t0) / (t1 - t0)
+        w = w0 + (w1 - w0) * ft
+        w = np.where(T < times[0], w0 * T / times[0], w)
+        return np.where(T > times[-1], w1 * T / times[-1], w)
+
+    def iv(self, K, T):
+        """Implied volatility (decimal) at strike(s) K and maturity T; NaN where undefined"""
+        K, T = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(T, dtype=float))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = np.log(K / self.forward(T))
+            iv = np.sqrt(self.total_variance_at(k, T) / T)
+        iv = np.where((K > 0) & (T > 0), iv, np.nan)
+        return iv if iv.ndim else float(iv)
+
+    def atm_variance(self, T):
+        """At-the-money-forward implied variance, e.g. as a Heston v0 estimate"""
+        if self.empty or T <= 0:
+            return None
+        return float(self.total_variance_at(0.0, T) / T)
+
+
+def build_iv_surface(exp_data_map, spot, r, q, symbol=None, fit=FIT_SMILES):
+    """
+    Build an IVSurface from every expiration in exp_data_map.
+
+    With fit=True each expiry is also fitted with SVI (SSVI for thin
+    slices), warm-started from the last fit for the same symbol.
+    """
+    quotes = []
+    for exp, df in (exp_data_map or {}).items():
+        if df is None or df.empty:
+            continue
+        T = time_to_expiration(exp)
+        if T <= 0:
+            continue
+        strikes, ivs = chain_smile(df, spot * np.exp((r - q) * T))
+        if len(strikes) >= MIN_QUOTES:
+            quotes.append((T, exp, strikes, ivs))
+    quotes.sort(key=lambda item: item[0])
+
+    if not quotes:
+        return IVSurface(spot, r, q, [], [], np.linspace(-1, 1, GRID_POINTS), np.empty((0, GRID_POINTS)), {})
+
+    k_quotes = [np.log(strikes / (spot * np.exp((r - q) * T))) for T, _, strikes, _ in quotes]
+    k_min = max(min(k.min() for k in k_quotes), -MAX_LOG_MONEYNESS)
+    k_max = min(max(k.max() for k in k_quotes), MAX_LOG_MONEYNESS)
+    if k_max - k_min < 1e-6:
+        k_min, k_max = k_min - 0.01, k_max + 0.01
+    grid = np.linspace(k_min, k_max, GRID_POINTS)
+
+    # Interpolate implied vol (flat in the wings), then convert to total variance
+    total_variance = np.array([
+        np.interp(grid, k, ivs)**2 * T for (T, _, _, ivs), k in zip(quotes, k_quotes)
+    ])
+    fits = {}
+    if fit:
+        fits = fit_smiles(symbol, [
+            (exp, T, k, ivs**2 * T) for (T, exp, _, ivs), k in zip(quotes, k_quotes)
+        ])
+    return IVSurface(
+        spot, r, q,
+        expiries=[exp for _, exp, _, _ in quotes],
+        times=[T for T, _, _, _ in quotes],
+        log_moneyness=grid,
+        total_variance=total_variance,
+        smiles={exp: (strikes, ivs) for _, exp, strikes, ivs in quotes},
+        fits=fits,
+    )
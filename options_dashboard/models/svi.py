@@ -0,0 +1,299 @@
+"""
+Parametric smile fits: raw SVI per expiry and SSVI across expiries.
+
+Raw SVI (Gatheral) gives total implied variance as a function of log
+forward moneyness k:
+
+    w(k) = a + b * (rho * (k - m) + sqrt((k - m)^2 + sigma^2))
+
+SSVI (Gatheral-Jacquier) ties every expiry to its ATM total variance
+theta with three global parameters (rho, eta, gamma):
+
+    w(k, theta) = theta/2 * (1 + rho*phi*k + sqrt((phi*k + rho)^2 + 1 - rho^2))
+    phi(theta) = eta / (theta^gamma * (1 + theta)^(1 - gamma))
+
+All raw SVI slices of a ticker are fitted together in one vectorized
+least-squares problem, warm-started from the previous fit for the same
+(symbol, expiry), so a refresh usually takes a few iterations in total.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from scipy.optimize import least_squares
+
+from config import MAX_TICKERS
+
+
+SVI_PARAMS = ("a", "b", "rho", "m", "sigma")
+SSVI_PARAMS = ("rho", "eta", "gamma")
+
+MIN_SVI_QUOTES = 5           # Fewer quotes: the slice falls back to SSVI
+MAX_FIT_RMSE = 0.02          # Reject fits with IV RMSE above 2 vol points
+PENALTY = 100.0              # Weight of the no-arbitrage penalty residuals
+WARM_START_MAX_NFEV = 50     # Evaluation cap when starting from a previous fit
+WARM_STARTS_PER_TICKER = 64  # Warm starts kept per ticker (expiries + its SSVI fit)
+
+
+def svi_total_variance(params, k):
+    """Raw SVI total variance; params may carry leading batch dimensions (..., 5)"""
+    params = np.asarray(params, dtype=float)
+    a, b, rho, m, sigma = np.moveaxis(params, -1, 0)
+    z = k - m
+    return a + b * (rho * z + np.sqrt(z**2 + sigma**2))
+
+
+def _stack_slices(slices):
+    """Concatenated (k, w, weights) of (k, w, T, weights) slices and each quote's slice index"""
+    k = np.concatenate([sl[0] for sl in slices])
+    w = np.concatenate([sl[1] for sl in slices])
+    weights = np.concatenate([sl[3] for sl in slices])
+    owner = np.repeat(np.arange(len(slices)), [len(sl[0]) for sl in slices])
+    return k, w, weights, owner
+
+
+def _svi_residuals(x, k, w, weights, owner):
+    """
+    Residuals of every slice in one vector: weighted misfits of all quotes,
+    then per slice the penalties for negative minimum variance
+    a + b*sigma*sqrt(1 - rho^2) and Lee's wing bound b*(1 + |rho|) <= 4.
+    """
+    params = x.reshape(-1, 5)
+    a, b, rho, m, sigma = params.T
+    residuals = weights * (svi_total_variance(params[owner], k) - w)
+    min_variance = a + b * sigma * np.sqrt(1 - rho**2)
+    wing = b * (1 + np.abs(rho)) - 4
+    return np.concatenate((residuals, PENALTY * np.maximum(-min_variance, 0.0), PENALTY * np.maximum(wing, 0.0)))
+
+
+def _svi_jacobian(x, k, w, weights, owner):
+    """Block-diagonal Jacobian of _svi_residuals: each slice's rows only touch its 5 columns"""
+    params = x.reshape(-1, 5)
+    a, b, rho, m, sigma = params.T
+    n_slices, n_quotes = len(params), len(k)
+    jac = np.zeros((n_quotes + 2 * n_slices, 5 * n_slices))
+
+    rows, cols = np.arange(n_quotes), 5 * owner
+    b_q, rho_q, sigma_q = b[owner], rho[owner], sigma[owner]
+    z = k - m[owner]
+    R = np.sqrt(z**2 + sigma_q**2)
+    jac[rows, cols] = weights
+    jac[rows, cols + 1] = weights * (rho_q * z + R)
+    jac[rows, cols + 2] = weights * b_q * z
+    jac[rows, cols + 3] = weights * b_q * (-rho_q - z / R)
+    jac[rows, cols + 4] = weights * b_q * sigma_q / R
+
+    block = 5 * np.arange(n_slices)[:, None] + np.arange(5)
+    s = np.sqrt(1 - rho**2)
+    zero = np.zeros(n_slices)
+    min_variance_active = (a + b * sigma * s < 0)[:, None]
+    jac[n_quotes + np.arange(n_slices)[:, None], block] = -PENALTY * min_variance_active * np.stack(
+        (np.ones(n_slices), sigma * s, -b * sigma * rho / s, zero, b * s), axis=1)
+    wing_active = (b * (1 + np.abs(rho)) - 4 > 0)[:, None]
+    jac[n_quotes + n_slices + np.arange(n_slices)[:, None], block] = PENALTY * wing_active * np.stack(
+        (zero, 1 + np.abs(rho), b * np.sign(rho), zero, zero), axis=1)
+    return jac
+
+
+def _svi_bounds(k, w):
+    w_max = max(float(np.max(w)), 1e-4)
+    lower = [-w_max, 1e-6, -0.999, float(k.min()) - 1.0, 1e-4]
+    upper = [w_max, 4.0, 0.999, float(k.max()) + 1.0, 5.0]
+    return lower, upper
+
+
+def _svi_default_start(k, w):
+    rho, sigma = -0.3, 0.1
+    b = 0.1
+    a = max(float(np.min(w)) - b * sigma * np.sqrt(1 - rho**2), 1e-6)
+    return np.array([a, b, rho, float(k[np.argmin(w)]), sigma])
+
+
+def _iv_rmse(params, k, w, T):
+    fitted = svi_total_variance(params, k)
+    return float(np.sqrt(np.mean((np.sqrt(np.maximum(fitted, 0) / T) - np.sqrt(w / T))**2)))
+
+
+def _fit_stacked(slices, starts, max_nfev=None):
+    """One least-squares fit of raw SVI to all slices at once; per-slice params, or None on failure"""
+    k, w, weights, owner = _stack_slices(slices)
+    bounds = [_svi_bounds(sl[0], sl[1]) for sl in slices]
+    lower = np.concatenate([lo for lo, _ in bounds])
+    upper = np.concatenate([hi for _, hi in bounds])
+    start = np.clip(np.concatenate(starts), lower + 1e-9, upper - 1e-9)
+    try:
+        result = least_squares(
+            _svi_residuals, start, jac=_svi_jacobian, args=(k, w, weights, owner),
+            bounds=(lower, upper), method="trf", max_nfev=max_nfev,
+        )
+    except (ValueError, np.linalg.LinAlgError):
+        return None
+    return result.x.reshape(-1, 5)
+
+
+def fit_svi_slices(slices, x0s=None):
+    """
+    Fit raw SVI to several slices in one vectorized least-squares problem.
+
+    slices is a list of (k, w, T) or (k, w, T, weights); x0s optional
+    per-slice starts (e.g. the previous refresh's fits, None for none).
+    Slices are stacked into one objective with a block-diagonal Jacobian,
+    so the optimizer's Python overhead is paid once per refresh rather
+    than once per expiry. Warm-started slices first get an evaluation-
+    capped fit; any that do not fit well enough are refitted from the
+    generic guess.
+
+    Returns a list of (params, iv_rmse) aligned with slices, with
+    (None, rmse) where a slice cannot be fitted.
+    """
+    prepared = []
+    for sl in slices:
+        k, w, T = (np.asarray(sl[0], dtype=float), np.asarray(sl[1], dtype=float), float(sl[2]))
+        weights = np.ones_like(k) if len(sl) < 4 or sl[3] is None else np.asarray(sl[3], dtype=float)
+        prepared.append((k, w, T, weights))
+    x0s = [None] * len(prepared) if x0s is None else list(x0s)
+
+    best = [None] * len(prepared)
+    best_rmse = [np.inf] * len(prepared)
+    usable = [i for i, sl in enumerate(prepared) if len(sl[0]) >= MIN_SVI_QUOTES]
+
+    def fit(indices, starts, max_nfev=None):
+        params = _fit_stacked([prepared[i] for i in indices], starts, max_nfev)
+        if params is None:
+            return
+        for i, x in zip(indices, params):
+            k, w, T, _ = prepared[i]
+            iv_rmse = _iv_rmse(x, k, w, T)
+            if iv_rmse < best_rmse[i]:
+                best[i], best_rmse[i] = x, iv_rmse
+
+    warm = [i for i in usable if x0s[i] is not None]
+    cold = [i for i in usable if x0s[i] is None]
+    if warm:
+        fit(warm, [np.asarray(x0s[i], dtype=float) for i in warm], WARM_START_MAX_NFEV)
+    # Slices without a good warm fit start over from the generic guess
+    cold += [i for i in warm if best_rmse[i] >= MAX_FIT_RMSE / 4]
+    if cold:
+        cold.sort()
+        fit(cold, [_svi_default_start(prepared[i][0], prepared[i][1]) for i in cold])
+
+    return [
+        (params, rmse) if params is not None and rmse <= MAX_FIT_RMSE else (None, rmse)
+        for params, rmse in zip(best, best_rmse)
+    ]
+
+
+def fit_svi(k, w, T, x0=None, weights=None):
+    """
+    Fit raw SVI to one slice of total variances.
+
+    Starts from x0 (e.g. the previous refresh's fit) with a small evaluation
+    cap, or from a generic guess. Returns (params, iv_rmse), or (None, inf)
+    when the slice cannot be fitted.
+    """
+    return fit_svi_slices([(k, w, T, weights)], [x0])[0]
+
+
+def ssvi_total_variance(params, k, theta):
+    """SSVI total variance at log moneyness k for ATM total variance theta"""
+    rho, eta, gamma = params
+    phi = eta / (theta**gamma * (1 + theta)**(1 - gamma))
+    return theta / 2 * (1 + rho * phi * k + np.sqrt((phi * k + rho)**2 + 1 - rho**2))
+
+
+def fit_ssvi(slices, x0=None):
+    """
+    Fit SSVI jointly to slices of (k, w, theta).
+
+    The objective evaluates every slice in one vectorized call on the
+    concatenated quotes. Returns (rho, eta, gamma) or None.
+    """
+    if not slices:
+        return None
+    k = np.concatenate([s[0] for s in slices])
+    w = np.concatenate([s[1] for s in slices])
+    theta = np.concatenate([np.full(len(s[0]), s[2]) for s in slices])
+
+    def residuals(x):
+        rho, eta, _ = x
+        # No-butterfly sufficient condition for the power-law phi: eta*(1 + |rho|) <= 2
+        penalty = PENALTY * max(eta * (1 + abs(rho)) - 2, 0.0)
+        return np.append(ssvi_total_variance(x, k, theta) - w, penalty)
+
+    start = np.array(x0 if x0 is not None else (-0.3, 0.5, 0.5), dtype=float)
+    try:
+        result = least_squares(residuals, start, bounds=([-0.999, 1e-4, 0.01], [0.999, 4.0, 0.99]))
+    except (ValueError, np.linalg.LinAlgError):
+        return None
+    return result.x
+
+
+def ssvi_to_svi(params, theta):
+    """Raw SVI parameters of the SSVI slice with ATM total variance theta"""
+    rho, eta, gamma = params
+    phi = eta / (theta**gamma * (1 + theta)**(1 - gamma))
+    return np.array([theta / 2 * (1 - rho**2), theta * phi / 2, rho, -rho / phi, np.sqrt(1 - rho**2) / phi])
+
+
+# Last fit per (symbol, expiry) and per symbol (SSVI), used as warm starts;
+# least recently used entries go first once expiries roll off or tickers
+# are dropped
+WARM_START_CACHE_SIZE = MAX_TICKERS * WARM_STARTS_PER_TICKER
+_warm_starts = OrderedDict()
+_warm_lock = threading.Lock()
+
+
+def _remember_warm_start(key, params):
+    _warm_starts[key] = params
+    _warm_starts.move_to_end(key)
+    while len(_warm_starts) > WARM_START_CACHE_SIZE:
+        _warm_starts.popitem(last=False)
+
+
+def fit_smiles(symbol, slices):
+    """
+    Fit every expiry of a ticker: raw SVI where possible, SSVI otherwise.
+
+    slices is a list of (exp, T, k, w). Raw SVI slices are fitted jointly
+    (see fit_svi_slices), each warm-started from the previous fit for
+    (symbol, exp).
+    Slices without a usable raw SVI fit take their slice of an SSVI surface
+    fitted jointly to all slices (theta = the slice's ATM total variance).
+
+    Returns a dict exp -> (kind, params) with kind 'svi' or 'ssvi' and
+    params always in raw SVI form (see SVI_PARAMS).
+    """
+    if not slices:
+        return {}
+
+    with _warm_lock:
+        warm = {exp: _warm_starts.get((symbol, exp)) for exp, _, _, _ in slices}
+        ssvi_warm = _warm_starts.get((symbol, None))
+
+    results = fit_svi_slices([(k, w, T) for _, T, k, w in slices], [warm[exp] for exp, _, _, _ in slices])
+
+    fits = {}
+    missing = []
+    for (exp, T, k, w), (params, _) in zip(slices, results):
+        if params is not None:
+            fits[exp] = ("svi", params)
+        else:
+            missing.append((exp, float(np.interp(0.0, k, w))))
+
+    ssvi = None
+    if missing:
+        thetas = [float(np.interp(0.0, k, w)) for _, _, k, w in slices]
+        ssvi = fit_ssvi([(k, w, theta) for (_, _, k, w), theta in zip(slices, thetas)], x0=ssvi_warm)
+        if ssvi is not None:
+            for exp, theta in missing:
+                if theta > 0:
+                    fits[exp] = ("ssvi", ssvi_to_svi(ssvi, theta))
+
+    with _warm_lock:
+        for exp, (kind, params) in fits.items():
+            if kind == "svi":
+                _remember_warm_start((symbol, exp), params)
+        if ssvi is not None:
+            _remember_warm_start((symbol, None), ssvi)
+    return fits
@@ -0,0 +1,56 @@
+"""
+Checks that the exposure ladder prices both models on one convention.
+
+Run from the options_dashboard folder:
+    python -m pytest models/test_exposure_ladder.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+_OPTIONS_DASHBOARD = Path(__file__).resolve().parents[1]
+for path in (_OPTIONS_DASHBOARD, _OPTIONS_DASHBOARD.parent):
+    path_str = str(path)
+    if path_str not in sys.path:
+        sys.path.insert(0, path_str)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from models.exposure_ladder import EXPOSURE_MODELS, build_exposure_ladder  # noqa: E402
+
+SPOT, T, R, Q = 100.0, 0.25, 0.03, 0.015
+FLAT_IV = 20.0   # Percent, as quoted in the chains
+
+# Flat 20% chain: Heston with v0 = theta = 0.04 tends to it as vol-of-vol goes to 0
+FLAT_CHAIN = pd.DataFrame({
+    "Strike": np.arange(80.0, 121.0, 5.0),
+    "IV_Call": FLAT_IV, "IV_Put": FLAT_IV,
+    "OI_Call": 1000.0, "OI_Put": 800.0,
+})
+
+
+def relative_gap(heston, black_scholes, model_name):
+    gap = np.abs(heston.exposures[model_name] - black_scholes.exposures[model_name]).max()
+    return gap / np.abs(black_scholes.exposures[model_name]).max()
+
+
+def test_heston_ladder_tends_to_black_scholes_as_vol_of_vol_vanishes():
+    black_scholes = build_exposure_ladder(FLAT_CHAIN, SPOT, T, R, Q)
+    # With kappa -> 0 too, a v0 bump persists like a Black-Scholes vol bump, so vega Greeks agree as well
+    heston = build_exposure_ladder(FLAT_CHAIN, SPOT, T, R, Q, heston_params=(0.04, 1e-4, 0.04, 1e-4, -0.5))
+    for model_name in EXPOSURE_MODELS:
+        assert relative_gap(heston, black_scholes, model_name) < 1e-3, model_name
+
+
+@pytest.mark.parametrize("opt", ["CALL", "PUT"])
+def test_heston_charm_matches_black_scholes_for_both_sides(opt):
+    black_scholes = build_exposure_ladder(FLAT_CHAIN, SPOT, T, R, Q)
+    heston = build_exposure_ladder(FLAT_CHAIN, SPOT, T, R, Q, heston_params=(0.04, 2.0, 0.04, 1e-4, -0.5))
+    side = black_scholes.types == opt
+    for model_name in ("Gamma", "Charm"):
+        gap = np.abs(heston.exposures[model_name][:, side] - black_scholes.exposures[model_name][:, side]).max()
+        assert gap < 1e-3 * np.abs(black_scholes.exposures[model_name][:, side]).max(), model_name
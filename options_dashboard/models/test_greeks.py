@@ -0,0 +1,70 @@
+"""
+Checks for the vectorized Black-Scholes implied-volatility solver.
+
+Run from the options_dashboard folder:
+    python -m pytest models/test_greeks.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+_OPTIONS_DASHBOARD = Path(__file__).resolve().parents[1]
+for path in (_OPTIONS_DASHBOARD, _OPTIONS_DASHBOARD.parent):
+    path_str = str(path)
+    if path_str not in sys.path:
+        sys.path.insert(0, path_str)
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+from scipy.stats import norm  # noqa: E402
+
+from models.greeks import bs_price, charm, implied_volatility  # noqa: E402
+
+S0, R, Q = 100.0, 0.03, 0.01
+
+
+def test_implied_volatility_round_trips_bs_prices():
+    rng = np.random.default_rng(7)
+    n = 2000
+    K = np.exp(rng.uniform(np.log(50.0), np.log(200.0), n))
+    T = rng.uniform(0.02, 3.0, n)
+    sigma = rng.uniform(0.05, 1.5, n)
+    is_call = rng.random(n) < 0.5
+    # Keep strikes within 3 standard deviations, where the price still
+    # carries enough time value to pin down the volatility
+    keep = np.abs(np.log(K/S0))/(sigma*np.sqrt(T)) < 3.0
+    K, T, sigma, is_call = K[keep], T[keep], sigma[keep], is_call[keep]
+
+    prices = bs_price(S0, K, T, R, Q, sigma, is_call)
+    iv = implied_volatility(prices, S0, K, T, R, Q, is_call)
+    np.testing.assert_allclose(iv, sigma, rtol=0, atol=1e-8)
+
+
+def test_implied_volatility_keeps_input_shape():
+    K = np.linspace(80.0, 120.0, 6).reshape(2, 3)
+    prices = bs_price(S0, K, 0.5, R, Q, 0.25)
+    iv = implied_volatility(prices, S0, K, 0.5, R, Q)
+    assert iv.shape == K.shape
+    np.testing.assert_allclose(iv, 0.25, atol=1e-10)
+
+
+def test_implied_volatility_is_nan_outside_arbitrage_bounds():
+    # Zero, above the spot, negative and expired quotes have no implied vol
+    iv = implied_volatility([0.0, 200.0, -1.0], S0, 100.0, 0.5, R, Q)
+    assert np.isnan(iv).all()
+    assert np.isnan(implied_volatility(5.0, S0, 100.0, 0.0, R, Q))
+
+
+@pytest.mark.parametrize("is_call", [True, False])
+@pytest.mark.parametrize("K", [80.0, 100.0, 125.0])
+def test_charm_is_minus_delta_time_decay(is_call, K):
+    sigma, T, h = 0.25, 0.4, 1e-6
+
+    def delta(tau):
+        d1 = (np.log(S0/K) + (R - Q + 0.5*sigma**2)*tau)/(sigma*np.sqrt(tau))
+        return np.exp(-Q*tau)*(norm.cdf(d1) if is_call else norm.cdf(d1) - 1)
+
+    expected = -(delta(T + h) - delta(T - h))/(2*h)
+    assert charm(S0, K, T, R, Q, sigma, is_call=is_call) == pytest.approx(expected, rel=1e-6, abs=1e-8)
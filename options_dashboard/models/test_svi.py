@@ -0,0 +1,102 @@
+"""
+Checks for the SVI/SSVI smile fits.
+
+Run from the options_dashboard folder:
+    python -m pytest models/test_svi.py
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+_OPTIONS_DASHBOARD = Path(__file__).resolve().parents[1]
+for path in (_OPTIONS_DASHBOARD, _OPTIONS_DASHBOARD.parent):
+    path_str = str(path)
+    if path_str not in sys.path:
+        sys.path.insert(0, path_str)
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+from models import svi  # noqa: E402
+
+K = np.linspace(-0.4, 0.4, 17)
+SVI_SLICE = (0.01, 0.1, -0.4, 0.02, 0.2)
+
+
+@pytest.mark.parametrize("params", [(-0.7, 1.2, 0.4), (0.0, 0.5, 0.5), (0.3, 2.0, 0.2)])
+@pytest.mark.parametrize("theta", [0.002, 0.04, 0.5])
+def test_ssvi_to_svi_is_exact(params, theta):
+    raw = svi.ssvi_to_svi(params, theta)
+    np.testing.assert_allclose(svi.svi_total_variance(raw, K), svi.ssvi_total_variance(params, K, theta),
+                               rtol=1e-12, atol=1e-15)
+
+
+def test_fit_svi_recovers_a_raw_svi_slice():
+    T = 0.5
+    w = svi.svi_total_variance(SVI_SLICE, K)
+    params, iv_rmse = svi.fit_svi(K, w, T)
+    assert iv_rmse < 1e-4
+    np.testing.assert_allclose(svi.svi_total_variance(params, K), w, atol=1e-6)
+
+
+@pytest.fixture
+def warm_starts(monkeypatch):
+    monkeypatch.setattr(svi, "_warm_starts", OrderedDict())
+    return svi._warm_starts
+
+
+def test_fit_smiles_falls_back_to_ssvi_for_thin_slices(warm_starts):
+    w = svi.svi_total_variance(SVI_SLICE, K)
+    fits = svi.fit_smiles("TEST", [("full", 0.5, K, w), ("thin", 0.5, K[7:10], w[7:10])])
+    assert fits["full"][0] == "svi"
+    assert fits["thin"][0] == "ssvi"
+    assert list(warm_starts) == [("TEST", "full"), ("TEST", None)]
+
+
+def test_warm_starts_are_bounded(warm_starts, monkeypatch):
+    monkeypatch.setattr(svi, "WARM_START_CACHE_SIZE", 3)
+    w = svi.svi_total_variance(SVI_SLICE, K)
+    for exp in range(5):
+        svi.fit_smiles("TEST", [(exp, 0.5, K, w)])
+    assert list(warm_starts) == [("TEST", 2), ("TEST", 3), ("TEST", 4)]
+
+
+def noisy_slices(n_slices=6, seed=0):
+    rng = np.random.default_rng(seed)
+    slices = []
+    for j in range(n_slices):
+        T = 0.1 + 0.2*j
+        params = (0.02*T + 0.001, 0.08 + 0.02*np.sqrt(j), -0.5 + 0.05*j, 0.02, 0.15 + 0.01*j)
+        slices.append((K, svi.svi_total_variance(params, K)*(1 + 0.01*rng.standard_normal(len(K))), T))
+    return slices
+
+
+def test_stacked_jacobian_matches_finite_differences():
+    slices = [(k, w, T, np.ones_like(k)) for k, w, T in noisy_slices(3)]
+    k, w, weights, owner = svi._stack_slices(slices)
+    x = np.concatenate([svi._svi_default_start(k_, w_) for k_, w_, _, _ in slices])
+    x[0], x[6], x[7] = -0.05, 3.9, 0.9   # Make both penalties active
+    h = 1e-7
+    central = np.array([
+        (svi._svi_residuals(x + e, k, w, weights, owner) - svi._svi_residuals(x - e, k, w, weights, owner))/(2*h)
+        for e in np.eye(len(x))*h
+    ]).T
+    np.testing.assert_allclose(svi._svi_jacobian(x, k, w, weights, owner), central, atol=1e-6)
+
+
+def test_joint_fit_matches_per_slice_fits():
+    slices = noisy_slices()
+    # A slice SVI cannot fit and a thin one must not disturb the others
+    slices.insert(2, (K, 0.05 + 0.04*np.abs(np.sin(12*K)), 0.5))
+    slices.insert(1, (K[:3], K[:3]**2 + 0.01, 0.3))
+    joint = svi.fit_svi_slices(slices)
+    assert joint[1][0] is None and joint[3][0] is None
+    for (k, w, T), (params, iv_rmse) in zip(slices, joint):
+        single, single_rmse = svi.fit_svi_slices([(k, w, T)])[0]
+        if single is None:
+            assert params is None
+        else:
+            assert iv_rmse == pytest.approx(single_rmse, rel=1e-3, abs=1e-6)
@@ -0,0 +1,105 @@
+"""
+Adaptive refresh scheduling
+
+Per-symbol next-due times for the price and option-chain refresh loops.
+Intervals back off outside market hours and for symbols whose data keeps
+coming back unchanged, and tighten for fast-moving symbols or symbols with
+chart windows open.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+PRICE_BASE_INTERVAL = 10.0     # seconds
+OPTIONS_BASE_INTERVAL = 30.0   # seconds
+MIN_INTERVAL = 5.0
+MAX_INTERVAL = 600.0
+
+# Multipliers applied to the base interval per market session
+SESSION_FACTORS = {"regular": 1.0, "extended": 3.0, "closed": 30.0}
+
+FAST_MOVE_PCT = 0.25           # % move between two price refreshes
+UNCHANGED_STREAK = 3           # refreshes without change before backing off
+MAX_UNCHANGED_FACTOR = 8.0
+
+
+def next_interval(base, session, fast_moving=False, charts_open=False, unchanged_streak=0):
+    """Seconds until the next refresh for one symbol."""
+    interval = base * SESSION_FACTORS.get(session, 1.0)
+    if session != "closed":
+        if fast_moving:
+            interval *= 0.5
+        if charts_open:
+            interval *= 0.5
+        if unchanged_streak >= UNCHANGED_STREAK:
+            interval *= min(2.0 ** (unchanged_streak - UNCHANGED_STREAK + 1), MAX_UNCHANGED_FACTOR)
+    return max(MIN_INTERVAL, min(interval, MAX_INTERVAL))
+
+
+@dataclass
+class SymbolSchedule:
+    next_price_at: float = 0.0
+    next_options_at: float = 0.0
+    price_in_flight: bool = False
+    options_in_flight: bool = False
+    last_price: Optional[float] = None
+    fast_moving: bool = False
+    price_unchanged: int = 0
+    options_unchanged: int = 0
+
+
+@dataclass
+class RefreshSchedule:
+    symbols: Dict[str, SymbolSchedule] = field(default_factory=dict)
+
+    def get(self, symbol) -> SymbolSchedule:
+        if symbol not in self.symbols:
+            self.symbols[symbol] = SymbolSchedule()
+        return self.symbols[symbol]
+
+    def prune(self, active_symbols):
+        for symbol in list(self.symbols):
+            if symbol not in active_symbols:
+                del self.symbols[symbol]
+
+    def price_due(self, symbol, now=None):
+        entry = self.get(symbol)
+        now = time.monotonic() if now is None else now
+        return not entry.price_in_flight and now >= entry.next_price_at
+
+    def options_due(self, symbol, now=None):
+        entry = self.get(symbol)
+        now = time.monotonic() if now is None else now
+        return not entry.options_in_flight and now >= entry.next_options_at
+
+    def record_price(self, symbol, price, session, charts_open=False, now=None):
+        """Record a price refresh result (None on failure) and schedule the next one."""
+        entry = self.get(symbol)
+        entry.price_in_flight = False
+        if price is not None and price > 0:
+            prev = entry.last_price
+            if prev:
+                move_pct = abs(price - prev) / prev * 100.0
+                entry.fast_moving = move_pct >= FAST_MOVE_PCT
+                entry.price_unchanged = entry.price_unchanged + 1 if price == prev else 0
+            entry.last_price = price
+        interval = next_interval(
+            PRICE_BASE_INTERVAL, session, entry.fast_moving, charts_open, entry.price_unchanged
+        )
+        now = time.monotonic() if now is None else now
+        entry.next_price_at = now + interval
+        return interval
+
+    def record_options(self, symbol, changed, session, charts_open=False, now=None):
+        """Record an option-chain refresh (changed=None on failure) and schedule the next one."""
+        entry = self.get(symbol)
+        entry.options_in_flight = False
+        if changed is not None:
+            entry.options_unchanged = 0 if changed else entry.options_unchanged + 1
+        interval = next_interval(
+            OPTIONS_BASE_INTERVAL, session, entry.fast_moving, charts_open, entry.options_unchanged
+        )
+        now = time.monotonic() if now is None else now
+        entry.next_options_at = now + interval
+        return interval
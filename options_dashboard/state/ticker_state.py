@@ -1,8 +1,33 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict
+import itertools
 import pandas as pd
 import datetime
 
+# Process-wide counter so every chain snapshot gets a distinct version,
+# even across TickerState instances for the same symbol.
+_data_versions = itertools.count(1)
+
+# Change listeners per symbol, so a subscription outlives its TickerState
+# being replaced by a fresh fetch. Listeners are called as
+# callback(state, change) with change "chain" or "price", on the thread that
+# made the change (the Tk thread for the refresh loops).
+_listeners = {}
+
+
+def subscribe(symbol, callback):
+    """Call callback(state, change) whenever the symbol's chain or price changes."""
+    _listeners.setdefault(symbol, []).append(callback)
+
+
+def unsubscribe(symbol, callback):
+    callbacks = _listeners.get(symbol, [])
+    if callback in callbacks:
+        callbacks.remove(callback)
+    if not callbacks:
+        _listeners.pop(symbol, None)
+
+
 @dataclass
 class TickerState:
     symbol: str
@@ -11,3 +36,67 @@ class TickerState:
     last_updated: datetime.datetime
     is_csv: bool = False
     strike_count_label: str = "40"
+    data_version: int = field(default_factory=lambda: next(_data_versions))
+    # IV surface of the chain at _surface_version (see iv_surface())
+    _surface: object = field(default=None, repr=False, compare=False)
+    _surface_version: int = field(default=None, repr=False, compare=False)
+    # Content hash of the raw quotes behind exp_data_map (see refresh.chain_fingerprint)
+    quotes_fingerprint: dict = field(default=None, repr=False, compare=False)
+
+    def set_exp_data_map(self, exp_data_map, surface=None, fingerprint=None):
+        """
+        Replace the option chain, stamp last_updated and bump data_version so
+        caches keyed on it miss.
+
+        surface is the chain's IV surface when the fetch already built it,
+        fingerprint the content hash of its raw quotes when known.
+        """
+        self.exp_data_map = exp_data_map
+        self.last_updated = datetime.datetime.now()
+        self.data_version = next(_data_versions)
+        self.quotes_fingerprint = fingerprint
+        self.set_iv_surface(surface)
+        self._notify("chain")
+
+    def set_iv_surface(self, surface):
+        """Attach the IV surface built for the current chain (None: build on demand)."""
+        self._surface = surface
+        self._surface_version = self.data_version if surface is not None else None
+
+    @property
+    def chain_spot(self):
+        """Spot the stored chain's surface (and Prob ITM columns) were computed at, if known."""
+        if self._surface is None or self._surface_version != self.data_version:
+            return None
+        return self._surface.spot
+
+    def set_price(self, price):
+        """Update the spot price, notifying subscribers if it moved."""
+        if price == self.price:
+            return
+        self.price = price
+        self._notify("price")
+
+    def _notify(self, change):
+        for callback in list(_listeners.get(self.symbol, ())):
+            try:
+                callback(self, change)
+            except Exception:
+                # One broken window must not stop the others; keep the full trace
+                import traceback
+                print(f"TickerState listener failed for {self.symbol}: {traceback.format_exc()}")
+
+    def iv_surface(self):
+        """
+        Shared IV surface for the current chain.
+
+        Fetches hand over the surface they built; otherwise (e.g. CSV chains)
+        it is built here once per data_version.
+        """
+        if self._surface is None or self._surface_version != self.data_version:
+            from config import RISK_FREE_RATE, DIVIDEND_YIELD
+            from models.iv_surface import build_iv_surface
+            self.set_iv_surface(build_iv_surface(
+                self.exp_data_map, self.price, RISK_FREE_RATE, DIVIDEND_YIELD, symbol=self.symbol
+            ))
+        return self._surface
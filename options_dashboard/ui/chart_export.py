@@ -0,0 +1,458 @@
+"""
+Headless exposure chart rendering for exports (PDF summary, image files, email).
+
+The Tk thread only takes a snapshot of each chart's inputs (chain slice,
+spot, expiry, model, IV surface, Heston parameters). Exposures are computed
+in a process pool, with figures drawn there by the Agg backend for image
+exports; results come back in the order of the snapshots. The PDF summary
+takes plot data from the pool instead and draws vector pages itself.
+
+Plot data and encoded charts are cached (LRU, capped in bytes) per
+(symbol, expiry, model, Heston params, data version, spot), so repeated
+exports, emails and merged windows of unchanged data skip the exposure
+computation and re-encoding. Chart titles show when the chain was fetched,
+which the data version pins, so cached images never carry a stale time.
+"""
+
+import io
+import os
+import datetime
+import multiprocessing
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+
+from config import RISK_FREE_RATE, DIVIDEND_YIELD
+
+
+EXPORT_DPI = 150             # Raster resolution of PNG/JPEG exports
+MIN_POOL_CHARTS = 2          # Fewer charts render in-process (pool start-up costs more)
+RENDER_CACHE_MAX_BYTES = 64 * 1024 * 1024   # Plot data and encoded charts kept for reuse
+
+
+def build_exposure_dataframe(exposure_rows):
+    df = pd.DataFrame(exposure_rows)
+    df["Exposure_Bn"] = df["Exposure"] / 1e9
+    return df
+
+
+def compute_bar_width(strikes):
+    strikes = sorted(strikes)
+    if len(strikes) < 2:
+        return 1.0
+
+    spacing = strikes[1] - strikes[0]
+
+    if spacing <= 1:
+        return spacing * 0.7
+    elif spacing <= 2.5:
+        return spacing * 0.55
+    elif spacing <= 5:
+        return spacing * 0.35
+    else:
+        return spacing * 0.25
+
+
+def compute_xticks(strikes):
+    strikes = sorted([float(s) for s in strikes])
+    if len(strikes) < 2:
+        return strikes
+
+    # Calculate spacing between consecutive strikes
+    spacings = [strikes[i+1] - strikes[i] for i in range(len(strikes)-1)]
+    if not spacings:
+        return strikes
+    
+    # Find the most common spacing (round to nearest 0.5 for grouping)
+    # This handles cases where majority of strikes are spaced by 5, even if some have different spacing
+    from collections import Counter
+    rounded_spacings = [round(spacing * 2) / 2 for spacing in spacings]
+    spacing_counts = Counter(rounded_spacings)
+    most_common_spacing = spacing_counts.most_common(1)[0][0]
+    
+    spacing = float(most_common_spacing)
+
+    # Determine interval based on majority spacing
+    if spacing <= 1:
+        interval = 2
+    elif spacing <= 2.5:
+        interval = 5
+    elif spacing <= 5:
+        interval = 10  # For 5-dollar spacing, show ticks every 10
+    else:
+        interval = int(float(spacing) * 2)
+
+    # Generate ticks based on interval, covering the full range
+    start = int(float(strikes[0]) // interval) * interval
+    end = int((float(strikes[-1]) + interval) // interval) * interval
+
+    # Convert to int for range() to handle numpy types
+    return list(range(int(start), int(end + interval), int(interval)))
+
+
+def snapshot_chart(symbol, date, exp, state, model_name, heston_params=None):
+    """
+    Everything needed to render one exposure chart, detached from the UI.
+
+    Taken on the Tk thread; the chain DataFrame and IV surface are shared,
+    not copied (refreshes replace them rather than mutating them).
+    """
+    from utils.time import time_to_expiration
+
+    return {
+        "symbol": symbol,
+        "date": date,
+        "exp": exp,
+        "df": state.exp_data_map[exp],
+        "spot": float(state.price),
+        "T": time_to_expiration(exp),
+        "model_name": model_name,
+        "heston_params": heston_params,
+        "surface": state.iv_surface(),
+        "data_version": state.data_version,
+        "last_updated": state.last_updated,
+    }
+
+
+class RenderCache:
+    """Thread-safe LRU of values with a cap on their total size in bytes."""
+
+    def __init__(self, max_bytes=RENDER_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()   # key -> (value, size)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+_render_cache = RenderCache()
+
+
+def chart_cache_key(snapshot):
+    """
+    Content key of a chart: data_version is unique per fetched chain (see
+    TickerState), so with the spot it pins the inputs; the model and Heston
+    parameters pin how they are priced.
+    """
+    heston_params = snapshot["heston_params"]
+    return (
+        snapshot["symbol"],
+        snapshot["exp"],
+        snapshot["model_name"],
+        tuple(heston_params) if heston_params is not None else None,
+        snapshot["data_version"],
+        float(snapshot["spot"]),
+    )
+
+
+def _plot_data_size(chart_data):
+    return int(chart_data["df_plot"].memory_usage(deep=True).sum()) + 512
+
+
+def remember_plot_data(snapshot, chart_data):
+    """Cache plot data computed elsewhere (e.g. for a chart window) for a snapshot"""
+    if chart_data is not None:
+        if "data_time" not in chart_data:
+            chart_data = dict(chart_data, data_time=snapshot["last_updated"])
+        _render_cache.put(("plot",) + chart_cache_key(snapshot), chart_data, _plot_data_size(chart_data))
+
+
+def _bytes_key(snapshot, file_format):
+    return ("bytes", file_format) + chart_cache_key(snapshot)
+
+
+def cached_plot_data(snapshot):
+    """exposure_plot_data(snapshot), reused while the chart's inputs are unchanged"""
+    key = ("plot",) + chart_cache_key(snapshot)
+    chart_data = _render_cache.get(key)
+    if chart_data is None:
+        chart_data = exposure_plot_data(snapshot)
+        remember_plot_data(snapshot, chart_data)
+    return chart_data
+
+
+def exposure_plot_data(snapshot):
+    """
+    Plot data (df_plot, model label, total, dealer flip) for a snapshot, as
+    returned by charts_controller.regenerate_chart_data; None without data.
+    """
+    from models.exposure_ladder import FLIP_SEARCH_WIDTH, build_exposure_ladder
+
+    spot, T = snapshot["spot"], snapshot["T"]
+    if spot <= 0 or T <= 0:
+        return None
+    # A ladder of +/- FLIP_SEARCH_WIDTH gives the rows at spot and the dealer flip in one pass
+    ladder = build_exposure_ladder(
+        snapshot["df"], spot, T, RISK_FREE_RATE, DIVIDEND_YIELD,
+        surface=snapshot["surface"], heston_params=snapshot["heston_params"], width=FLIP_SEARCH_WIDTH
+    )
+    rows = ladder.rows_at(spot, snapshot["model_name"])
+    if not rows:
+        return None
+    df_plot = build_exposure_dataframe(rows)
+    model_name = snapshot["model_name"]
+    if snapshot["heston_params"] is not None:
+        model_name = f"{model_name} (Heston)"
+    return {
+        "df_plot": df_plot,
+        "symbol": snapshot["symbol"],
+        "exp_date": snapshot["date"],
+        "model_name": model_name,
+        "total": df_plot["Exposure"].sum() / 1e9,
+        "zero_gamma": ladder.zero_gamma_at(spot),
+        "data_time": snapshot["last_updated"],
+    }
+
+
+def draw_exposure_figure(chart_data):
+    """Exposure bar chart as a standalone Figure (same layout as the chart windows)"""
+    fig = Figure(figsize=(9, 6), dpi=100)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+
+    df_plot = chart_data["df_plot"]
+    calls = df_plot[df_plot["Type"] == "CALL"]
+    puts = df_plot[df_plot["Type"] == "PUT"]
+    strikes = sorted(df_plot["Strike"].unique())
+    bar_width = compute_bar_width(strikes)
+
+    ax.bar(
+        calls["Strike"],
+        calls["Exposure_Bn"],
+        width=bar_width,
+        color="#2ECC71",
+        edgecolor="black",
+        linewidth=0.6,
+        label="CALL",
+    )
+    ax.bar(
+        puts["Strike"],
+        puts["Exposure_Bn"],
+        width=bar_width,
+        color="#E74C3C",
+        edgecolor="black",
+        linewidth=0.6,
+        label="PUT",
+    )
+    ax.axhline(0, color="black", linewidth=1)
+
+    if chart_data["zero_gamma"]:
+        ax.axvline(
+            chart_data["zero_gamma"],
+            color="purple",
+            linestyle="--",
+            linewidth=1.5,
+            label="Dealer Flip",
+        )
+
+    # Time of the chain, not of drawing, so cached encodings stay correct
+    data_time = (chart_data.get("data_time") or datetime.datetime.now()).strftime("%I:%M %p")
+    ax.set_title(
+        f"{chart_data['symbol']} {chart_data['model_name']} Exposure ({chart_data['exp_date']}) | {data_time}",
+        fontsize=14,
+    )
+    ax.set_xlabel("Strike Price", fontsize=12)
+    ax.set_ylabel(f"{chart_data['model_name']} Exposure (Bn)", fontsize=12)
+    xticks = compute_xticks(strikes)
+    ax.set_xticks(xticks)
+    ax.ticklabel_format(style="plain", axis="x")
+    ax.set_xlim(min(strikes), max(strikes))
+    ax.grid(axis="y", linestyle="--", alpha=0.35)
+    ax.legend()
+    return fig
+
+
+def figure_bytes(fig, file_format="png"):
+    """Encode a Figure as png, jpeg or pdf bytes"""
+    buffer = io.BytesIO()
+    if file_format == "pdf":
+        fig.savefig(buffer, format="pdf", bbox_inches="tight")
+    else:
+        fig.savefig(buffer, format=file_format, dpi=EXPORT_DPI, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def render_chart(snapshot, file_format="png", chart_data=None):
+    """
+    Worker: (plot data, encoded chart bytes) for a snapshot, or None when
+    there is nothing to plot. With chart_data the exposures are not
+    recomputed (snapshot may then be None).
+    """
+    if chart_data is None:
+        chart_data = exposure_plot_data(snapshot)
+        if chart_data is None:
+            return None
+    return chart_data, figure_bytes(draw_exposure_figure(chart_data), file_format)
+
+
+def _store(snapshot, file_format, result):
+    if result is None:
+        return None
+    chart_data, data = result
+    remember_plot_data(snapshot, chart_data)
+    _render_cache.put(_bytes_key(snapshot, file_format), data, len(data))
+    return data
+
+
+def render_chart_bytes(snapshot, file_format="png"):
+    """Encoded chart bytes for a snapshot (cached), or None when there is nothing to plot"""
+    data = _render_cache.get(_bytes_key(snapshot, file_format))
+    if data is not None:
+        return data
+    chart_data = _render_cache.get(("plot",) + chart_cache_key(snapshot))
+    return _store(snapshot, file_format, render_chart(snapshot, file_format, chart_data))
+
+
+def _progress_counter(total, progress):
+    done = 0
+
+    def finished():
+        nonlocal done
+        done += 1
+        if progress is not None:
+            progress(done, total)
+
+    return finished
+
+
+def _run_charts(snapshots, tasks, work, store, finished, max_workers):
+    """
+    Run work(*args) for each (index, args) in tasks, in a process pool when
+    there are enough of them, calling store(index, result) and finished()
+    as each completes. Failures are printed and leave the result unset.
+    """
+    def run_in_process(items):
+        for i, args in items:
+            try:
+                store(i, work(*args))
+            except Exception as e:
+                print(f"Failed to render {snapshots[i]['symbol']} {snapshots[i]['date']}: {e}")
+            finished()
+
+    if max_workers is None:
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+    if len(tasks) < MIN_POOL_CHARTS or max_workers <= 1:
+        run_in_process(tasks)
+        return
+
+    remaining = dict(tasks)
+    try:
+        # Spawn on every platform (the Windows default): forking a process
+        # that runs Tk and worker threads is not safe
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {pool.submit(work, *args): i for i, args in tasks}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    store(i, future.result())
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    print(f"Failed to render {snapshots[i]['symbol']} {snapshots[i]['date']}: {e}")
+                del remaining[i]
+                finished()
+    except Exception as e:
+        # Pool could not start or a worker died: finish the rest here
+        print(f"Chart render pool failed ({e}); rendering {len(remaining)} chart(s) in-process")
+        run_in_process(list(remaining.items()))
+
+
+def render_charts(snapshots, file_format="png", progress=None, max_workers=None):
+    """
+    Render snapshots to encoded bytes in a process pool.
+
+    Returns a list aligned with snapshots (None where a chart had no data
+    or failed). Cached encodings are returned as they are, and charts with
+    cached plot data are drawn without recomputing exposures.
+    progress(done, total), if given, is called from this thread as each
+    chart finishes, in completion order.
+    """
+    results = [None] * len(snapshots)
+    finished = _progress_counter(len(snapshots), progress)
+
+    tasks = []
+    for i, snapshot in enumerate(snapshots):
+        results[i] = _render_cache.get(_bytes_key(snapshot, file_format))
+        if results[i] is not None:
+            finished()
+            continue
+        chart_data = _render_cache.get(("plot",) + chart_cache_key(snapshot))
+        # Charts with cached plot data only need drawing; don't ship their chains
+        tasks.append((i, (None if chart_data is not None else snapshot, file_format, chart_data)))
+
+    def store(i, result):
+        results[i] = _store(snapshots[i], file_format, result)
+
+    _run_charts(snapshots, tasks, render_chart, store, finished, max_workers)
+    return results
+
+
+def compute_plot_data(snapshots, progress=None, max_workers=None):
+    """
+    Plot data for each snapshot (None where there is nothing to plot),
+    computing the exposures of uncached charts in a process pool.
+
+    Figures are left to the caller, e.g. to draw vector PDF pages.
+    progress is called as in render_charts.
+    """
+    results = [None] * len(snapshots)
+    finished = _progress_counter(len(snapshots), progress)
+
+    tasks = []
+    for i, snapshot in enumerate(snapshots):
+        results[i] = _render_cache.get(("plot",) + chart_cache_key(snapshot))
+        if results[i] is not None:
+            finished()
+        else:
+            tasks.append((i, (snapshot,)))
+
+    def store(i, chart_data):
+        remember_plot_data(snapshots[i], chart_data)
+        results[i] = chart_data
+
+    _run_charts(snapshots, tasks, exposure_plot_data, store, finished, max_workers)
+    return results
+
+
+def write_pdf_summary(file_path, charts):
+    """One vector PDF page per chart's plot data, in order; returns the page count"""
+    written = 0
+    with PdfPages(file_path) as pdf:
+        for chart_data in charts:
+            if chart_data is None:
+                continue
+            pdf.savefig(draw_exposure_figure(chart_data), bbox_inches="tight")
+            written += 1
+    return written
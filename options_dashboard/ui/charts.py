@@ -9,13 +9,9 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from config import RISK_FREE_RATE, DIVIDEND_YIELD
 from models.dealer import find_zero_gamma
+from ui.chart_export import build_exposure_dataframe, compute_bar_width, compute_xticks
 from utils.time import time_to_expiration
 
-def build_exposure_dataframe(exposure_rows):
-    df = pd.DataFrame(exposure_rows)
-    df["Exposure_Bn"] = df["Exposure"] / 1e9
-    return df
-
 def generate_altair_chart(
     df_plot,
     symbol,
@@ -75,57 +71,160 @@ def open_altair_chart(chart, symbol, expiration):
     chart.save(path)
     webbrowser.open(f"file://{path}")
 
-def compute_bar_width(strikes):
-    strikes = sorted(strikes)
-    if len(strikes) < 2:
-        return 1.0
-
-    spacing = strikes[1] - strikes[0]
-
-    if spacing <= 1:
-        return spacing * 0.7
-    elif spacing <= 2.5:
-        return spacing * 0.55
-    elif spacing <= 5:
-        return spacing * 0.35
-    else:
-        return spacing * 0.25
-
-def compute_xticks(strikes):
-    strikes = sorted([float(s) for s in strikes])
-    if len(strikes) < 2:
-        return strikes
-
-    # Calculate spacing between consecutive strikes
-    spacings = [strikes[i+1] - strikes[i] for i in range(len(strikes)-1)]
-    if not spacings:
-        return strikes
-    
-    # Find the most common spacing (round to nearest 0.5 for grouping)
-    # This handles cases where majority of strikes are spaced by 5, even if some have different spacing
-    from collections import Counter
-    rounded_spacings = [round(spacing * 2) / 2 for spacing in spacings]
-    spacing_counts = Counter(rounded_spacings)
-    most_common_spacing = spacing_counts.most_common(1)[0][0]
-    
-    spacing = float(most_common_spacing)
-
-    # Determine interval based on majority spacing
-    if spacing <= 1:
-        interval = 2
-    elif spacing <= 2.5:
-        interval = 5
-    elif spacing <= 5:
-        interval = 10  # For 5-dollar spacing, show ticks every 10
-    else:
-        interval = int(float(spacing) * 2)
-
-    # Generate ticks based on interval, covering the full range
-    start = int(float(strikes[0]) // interval) * interval
-    end = int((float(strikes[-1]) + interval) // interval) * interval
-
-    # Convert to int for range() to handle numpy types
-    return list(range(int(start), int(end + interval), int(interval)))
+class ExposureChartView:
+    """
+    Exposure bar chart embedded in a Tk parent, drawn once and then updated in place.
+
+    Refreshes move and resize the existing bars, the dealer flip line and the
+    labels instead of building a new Figure, canvas and toolbar. Updates that
+    only change bar heights within the current y-range are blitted.
+    """
+
+    BLIT_MIN_FILL = 0.5  # Rescale instead of blitting once bars fill less of the y-range
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.fig = Figure(figsize=(9, 6), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.zero_line = self.ax.axhline(0, color="black", linewidth=1)
+        self.ax.grid(axis="y", linestyle="--", alpha=0.35)
+        self.call_bars = None
+        self.put_bars = None
+        self.flip = None
+        self._background = None
+        self._drawn = False
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, parent)
+        self.toolbar.update()
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+    def _set_bars(self, bars, strikes, heights, width, color, label):
+        """Reuse the bar container when the strike count is unchanged, else replace it"""
+        if bars is not None and len(bars) == len(strikes):
+            for bar, x, height in zip(bars, strikes, heights):
+                bar.set_x(x - width / 2)
+                bar.set_width(width)
+                bar.set_height(height)
+            return bars
+        if bars is not None:
+            bars.remove()
+        return self.ax.bar(
+            strikes,
+            heights,
+            width=width,
+            color=color,
+            edgecolor="black",
+            linewidth=0.6,
+            label=label
+        )
+
+    def _set_flip(self, zero_gamma):
+        """Move (or hide) the dealer flip line; returns True if its visibility changed"""
+        was_visible = self.flip is not None and self.flip.get_visible()
+        if zero_gamma:
+            if self.flip is None:
+                self.flip = self.ax.axvline(
+                    zero_gamma,
+                    color="purple",
+                    linestyle="--",
+                    linewidth=1.5,
+                    label="Dealer Flip"
+                )
+            else:
+                self.flip.set_xdata([zero_gamma, zero_gamma])
+                self.flip.set_visible(True)
+        elif self.flip is not None:
+            self.flip.set_visible(False)
+        return was_visible != bool(zero_gamma)
+
+    def _update_legend(self):
+        handles = [self.call_bars, self.put_bars]
+        if self.flip is not None and self.flip.get_visible():
+            handles.append(self.flip)
+        self.ax.legend(handles=handles)
+
+    def _redraw(self):
+        self.ax.relim()
+        self.ax.autoscale_view(scalex=False)
+        self._background = None
+        if self._drawn:
+            self.canvas.draw_idle()
+        else:
+            self.canvas.draw()
+            self._drawn = True
+
+    def update(self, df_plot, symbol, expiration, model_name, total_exposure, zero_gamma=None):
+        """Show new exposure data (strikes, heights, labels and flip line)"""
+        calls = df_plot[df_plot["Type"] == "CALL"]
+        puts  = df_plot[df_plot["Type"] == "PUT"]
+        strikes = sorted(df_plot["Strike"].unique())
+        bar_width = compute_bar_width(strikes)
+
+        self.call_bars = self._set_bars(self.call_bars, calls["Strike"], calls["Exposure_Bn"], bar_width, "#2ECC71", "CALL")
+        self.put_bars = self._set_bars(self.put_bars, puts["Strike"], puts["Exposure_Bn"], bar_width, "#E74C3C", "PUT")
+        self._set_flip(zero_gamma)
+
+        current_time = datetime.datetime.now().strftime('%I:%M %p')
+        self.ax.set_title(
+            f"{symbol} {model_name} Exposure ({expiration}) | {current_time}",
+            fontsize=14
+        )
+        self.ax.set_xlabel("Strike Price", fontsize=12)
+        self.ax.set_ylabel(f"{model_name} Exposure (Bn)", fontsize=12)
+        xticks = compute_xticks(strikes)
+        self.ax.set_xticks(xticks)
+        self.ax.ticklabel_format(style="plain", axis="x")
+        self.ax.set_xlim(min(strikes), max(strikes))
+        self._update_legend()
+        self._redraw()
+
+    def update_bars(self, call_exposure_bn, put_exposure_bn, zero_gamma=None):
+        """
+        New bar heights for the same strikes (e.g. a spot scenario).
+
+        Blits the bars and flip line over a cached background while the
+        heights fit the current y-range; otherwise rescales and redraws.
+        """
+        for bar, height in zip(self.call_bars, call_exposure_bn):
+            bar.set_height(height)
+        for bar, height in zip(self.put_bars, put_exposure_bn):
+            bar.set_height(height)
+        legend_changed = self._set_flip(zero_gamma)
+        if legend_changed:
+            self._update_legend()
+
+        values = np.concatenate((np.asarray(call_exposure_bn), np.asarray(put_exposure_bn), [0.0]))
+        low, high = self.ax.get_ylim()
+        fits = low <= values.min() and values.max() <= high
+        if self._drawn and not legend_changed and fits and np.ptp(values) >= self.BLIT_MIN_FILL * (high - low):
+            self._blit()
+        else:
+            self._redraw()
+
+    def _blit(self):
+        """Redraw only the bars and flip line on top of the cached axes background"""
+        moving = list(self.call_bars) + list(self.put_bars)
+        if self.flip is not None and self.flip.get_visible():
+            moving.append(self.flip)
+        key = (self.ax.get_xlim(), self.ax.get_ylim(), tuple(self.fig.bbox.bounds))
+        if self._background is None or self._background[0] != key:
+            for artist in moving:
+                artist.set_visible(False)
+            self.canvas.draw()
+            self._background = (key, self.canvas.copy_from_bbox(self.ax.bbox))
+            for artist in moving:
+                artist.set_visible(True)
+        self.canvas.restore_region(self._background[1])
+        for artist in moving + [self.zero_line]:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
+
+    def close(self):
+        """Release the figure's artists (the Tk widgets go with their window)"""
+        self._background = None
+        self.fig.clear()
+
 
 def embed_matplotlib_chart(
     parent,
@@ -136,64 +235,10 @@ def embed_matplotlib_chart(
     total_exposure,
     zero_gamma=None
 ):
-    fig = Figure(figsize=(9, 6), dpi=100)
-    ax = fig.add_subplot(111)
-    calls = df_plot[df_plot["Type"] == "CALL"]
-    puts  = df_plot[df_plot["Type"] == "PUT"]
-    strikes = sorted(df_plot["Strike"].unique())
-    bar_width = compute_bar_width(strikes)
-
-    ax.bar(
-        calls["Strike"],
-        calls["Exposure_Bn"],
-        width=bar_width,
-        color="#2ECC71",
-        edgecolor="black",
-        linewidth=0.6,
-        label="CALL"
-    )
-
-    ax.bar(
-        puts["Strike"],
-        puts["Exposure_Bn"],
-        width=bar_width,
-        color="#E74C3C",
-        edgecolor="black",
-        linewidth=0.6,
-        label="PUT"
-    )
-
-    ax.axhline(0, color="black", linewidth=1)
-
-    if zero_gamma:
-        ax.axvline(
-            zero_gamma,
-            color="purple",
-            linestyle="--",
-            linewidth=1.5,
-            label="Dealer Flip"
-        )
-
-    current_time = datetime.datetime.now().strftime('%I:%M %p')
-    ax.set_title(
-        f"{symbol} {model_name} Exposure ({expiration}) | {current_time}",
-        fontsize=14
-    )
-    ax.set_xlabel("Strike Price", fontsize=12)
-    ax.set_ylabel(f"{model_name} Exposure (Bn)", fontsize=12)
-    xticks = compute_xticks(strikes)
-    ax.set_xticks(xticks)
-    ax.ticklabel_format(style="plain", axis="x")
-    ax.set_xlim(min(strikes), max(strikes))
-    ax.grid(axis="y", linestyle="--", alpha=0.35)
-    ax.legend()
-    canvas = FigureCanvasTkAgg(fig, master=parent)
-    canvas.draw()
-    toolbar = NavigationToolbar2Tk(canvas, parent)
-    toolbar.update()
-    canvas.get_tk_widget().pack(fill="both", expand=True)
+    view = ExposureChartView(parent)
+    view.update(df_plot, symbol, expiration, model_name, total_exposure, zero_gamma)
     # Bring parent window to front after embedding (embedding can cause focus loss)
     parent.update_idletasks()
     parent.lift()
     parent.focus()
-    return fig
+    return view
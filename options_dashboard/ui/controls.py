@@ -25,12 +25,12 @@ def exposure_model_selector(parent, var):
     return btn
 
 
-def spot_slider(parent, spot, callback):
+def spot_slider(parent, spot, callback, width=0.1, resolution=0.5):
     slider = tk.Scale(
         parent,
-        from_=spot * 0.9,
-        to=spot * 1.1,
-        resolution=0.5,
+        from_=spot * (1 - width),
+        to=spot * (1 + width),
+        resolution=resolution,
         orient=tk.HORIZONTAL,
         label="Spot Scenario",
         command=lambda v: callback(float(v))
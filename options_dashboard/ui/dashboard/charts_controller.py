@@ -6,13 +6,220 @@ import pandas as pd
 from ui import dialogs
 from models.greeks import gamma, vanna, volga, charm, vega
 from models.exposure import gamma_exposure, vanna_exposure, volga_exposure, charm_exposure
+from models.heston_exposure import heston_exposure_params, heston_exposure_rows
+from models.exposure_ladder import LADDER_STEP, LADDER_WIDTH, build_exposure_ladder
+from models.iv_surface import normalize_iv
 
 from ui.charts import build_exposure_dataframe, generate_altair_chart, embed_matplotlib_chart
+from ui.chart_export import cached_plot_data, remember_plot_data, snapshot_chart
 from utils.time import time_to_expiration
 from models.dealer import find_zero_gamma
 from config import RISK_FREE_RATE, DIVIDEND_YIELD
 from ui.charts import open_altair_chart
 from ui.controls import spot_slider
+from ui.dashboard.live_charts import subscribe_chart_window
+
+SLIDER_FRAME_MS = 16  # Spot slider redraws at most once per frame (~60 fps)
+
+def black_scholes_exposure_rows(df, spot, T, model_name, surface=None):
+    """
+    Per-strike exposure rows from Black-Scholes Greeks.
+    
+    Volatilities come from the ticker's IV surface when given (falling back
+    to the row's IV where the surface has no value), otherwise from the row
+    (as a decimal, see normalize_iv).
+    """
+    CONTRACT_MULT = 100
+    rows = []
+    surface_ivs = surface.iv(pd.to_numeric(df["Strike"], errors="coerce").to_numpy(dtype=float), T) if surface is not None else None
+    # Use itertuples() instead of iterrows() for better performance
+    for i, row in enumerate(df.itertuples(index=False)):
+        K = float(row.Strike) if hasattr(row, 'Strike') else 0
+        if K <= 0:
+            continue
+
+        for opt in ("CALL", "PUT"):
+            # Column names are IV_Call, OI_Call, IV_Put, OI_Put (capital C/P)
+            opt_key = opt.capitalize()  # "CALL" -> "Call", "PUT" -> "Put"
+            iv_attr = f"IV_{opt_key}"
+            oi_attr = f"OI_{opt_key}"
+            iv = float(getattr(row, iv_attr, 0) or 0)
+            oi = float(getattr(row, oi_attr, 0) or 0)
+            if iv <= 0 or oi <= 0:
+                continue
+            if surface_ivs is not None and surface_ivs[i] > 0:
+                iv = float(surface_ivs[i])
+            else:
+                iv = normalize_iv(iv)
+
+            sign = 1 if opt == "CALL" else -1
+
+            # ---------- GAMMA ----------
+            if model_name == "Gamma":
+                g = gamma(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
+                scale = oi * CONTRACT_MULT * (spot ** 2) * 0.01
+                exp_val = sign * g * scale   # ONLY gamma uses sign flip
+
+            # ---------- VANNA ----------
+            elif model_name == "Vanna":
+                v = vanna(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
+                scale = oi * CONTRACT_MULT * spot * iv
+                exp_val = sign * abs(v) * scale
+
+            # ---------- VOLGA ----------
+            elif model_name == "Volga":
+                vg = volga(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
+                ve = vega(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
+                scale = oi * ve
+                exp_val = sign * abs(vg) * scale
+
+            # ---------- CHARM ----------
+            else:  # Charm
+                c = charm(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv, is_call=(opt == "CALL"))
+                scale = oi * CONTRACT_MULT * spot
+                exp_val = sign * abs(c) * scale
+
+            rows.append({
+                "Strike": K,
+                "Type": opt,
+                "Exposure": exp_val
+            })
+    return rows
+
+def compute_exposure_rows(self, symbol, df, spot, T, model_name, surface=None):
+    """
+    Exposure rows for the sidebar's pricing model.
+    
+    Returns (rows, model_label). With the Heston pricing model the Greeks
+    come from the calibration cached for this symbol and expiry; without
+    one, falls back to Black-Scholes and the label says so.
+    """
+    pricing_model = self.pricing_model_var.get() if hasattr(self, 'pricing_model_var') else "Black-Scholes"
+    if pricing_model == "Heston":
+        rows = heston_exposure_rows(df, symbol, spot, T, model_name, RISK_FREE_RATE, DIVIDEND_YIELD, surface=surface)
+        if rows is not None:
+            return rows, f"{model_name} (Heston)"
+        print(f"No Heston calibration cached for {symbol}; using Black-Scholes Greeks")
+    return black_scholes_exposure_rows(df, spot, T, model_name, surface), model_name
+
+def compute_exposure_ladder(self, symbol, df, spot, T, model_name, surface=None, pricing_model=None):
+    """
+    Spot ladder of exposures for the sidebar's pricing model (or pricing_model).
+    
+    Returns (ladder, model_label) with the same Heston/Black-Scholes choice
+    and fallback as compute_exposure_rows.
+    """
+    if pricing_model is None:
+        pricing_model = self.pricing_model_var.get() if hasattr(self, 'pricing_model_var') else "Black-Scholes"
+    if pricing_model == "Heston":
+        params = heston_exposure_params(symbol, df, T, surface)
+        if params is not None:
+            ladder = build_exposure_ladder(df, spot, T, RISK_FREE_RATE, DIVIDEND_YIELD, surface, heston_params=params)
+            return ladder, f"{model_name} (Heston)"
+        print(f"No Heston calibration cached for {symbol}; using Black-Scholes Greeks")
+    return build_exposure_ladder(df, spot, T, RISK_FREE_RATE, DIVIDEND_YIELD, surface), model_name
+
+def get_chart_view(self, key):
+    """Open (window, ExposureChartView) for a (symbol, expiration, model) key, or None"""
+    entry = getattr(self, '_chart_views', {}).get(key)
+    if entry is None:
+        return None
+    try:
+        if entry[0].winfo_exists():
+            return entry
+    except tk.TclError:
+        pass
+    self._chart_views.pop(key, None)
+    return None
+
+def register_chart_view(self, key, win, view):
+    """Track an exposure chart so regenerating it reuses the window; forgotten when it closes"""
+    if not hasattr(self, '_chart_views'):
+        self._chart_views = {}
+    if not hasattr(self, '_chart_ladders'):
+        self._chart_ladders = {}
+    self._chart_views[key] = (win, view)
+    
+    def on_destroy(event):
+        # <Destroy> also fires for every child widget of the window
+        if event.widget is not win:
+            return
+        if self._chart_views.get(key, (None,))[0] is win:
+            del self._chart_views[key]
+            self._chart_ladders.pop(key, None)
+        view.close()
+    
+    win.bind("<Destroy>", on_destroy, add="+")
+
+def refresh_live_exposure_chart(self, key, changes):
+    """
+    Redraw an open exposure chart from its ticker's current chain and price.
+    
+    A new chain rebuilds the chart's spot ladder; a price move alone is
+    read off the existing ladder and only changes bar heights.
+    """
+    entry = get_chart_view(self, key)
+    state = self.ticker_data.get(key[0])
+    if entry is None or not state or key[1] not in state.exp_data_map or state.price <= 0:
+        return
+    win, view = entry
+    symbol, exp, model_name = key
+    exposure_model = model_name.replace(" (Heston)", "")
+    spot = state.price
+    ladder = self._chart_ladders.get(key)
+    
+    if ladder is None or "chain" in changes or not ladder.covers(spot):
+        T = time_to_expiration(exp)
+        if T <= 0:
+            return
+        pricing_model = "Heston" if model_name.endswith("(Heston)") else "Black-Scholes"
+        ladder, label = compute_exposure_ladder(
+            self, symbol, state.exp_data_map[exp], spot, T, exposure_model,
+            state.iv_surface(), pricing_model=pricing_model
+        )
+        rows = ladder.rows_at(spot, exposure_model)
+        if label != model_name or not rows:
+            return  # Calibration or quotes gone: keep the last chart
+        self._chart_ladders[key] = ladder
+        df_plot = build_exposure_dataframe(rows)
+        view.update(df_plot, symbol, exp.split(":")[0], model_name, df_plot["Exposure"].sum() / 1e9, ladder.zero_gamma_at(spot))
+    else:
+        values = ladder.exposures_at(spot, exposure_model) / 1e9
+        is_call = ladder.types == "CALL"
+        view.update_bars(values[is_call], values[~is_call], ladder.zero_gamma_at(spot))
+    
+    current_time = datetime.datetime.now().strftime('%I:%M %p')
+    win.title(f"{symbol} {model_name} Exposure - {exp.split(':')[0]} | {current_time}")
+
+def attach_spot_slider(self, win, view, ladder, model_name, spot):
+    """
+    Spot scenario slider for an embedded exposure chart.
+    
+    Moves interpolate the precomputed ladder and update the chart's bars in
+    place. Slider events are coalesced so the chart redraws at most once
+    every SLIDER_FRAME_MS.
+    """
+    is_call = ladder.types == "CALL"
+    pending = {"spot": spot, "after": None}
+    
+    def redraw():
+        pending["after"] = None
+        try:
+            if not win.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        s = pending["spot"]
+        values = ladder.exposures_at(s, model_name) / 1e9
+        view.update_bars(values[is_call], values[~is_call], ladder.zero_gamma_at(s))
+    
+    def on_move(value):
+        pending["spot"] = value
+        if pending["after"] is None:
+            pending["after"] = win.after(SLIDER_FRAME_MS, redraw)
+    
+    resolution = max(round(spot * LADDER_STEP, 2), 0.01)
+    return spot_slider(self.sidebar, spot, on_move, width=LADDER_WIDTH, resolution=resolution)
 
 def generate_selected_chart(self, spot_override=None):
     # Initialize tracking sets if needed (do this first for all views)
@@ -94,57 +301,19 @@ def generate_selected_chart(self, spot_override=None):
 
     T = time_to_expiration(exp)
 
-    CONTRACT_MULT = 100
-    rows = []
-    # Use itertuples() instead of iterrows() for better performance
     df = state.exp_data_map[exp]
-    for row in df.itertuples(index=False):
-        K = float(row.Strike) if hasattr(row, 'Strike') else 0
-        if K <= 0:
-            continue
-
-        for opt in ("CALL", "PUT"):
-            # Column names are IV_Call, OI_Call, IV_Put, OI_Put (capital C/P)
-            opt_key = opt.capitalize()  # "CALL" -> "Call", "PUT" -> "Put"
-            iv_attr = f"IV_{opt_key}"
-            oi_attr = f"OI_{opt_key}"
-            iv = float(getattr(row, iv_attr, 0) or 0)
-            oi = float(getattr(row, oi_attr, 0) or 0)
-            if iv <= 0 or oi <= 0:
-                continue
-
-            sign = 1 if opt == "CALL" else -1
-
-            # ---------- GAMMA ----------
-            if self.model_var.get() == "Gamma":
-                g = gamma(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
-                scale = oi * CONTRACT_MULT * (spot ** 2) * 0.01
-                exp_val = sign * g * scale   # ONLY gamma uses sign flip
-
-            # ---------- VANNA ----------
-            elif self.model_var.get() == "Vanna":
-                v = vanna(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
-                scale = oi * CONTRACT_MULT * spot * iv
-                exp_val = sign * abs(v) * scale
-
-            # ---------- VOLGA ----------
-            elif self.model_var.get() == "Volga":
-                vg = volga(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
-                ve = vega(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
-                scale = oi * ve
-                exp_val = sign * abs(vg) * scale
-
-            # ---------- CHARM ----------
-            else:  # Charm
-                c = charm(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
-                scale = oi * CONTRACT_MULT * spot
-                exp_val = sign * abs(c) * scale
-
-            rows.append({
-                "Strike": K,
-                "Type": opt,
-                "Exposure": exp_val
-            })
+    surface = state.iv_surface()
+    exposure_model = self.model_var.get()
+    
+    # Desktop charts in multi view get a spot slider, driven by a spot ladder
+    # computed once here instead of regenerating the chart on every move
+    ladder = None
+    if (not is_single_view and self.chart_output_var.get() != "Browser"
+            and not getattr(self, '_generating_chart_group', False)):
+        ladder, model_name = compute_exposure_ladder(self, symbol, df, spot, T, exposure_model, surface)
+        rows = ladder.rows_at(spot, exposure_model)
+    else:
+        rows, model_name = compute_exposure_rows(self, symbol, df, spot, T, exposure_model, surface)
 
     if not rows:
         dialogs.warning(
@@ -157,91 +326,125 @@ def generate_selected_chart(self, spot_override=None):
     df_plot = build_exposure_dataframe(rows)
     total = df_plot["Exposure"].sum() / 1e9
 
-    zero_gamma = find_zero_gamma(
-        state.exp_data_map[exp],
-        spot * 0.9,
-        spot * 1.1,
-        60,  # Reduced from 120 to 60 for better performance
-        T,
-        RISK_FREE_RATE,
-        DIVIDEND_YIELD
-    )
+    if ladder is not None:
+        zero_gamma = ladder.zero_gamma_at(spot)
+        if spot == state.price:
+            # Exports and merges of this chart can reuse what is on screen
+            pricing_model = "Heston" if model_name.endswith("(Heston)") else "Black-Scholes"
+            snapshot = snapshot_exposure_chart(self, symbol, exp, exposure_model, pricing_model)
+            if snapshot is not None:
+                remember_plot_data(snapshot, {
+                    "df_plot": df_plot,
+                    "symbol": symbol,
+                    "exp_date": exp.split(":")[0],
+                    "model_name": model_name,
+                    "total": total,
+                    "zero_gamma": zero_gamma,
+                })
+    else:
+        zero_gamma = find_zero_gamma(
+            state.exp_data_map[exp],
+            spot * 0.9,
+            spot * 1.1,
+            60,  # Reduced from 120 to 60 for better performance
+            T,
+            RISK_FREE_RATE,
+            DIVIDEND_YIELD,
+            surface=surface
+        )
 
     if self.chart_output_var.get() == "Browser":
         chart = generate_altair_chart(
             df_plot,
             symbol,
             exp.split(":")[0],
-            self.model_var.get(),
+            model_name,
             spot,
             total,
             zero_gamma
         )
         open_altair_chart(chart, symbol, exp)
     else:
-        win = ctk.CTkToplevel(self.root)
-        win.geometry("950x700")
-        # Set meaningful title based on chart content
         exp_date = exp.split(":")[0]  # Get just the date part
-        model_name = self.model_var.get()
         current_time = datetime.datetime.now().strftime('%I:%M %p')
-        win.title(f"{symbol} {model_name} Exposure - {exp_date} | {current_time}")
-        
-        # Initialize chart windows tracking if not exists
-        if not hasattr(self, '_chart_windows'):
-            self._chart_windows = []
-        
-        # Store window reference
-        self._chart_windows.append(win)
-        
-        # Update clear graphs button state
-        if hasattr(self, 'update_clear_graphs_button_state'):
-            self.update_clear_graphs_button_state()
-        
-        # Update focus bar
-        if hasattr(self, 'update_focus_bar'):
-            self.update_focus_bar()
-        
-        # Embed the chart
-        embed_matplotlib_chart(
-            win,
-            df_plot,
-            symbol,
-            exp_date,
-            model_name,
-            total,
-            zero_gamma
-        )
-        
-        # Bring window to front immediately after embedding
-        win.update_idletasks()
-        win.lift()
-        win.focus()
-        
-        # Bring ALL chart windows to front AFTER chart is embedded
-        # (this ensures previous charts don't get pushed behind)
-        def bring_all_charts_front():
-            if hasattr(self, '_chart_windows') and self._chart_windows:
-                for chart_win in self._chart_windows:
+        view_key = (symbol, exp, model_name)
+        existing = get_chart_view(self, view_key)
+        if not hasattr(self, '_chart_ladders'):
+            self._chart_ladders = {}
+        self._chart_ladders[view_key] = ladder
+        if existing is not None:
+            # Regenerating an open chart refreshes it in place instead of opening another window
+            win, view = existing
+            win.title(f"{symbol} {model_name} Exposure - {exp_date} | {current_time}")
+            view.update(df_plot, symbol, exp_date, model_name, total, zero_gamma)
+            win.lift()
+            win.focus()
+        else:
+            win = ctk.CTkToplevel(self.root)
+            win.geometry("950x700")
+            # Set meaningful title based on chart content
+            win.title(f"{symbol} {model_name} Exposure - {exp_date} | {current_time}")
+            
+            # Initialize chart windows tracking if not exists
+            if not hasattr(self, '_chart_windows'):
+                self._chart_windows = []
+            
+            # Store window reference
+            self._chart_windows.append(win)
+            
+            # Update clear graphs button state
+            if hasattr(self, 'update_clear_graphs_button_state'):
+                self.update_clear_graphs_button_state()
+            
+            # Update focus bar
+            if hasattr(self, 'update_focus_bar'):
+                self.update_focus_bar()
+            
+            # Embed the chart
+            view = embed_matplotlib_chart(
+                win,
+                df_plot,
+                symbol,
+                exp_date,
+                model_name,
+                total,
+                zero_gamma
+            )
+            register_chart_view(self, view_key, win, view)
+            subscribe_chart_window(
+                self, win, state.symbol,
+                lambda changes, key=view_key: refresh_live_exposure_chart(self, key, changes)
+            )
+            
+            # Bring window to front immediately after embedding
+            win.update_idletasks()
+            win.lift()
+            win.focus()
+            
+            # Bring ALL chart windows to front AFTER chart is embedded
+            # (this ensures previous charts don't get pushed behind)
+            def bring_all_charts_front():
+                if hasattr(self, '_chart_windows') and self._chart_windows:
+                    for chart_win in self._chart_windows:
+                        try:
+                            if chart_win.winfo_exists():
+                                chart_win.lift()
+                                chart_win.focus()
+                        except:
+                            pass
+                    # Focus the most recently created window
                     try:
-                        if chart_win.winfo_exists():
-                            chart_win.lift()
-                            chart_win.focus()
+                        if win.winfo_exists():
+                            win.lift()
+                            win.focus()
                     except:
                         pass
-                # Focus the most recently created window
-                try:
-                    if win.winfo_exists():
-                        win.lift()
-                        win.focus()
-                except:
-                    pass
-        
-        # Bring to front after delays to ensure they stay
-        win.after(50, bring_all_charts_front)
-        win.after(150, bring_all_charts_front)
-        win.after(300, bring_all_charts_front)
-        win.after(500, bring_all_charts_front)
+            
+            # Bring to front after delays to ensure they stay
+            win.after(50, bring_all_charts_front)
+            win.after(150, bring_all_charts_front)
+            win.after(300, bring_all_charts_front)
+            win.after(500, bring_all_charts_front)
         
         # For single view, remove from generating set after a delay
         if is_single_view:
@@ -254,12 +457,12 @@ def generate_selected_chart(self, spot_override=None):
             # Don't create slider for single view - it causes infinite loops
             # User can click the button again if they want to change spot price
         else:
-            # For multi view, create slider immediately
-            if not (hasattr(self, '_generating_chart_group') and self._generating_chart_group):
+            # For multi view, create slider immediately; it updates this chart in place
+            if ladder is not None:
                 for w in self.sidebar.winfo_children():
                     if isinstance(w, (tk.Scale, ctk.CTkSlider)):
                         w.destroy()
-                spot_slider(self.sidebar, spot, self.generate_selected_chart)
+                attach_spot_slider(self, win, view, ladder, exposure_model, spot)
 
 
 def generate_chart_group(self):
@@ -827,100 +1030,42 @@ def get_ticker_chart_windows(self, symbol):
     
     return chart_info
 
-def regenerate_chart_data(self, symbol, exp):
-    """Regenerate chart data for a specific symbol and expiration"""
-    from utils.time import time_to_expiration
-    
-    # Get ticker state
-    if symbol not in self.ticker_data:
-        return None
-    
-    state = self.ticker_data[symbol]
+def snapshot_exposure_chart(self, symbol, exp, model_name=None, pricing_model=None):
+    """
+    Inputs of the symbol/expiration chart, detached from the UI (see
+    ui.chart_export), or None. model_name and pricing_model default to the
+    sidebar's; windows pass their own so they keep the model they opened with.
+    """
+    state = self.ticker_data.get(symbol)
     if not state or exp not in state.exp_data_map:
         return None
     
-    # Get expiration data
     df = state.exp_data_map[exp]
-    if df is None or df.empty:
-        return None
-    
-    spot = state.price
-    if spot <= 0:
-        return None
-    
-    T = time_to_expiration(exp)
-    if T <= 0:
+    if df is None or df.empty or state.price <= 0:
         return None
     
-    model_name = self.model_var.get()
-    CONTRACT_MULT = 100
-    rows = []
-    
-    # Generate exposure data
-    for row in df.itertuples(index=False):
-        K = float(row.Strike) if hasattr(row, 'Strike') else 0
-        if K <= 0:
-            continue
-
-        for opt in ("CALL", "PUT"):
-            opt_key = opt.capitalize()
-            iv_attr = f"IV_{opt_key}"
-            oi_attr = f"OI_{opt_key}"
-            iv = float(getattr(row, iv_attr, 0) or 0)
-            oi = float(getattr(row, oi_attr, 0) or 0)
-            if iv <= 0 or oi <= 0:
-                continue
-
-            sign = 1 if opt == "CALL" else -1
+    heston_params = None
+    if pricing_model is None:
+        pricing_model = self.pricing_model_var.get() if hasattr(self, 'pricing_model_var') else "Black-Scholes"
+    if pricing_model == "Heston":
+        heston_params = heston_exposure_params(symbol, df, time_to_expiration(exp), state.iv_surface())
+        if heston_params is None:
+            print(f"No Heston calibration cached for {symbol}; using Black-Scholes Greeks")
+    model_name = model_name or self.model_var.get()
+    return snapshot_chart(symbol, exp.split(":")[0], exp, state, model_name, heston_params)
 
-            if model_name == "Gamma":
-                g = gamma(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
-                scale = oi * CONTRACT_MULT * (spot ** 2) * 0.01
-                exp_val = sign * g * scale
-            elif model_name == "Vanna":
-                v = vanna(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
-                scale = oi * CONTRACT_MULT * spot * iv
-                exp_val = sign * abs(v) * scale
-            elif model_name == "Volga":
-                vg = volga(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
-                ve = vega(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
-                scale = oi * ve
-                exp_val = sign * abs(vg) * scale
-            else:  # Charm
-                c = charm(spot, K, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
-                scale = oi * CONTRACT_MULT * spot
-                exp_val = sign * abs(c) * scale
-
-            rows.append({
-                "Strike": K,
-                "Type": opt,
-                "Exposure": exp_val
-            })
-
-    if not rows:
+def regenerate_chart_data(self, symbol, exp, model_name=None, pricing_model=None):
+    """
+    Regenerate chart data for a specific symbol and expiration (models as
+    in snapshot_exposure_chart).
+    
+    Shared with exports through the render cache, so unchanged charts are
+    not recomputed.
+    """
+    snapshot = snapshot_exposure_chart(self, symbol, exp, model_name, pricing_model)
+    if snapshot is None:
         return None
-
-    df_plot = build_exposure_dataframe(rows)
-    total = df_plot["Exposure"].sum() / 1e9
-
-    zero_gamma = find_zero_gamma(
-        state.exp_data_map[exp],
-        spot * 0.9,
-        spot * 1.1,
-        60,
-        T,
-        RISK_FREE_RATE,
-        DIVIDEND_YIELD
-    )
-    
-    return {
-        "df_plot": df_plot,
-        "symbol": symbol,
-        "exp_date": exp.split(":")[0],
-        "model_name": model_name,
-        "total": total,
-        "zero_gamma": zero_gamma
-    }
+    return cached_plot_data(snapshot)
 
 def merge_ticker_charts_to_new_window(self, symbol):
     """Merge all charts for a ticker into a new tabbed window"""
@@ -997,9 +1142,9 @@ def merge_ticker_charts_to_new_window(self, symbol):
     # Create new merged window with tabs
     merged_win = ctk.CTkToplevel(self.root)
     merged_win.geometry("1000x750")
+    # Fixed for the window's lifetime: later sidebar changes must not switch its model
     model_name = self.model_var.get()
-    current_time = datetime.datetime.now().strftime('%I:%M %p')
-    merged_win.title(f"{symbol} {model_name} Exposure - Merged | {current_time}")
+    pricing_model = self.pricing_model_var.get() if hasattr(self, 'pricing_model_var') else "Black-Scholes"
     
     # Create notebook for organizing charts by expiration (using ttk.Notebook)
     # Use a regular tk.Frame container for the notebook to ensure proper styling
@@ -1027,11 +1172,12 @@ def merge_ticker_charts_to_new_window(self, symbol):
     
     # Create a tab for each expiration and regenerate the chart
     tabs_created = 0
+    tab_views = []
     for exp in sorted_expirations:
         exp_date = exp.split(":")[0] if ":" in exp else exp
         
         # Regenerate chart data for this expiration
-        chart_data = regenerate_chart_data(self, symbol, exp)
+        chart_data = regenerate_chart_data(self, symbol, exp, model_name, pricing_model)
         
         if not chart_data:
             # Skip this expiration if chart data couldn't be regenerated
@@ -1047,7 +1193,7 @@ def merge_ticker_charts_to_new_window(self, symbol):
             chart_container = tk.Frame(tab)
             chart_container.pack(fill="both", expand=True)
             
-            embed_matplotlib_chart(
+            tab_view = embed_matplotlib_chart(
                 chart_container,
                 chart_data["df_plot"],
                 chart_data["symbol"],
@@ -1056,6 +1202,8 @@ def merge_ticker_charts_to_new_window(self, symbol):
                 chart_data["total"],
                 chart_data["zero_gamma"]
             )
+            # Full label, e.g. "Gamma (Heston)", or "Gamma" if no calibration was cached
+            tab_views.append((exp, tab_view, chart_data["model_name"]))
             tabs_created += 1
         except Exception as e:
             # If chart embedding fails, add error message to tab
@@ -1080,11 +1228,34 @@ def merge_ticker_charts_to_new_window(self, symbol):
         )
         return
     
+    model_label = tab_views[0][2]
+    merged_win.title(f"{symbol} {model_label} Exposure - Merged | {datetime.datetime.now().strftime('%I:%M %p')}")
+    
     # Track the merged window in chart windows list
     if not hasattr(self, '_chart_windows'):
         self._chart_windows = []
     self._chart_windows.append(merged_win)
     
+    # Keep every tab live: recompute its chart when the ticker's chain or price changes
+    def refresh_merged(changes):
+        for tab_exp, tab_view, tab_label in tab_views:
+            data = regenerate_chart_data(self, symbol, tab_exp, model_name, pricing_model)
+            if data and data["model_name"] == tab_label:  # Calibration gone: keep the last chart
+                tab_view.update(
+                    data["df_plot"], data["symbol"], data["exp_date"],
+                    data["model_name"], data["total"], data["zero_gamma"]
+                )
+        merged_win.title(f"{symbol} {model_label} Exposure - Merged | {datetime.datetime.now().strftime('%I:%M %p')}")
+    
+    def close_tab_views(event):
+        # <Destroy> also fires for every child widget of the window
+        if event.widget is merged_win:
+            for _, tab_view, _ in tab_views:
+                tab_view.close()
+    
+    subscribe_chart_window(self, merged_win, state.symbol, refresh_merged)
+    merged_win.bind("<Destroy>", close_tab_views, add="+")
+    
     # Update focus bar and button states
     if hasattr(self, 'update_clear_graphs_button_state'):
         self.update_clear_graphs_button_state()
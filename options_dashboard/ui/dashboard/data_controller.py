@@ -15,10 +15,11 @@ from data.schwab_api import (
 from data.csv_loader import load_csv_index
 from data.ticker_history import record_ticker_search
 from ui import dialogs
-from ui.dashboard.tabs import highlight_rows_by_strike, format_row_data
+from ui.dashboard.tabs import render_table, clear_sheet, render_or_defer_tab
 from models.greeks import calculate_prob_itm
+from models.iv_surface import build_iv_surface
 from utils.time import time_to_expiration
-from config import RISK_FREE_RATE
+from config import RISK_FREE_RATE, DIVIDEND_YIELD
 from tksheet import Sheet
 
 
@@ -38,17 +39,30 @@ def get_strike_count_label(dashboard, symbol):
     return persisted_strike_count_label(symbol)
 
 
-def fetch_exp_map_with_prob_itm(client, symbol, price, strike_label):
+def fetch_exp_map(client, symbol, strike_label):
     api_count = strike_count_label_to_api(strike_label)
-    exp_map, expirations = fetch_option_chain(client, symbol, strike_count=api_count)
+    return fetch_option_chain(client, symbol, strike_count=api_count)
+
 
+def add_prob_itm(symbol, exp_map, expirations, price):
+    """
+    Build the chain's IV surface and add Prob ITM columns (in place).
+
+    Returns the surface, to be stored with the chain on its TickerState.
+    """
+    surface = build_iv_surface(exp_map, price, RISK_FREE_RATE, DIVIDEND_YIELD, symbol=symbol)
     for exp_date in expirations:
         df = exp_map.get(exp_date)
         if df is not None and not df.empty:
             T = time_to_expiration(exp_date)
-            exp_map[exp_date] = calculate_prob_itm(df, price, T, RISK_FREE_RATE)
+            exp_map[exp_date] = calculate_prob_itm(df, price, T, RISK_FREE_RATE, surface=surface)
+    return surface
+
 
-    return exp_map, expirations
+def fetch_exp_map_with_prob_itm(client, symbol, price, strike_label):
+    exp_map, expirations = fetch_exp_map(client, symbol, strike_label)
+    surface = add_prob_itm(symbol, exp_map, expirations, price)
+    return exp_map, expirations, surface
 
 
 def on_strike_count_change(dashboard, tab_key, strike_label):
@@ -93,7 +107,7 @@ def on_strike_count_change(dashboard, tab_key, strike_label):
     def worker():
         try:
             price = state.price if state.price else fetch_stock_price(dashboard.client, actual_symbol)
-            exp_map, expirations = fetch_exp_map_with_prob_itm(
+            exp_map, expirations, surface = fetch_exp_map_with_prob_itm(
                 dashboard.client, actual_symbol, price, strike_label
             )
 
@@ -104,6 +118,7 @@ def on_strike_count_change(dashboard, tab_key, strike_label):
                 last_updated=datetime.datetime.now(),
                 strike_count_label=strike_label,
             )
+            new_state.set_iv_surface(surface)
             if state and getattr(state, "_from_single_view", False):
                 new_state._from_single_view = True
 
@@ -165,7 +180,7 @@ def fetch_worker(self, symbol):
     try:
         strike_label = get_strike_count_label(self, symbol)
         price = fetch_stock_price(self.client, symbol)
-        exp_map, expirations = fetch_exp_map_with_prob_itm(
+        exp_map, expirations, surface = fetch_exp_map_with_prob_itm(
             self.client, symbol, price, strike_label
         )
         save_strike_count_label(symbol, strike_label)
@@ -177,6 +192,7 @@ def fetch_worker(self, symbol):
             last_updated=datetime.datetime.now(),
             strike_count_label=strike_label,
         )
+        state.set_iv_surface(surface)
 
         def update_ui():
             # Multi-view should always fetch and store its own data for preset tickers
@@ -206,9 +222,9 @@ def fetch_worker(self, symbol):
                 ui["strike_var"].set(strike_label)
 
             if expirations:
-                ui["exp_dropdown"].configure(values=expirations)
+                # Start on the nearest expiration; hidden tabs render when selected
                 ui["exp_var"].set(expirations[0])
-                self.update_table_for_symbol(symbol, expirations[0])
+                render_or_defer_tab(self, symbol)
             
             # Enable stats breakdown button if it exists (any successful fetch enables it)
             if hasattr(self, 'stats_breakdown_button'):
@@ -292,7 +308,7 @@ def fetch_single_symbol(dashboard, symbol):
         try:
             strike_label = get_strike_count_label(dashboard, symbol)
             price = fetch_stock_price(dashboard.client, symbol)
-            exp_map, expirations = fetch_exp_map_with_prob_itm(
+            exp_map, expirations, surface = fetch_exp_map_with_prob_itm(
                 dashboard.client, symbol, price, strike_label
             )
             save_strike_count_label(symbol, strike_label)
@@ -304,6 +320,7 @@ def fetch_single_symbol(dashboard, symbol):
                 last_updated=datetime.datetime.now(),
                 strike_count_label=strike_label,
             )
+            state.set_iv_surface(surface)
 
             def update():
                 dashboard.ticker_data[symbol] = state
@@ -348,7 +365,7 @@ def fetch_single_symbol_for_view(dashboard, symbol, ticker_var, price_var, exp_v
         try:
             strike_label = get_strike_count_label(dashboard, symbol)
             price = fetch_stock_price(dashboard.client, symbol)
-            exp_map, expirations = fetch_exp_map_with_prob_itm(
+            exp_map, expirations, surface = fetch_exp_map_with_prob_itm(
                 dashboard.client, symbol, price, strike_label
             )
             save_strike_count_label(symbol, strike_label)
@@ -360,6 +377,7 @@ def fetch_single_symbol_for_view(dashboard, symbol, ticker_var, price_var, exp_v
                 last_updated=datetime.datetime.now(),
                 strike_count_label=strike_label,
             )
+            state.set_iv_surface(surface)
 
             def update():
                 # Close fetching dialog before showing completion message
@@ -545,17 +563,14 @@ def fetch_single_symbol_for_view(dashboard, symbol, ticker_var, price_var, exp_v
                                 df = state.exp_data_map.get(expirations[0])
                                 print(f"[SINGLE VIEW SAVE] df={df is not None and not df.empty if df is not None else False}, rows={len(df) if df is not None and not df.empty else 0}")
                                 if df is not None and not df.empty:
-                                    # Convert DataFrame to list of lists for tksheet
-                                    data = []
-                                    for _, row in df.iterrows():
-                                        data.append(format_row_data(row, cols))
-                                    print(f"[SINGLE VIEW SAVE] Setting sheet data with {len(data)} rows")
-                                    sheet.set_sheet_data(data)
-                                    # Highlight rows based on strike price vs stock price
-                                    highlight_rows_by_strike(sheet, df, cols, price)
+                                    print(f"[SINGLE VIEW SAVE] Setting sheet data with {len(df)} rows")
+                                    render_table(
+                                        sheet, df, cols, price,
+                                        cache_key=(symbol, expirations[0], state.data_version),
+                                    )
                                 else:
                                     print(f"[SINGLE VIEW SAVE] No data, clearing sheet")
-                                    sheet.set_sheet_data([])
+                                    clear_sheet(sheet)
                             else:
                                 print(f"[SINGLE VIEW SAVE] WARNING: cols is None, cannot update table")
                         else:
@@ -567,7 +582,7 @@ def fetch_single_symbol_for_view(dashboard, symbol, ticker_var, price_var, exp_v
                         
                         exp_dropdown.configure(values=[])
                         if sheet:
-                            sheet.set_sheet_data([])
+                            clear_sheet(sheet)
                     
                     # Update ticker display label only after successful fetch
                     # Do this for ALL tickers, even those without options
@@ -884,16 +899,10 @@ def load_csv_index_data(self):
                 cols = ui.get("cols")
                 if sheet and cols and state.exp_data_map:
                     df = state.exp_data_map.get(expirations[0])
-                    if df is not None and not df.empty:
-                        # Convert DataFrame to list of lists for tksheet
-                        data = []
-                        for _, row in df.iterrows():
-                            data.append(format_row_data(row, cols))
-                        sheet.set_sheet_data(data)
-                        # Highlight rows based on strike price vs stock price
-                        highlight_rows_by_strike(sheet, df, cols, state.price)
-                    else:
-                        sheet.set_sheet_data([])
+                    render_table(
+                        sheet, df, cols, state.price,
+                        cache_key=(display_symbol, expirations[0], state.data_version),
+                    )
             else:
                 self.update_table_for_symbol(display_symbol, expirations[0])
 
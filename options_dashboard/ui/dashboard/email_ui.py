@@ -13,11 +13,12 @@ import customtkinter as ctk
 
 from style.theme import ACCENT_PRIMARY, TEXT_MUTED, get_fonts
 from ui import dialogs
+from ui.chart_export import render_charts
 from ui.dashboard.charts_controller import has_active_chart_windows
 from ui.dashboard.save_images import (
     chart_list_label,
-    export_chart_to_path,
     get_all_active_charts,
+    snapshot_active_chart,
 )
 from utils.email_sender import add_contact, get_contacts, get_main_account, send_email
 
@@ -466,20 +467,22 @@ def show_send_images_window(dashboard) -> None:
             hover_color=("gray70", "gray35"),
         ).pack(side="left", padx=3)
 
-    def _export_selected_charts(selected_charts: List[Dict]) -> List[str]:
+    def _export_selected_charts(snapshots: List[Dict]) -> List[str]:
         paths: List[str] = []
         temp_dir = tempfile.mkdtemp(prefix="od_charts_")
 
-        for chart in selected_charts:
-            symbol = chart["symbol"]
-            date = chart["date"]
-            safe_date = date.replace("/", "-").replace(":", "-")
+        images = render_charts(snapshots, "png")
+        for snapshot, image in zip(snapshots, images):
+            if image is None:
+                continue
+            safe_date = snapshot["date"].replace("/", "-").replace(":", "-")
             file_path = os.path.join(
                 temp_dir,
-                f"{symbol}_{safe_date}_exposure.png",
+                f"{snapshot['symbol']}_{safe_date}_exposure.png",
             )
-            if export_chart_to_path(dashboard, symbol, date, file_path, "png"):
-                paths.append(file_path)
+            with open(file_path, "wb") as f:
+                f.write(image)
+            paths.append(file_path)
         return paths
 
     def _cleanup_temp_files(paths: List[str]) -> None:
@@ -510,6 +513,16 @@ def show_send_images_window(dashboard) -> None:
             dialogs.warning("No Charts", "Select at least one chart to send.")
             return
 
+        # Chart inputs are read on the Tk thread; the worker only renders
+        snapshots = [
+            snapshot
+            for snapshot in (
+                snapshot_active_chart(dashboard, c["symbol"], c["date"])
+                for c in selected_charts
+            )
+            if snapshot is not None
+        ]
+
         send_btn.configure(state="disabled")
         sending_dialog = dialogs.show_fetching_dialog(
             dashboard.root,
@@ -524,7 +537,7 @@ def show_send_images_window(dashboard) -> None:
             image_count = 0
 
             try:
-                temp_paths = _export_selected_charts(selected_charts)
+                temp_paths = _export_selected_charts(snapshots)
                 image_count = len(temp_paths)
                 if not temp_paths:
                     raise RuntimeError("Could not export any selected charts.")
@@ -11,7 +11,13 @@ from state.app_state import get_state_value, set_state_value
 from data.schwab_api import STRIKE_COUNT_OPTIONS
 from state.strike_count_prefs import initial_strike_count_label
 from ui import dialogs
-from ui.dashboard.tabs import highlight_rows_by_strike, create_stock_tab, format_row_data
+from ui.dashboard.tabs import (
+    create_stock_tab,
+    render_table,
+    clear_sheet,
+    render_or_defer_tab,
+    render_pending_tab,
+)
 from ui.dashboard.data_controller import fetch_single_symbol_for_view
 from ui.dashboard.refresh import manual_refresh_all_tickers
 from ml_features.ticker_autocomplete import TickerAutocomplete
@@ -653,6 +659,22 @@ def build_sidebar(self):
     )
     model_button.pack(pady=(0, 15))
 
+    # Greeks behind the exposure charts (Heston uses the cached calibration)
+    default_pricing_model = get_state_value("exposure_pricing_model", "Black-Scholes")
+    self.pricing_model_var = tk.StringVar(value=default_pricing_model)
+
+    def on_pricing_model_change(value):
+        set_state_value("exposure_pricing_model", value)
+
+    ctk.CTkLabel(self.sidebar, text="Pricing Model").pack(pady=(0, 5))
+    pricing_model_button = ctk.CTkSegmentedButton(
+        self.sidebar,
+        values=["Black-Scholes", "Heston"],
+        variable=self.pricing_model_var,
+        command=on_pricing_model_change
+    )
+    pricing_model_button.pack(pady=(0, 15))
+
     self.stats_breakdown_button = ctk.CTkButton(
         self.sidebar,
         text="Stats Breakdown",
@@ -1054,6 +1076,13 @@ def show_multi_view(self):
         # Bind to notebook tab change event to update Info button
         if hasattr(self, 'notebook') and self.notebook:
             def on_tab_changed(event=None):
+                # Render the newly selected tab if it was refreshed while hidden
+                try:
+                    selected_tab_id = self.notebook.select()
+                    if selected_tab_id:
+                        render_pending_tab(self, self.notebook.tab(selected_tab_id, "text"))
+                except Exception:
+                    pass
                 if hasattr(self, 'update_info_button_state'):
                     self.update_info_button_state()
                 from ui.dashboard.news_controller import update_headline_news_button_state
@@ -1145,39 +1174,13 @@ def show_multi_view(self):
                 else:
                     symbols_to_update.append((symbol, state, ui))
         
-        # Update visible tab immediately, defer others
-        def update_symbol_data(symbol, state, ui, delay=0):
-            def do_update():
-                # Update price
-                if state.price > 0:
-                    ui["price_var"].set(f"${state.price:.2f}")
-                
-                # Update expiration dropdown and table if data exists
-                if state.exp_data_map:
-                    expirations = list(state.exp_data_map.keys())
-                    if expirations:
-                        expirations.sort()
-                        ui["exp_dropdown"].configure(values=expirations)
-                        
-                        current_exp = ui["exp_var"].get()
-                        if current_exp and current_exp in expirations:
-                            ui["exp_var"].set(current_exp)
-                        else:
-                            ui["exp_var"].set(expirations[0])
-                        
-                        # Defer table update to avoid blocking
-                        # Capture values in closure to avoid late binding issues
-                        exp_val = ui["exp_var"].get()
-                        self.root.after(delay + 10, lambda s=symbol, e=exp_val: self.update_table_for_symbol(s, e))
-            
-            if delay == 0:
-                do_update()
-            else:
-                self.root.after(delay, do_update)
-        
-        # Update visible symbol immediately, others with increasing delays
-        for i, (symbol, state, ui) in enumerate(symbols_to_update):
-            update_symbol_data(symbol, state, ui, delay=i * 20)  # 20ms between each update
+        # Update visible tab immediately; hidden tabs are only marked dirty
+        # and get rendered by on_tab_changed when the user selects them
+        for symbol, state, ui in symbols_to_update:
+            if state.price > 0:
+                ui["price_var"].set(f"${state.price:.2f}")
+            if state.exp_data_map:
+                render_or_defer_tab(self, symbol)
     
     self.root.after(50, restore_multi_view_data)
 
@@ -1657,7 +1660,7 @@ def show_single_view(self):
                 self.single_view_exp_dropdown.configure(values=[])
             # Clear the table if sheet exists
             if ui and ui.get("sheet"):
-                ui["sheet"].set_sheet_data([])
+                clear_sheet(ui["sheet"])
             return
         
         # Restore single view data if it was previously fetched
@@ -1787,16 +1790,10 @@ def show_single_view(self):
                             cols = ui.get("cols")
                             if cols:
                                 df = state.exp_data_map.get(selected_exp)
-                                if df is not None and not df.empty:
-                                    # Convert DataFrame to list of lists for tksheet
-                                    data = []
-                                    for _, row in df.iterrows():
-                                        data.append(format_row_data(row, cols))
-                                    sheet.set_sheet_data(data)
-                                    # Highlight rows based on strike price vs stock price
-                                    highlight_rows_by_strike(sheet, df, cols, state.price)
-                                else:
-                                    sheet.set_sheet_data([])
+                                render_table(
+                                    sheet, df, cols, state.price,
+                                    cache_key=(state.symbol, selected_exp, state.data_version),
+                                )
                         
                         # Button state already set above based on expirations
                 
@@ -1819,7 +1816,7 @@ def show_single_view(self):
             self.single_view_exp_dropdown.configure(values=[])
         # Clear the table
         if ui.get("sheet"):
-            ui["sheet"].set_sheet_data([])
+            clear_sheet(ui["sheet"])
         
         # (Code below is unreachable but kept for reference)
         if symbol in self.ticker_data and ui.get("price_var") == self.single_view_price_var:
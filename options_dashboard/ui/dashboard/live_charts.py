@@ -0,0 +1,89 @@
+"""
+Live chart windows.
+
+Open exposure and gamma-profile windows subscribe to their ticker's
+TickerState. A chain or price change from the refresh loops marks the
+window dirty; dirty windows are redrawn from a Tk after() loop that spends
+at most a frame budget per tick, so dozens of live charts cannot starve
+the event loop. Changes arriving while a window is already dirty are
+merged into its next redraw.
+"""
+
+import time
+import traceback
+from collections import OrderedDict
+
+from config import LIVE_CHART_FRAME_BUDGET_MS, LIVE_CHART_TICK_MS
+from state.ticker_state import subscribe, unsubscribe
+
+
+class LiveChartScheduler:
+    """Runs pending chart redraws on the Tk thread within a per-tick time budget."""
+
+    def __init__(self, root, budget_ms=LIVE_CHART_FRAME_BUDGET_MS, tick_ms=LIVE_CHART_TICK_MS):
+        self.root = root
+        self.budget_ms = budget_ms
+        self.tick_ms = tick_ms
+        self._pending = OrderedDict()   # window key -> (refresh, set of changes)
+        self._after = None
+
+    def mark_dirty(self, key, refresh, change):
+        """Queue refresh(changes) for a window; one redraw per window however many changes arrive"""
+        if key in self._pending:
+            self._pending[key][1].add(change)
+        else:
+            self._pending[key] = (refresh, {change})
+        if self._after is None:
+            self._after = self.root.after(self.tick_ms, self._flush)
+
+    def discard(self, key):
+        self._pending.pop(key, None)
+
+    def _flush(self):
+        self._after = None
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        # Oldest first; at least one redraw per tick even if it alone exceeds the budget
+        while self._pending:
+            key, (refresh, changes) = self._pending.popitem(last=False)
+            try:
+                refresh(changes)
+            except Exception:
+                print(f"Live chart update failed for {key}: {traceback.format_exc()}")
+            if time.perf_counter() >= deadline:
+                break
+        if self._pending:
+            self._after = self.root.after(self.tick_ms, self._flush)
+
+
+def get_live_chart_scheduler(self):
+    """The dashboard's scheduler (frame budget from the app settings when set)"""
+    if not hasattr(self, '_live_chart_scheduler'):
+        from state.app_state import get_state_value
+        budget_ms = get_state_value("live_chart_frame_budget_ms", LIVE_CHART_FRAME_BUDGET_MS)
+        self._live_chart_scheduler = LiveChartScheduler(self.root, budget_ms=budget_ms)
+    return self._live_chart_scheduler
+
+
+def subscribe_chart_window(self, win, symbol, refresh):
+    """
+    Keep a chart window live: refresh(changes) runs (throttled) after the
+    symbol's chain or price changes, until the window is destroyed.
+
+    changes is the set of TickerState change kinds ("chain", "price") seen
+    since the window last redrew.
+    """
+    scheduler = get_live_chart_scheduler(self)
+    key = str(win)
+
+    def on_change(state, change):
+        scheduler.mark_dirty(key, refresh, change)
+
+    def on_destroy(event):
+        # <Destroy> also fires for every child widget of the window
+        if event.widget is not win:
+            return
+        unsubscribe(symbol, on_change)
+        scheduler.discard(key)
+
+    subscribe(symbol, on_change)
+    win.bind("<Destroy>", on_destroy, add="+")
@@ -1,28 +1,89 @@
 import threading
+import pandas as pd
 from ui import dialogs
 from data.schwab_api import fetch_stock_price
-from ui.dashboard.data_controller import get_strike_count_label, fetch_exp_map_with_prob_itm
+from ui.dashboard.data_controller import (
+    get_strike_count_label,
+    fetch_exp_map,
+    add_prob_itm,
+    fetch_exp_map_with_prob_itm,
+)
 from state.app_state import get_state_value
-from ui.dashboard.tabs import reapply_highlighting_for_symbol
+from state.refresh_schedule import RefreshSchedule
+from utils.time import market_session
+from ui.dashboard.tabs import (
+    reapply_highlighting_for_symbol,
+    is_tab_visible,
+    render_or_defer_tab,
+)
+
+# How often the refresh loops wake up to check which symbols are due.
+# Per-symbol intervals come from state.refresh_schedule.
+REFRESH_TICK_MS = 2000
 
 def start_auto_refresh(self):
     auto_refresh_price(self)
     auto_refresh_options(self)
 
+def _get_refresh_schedule(self):
+    if not hasattr(self, "refresh_schedule"):
+        self.refresh_schedule = RefreshSchedule()
+    return self.refresh_schedule
+
+def _symbols_with_charts(self):
+    """Tickers that currently have chart windows open (refreshed more often)."""
+    try:
+        from ui.dashboard.charts_controller import get_tickers_with_charts
+        return get_tickers_with_charts(self)
+    except Exception:
+        return set()
+
+def _schedule_tick(self, job_attr, callback):
+    """(Re)arm a refresh loop, cancelling any pending tick so only one loop runs."""
+    pending = getattr(self, job_attr, None)
+    if pending:
+        try:
+            self.root.after_cancel(pending)
+        except Exception:
+            pass
+    setattr(self, job_attr, self.root.after(REFRESH_TICK_MS, lambda: callback(self)))
+
+def chain_fingerprint(exp_map):
+    """Content hash per expiration of a freshly fetched (raw) chain."""
+    return {
+        exp: int(pd.util.hash_pandas_object(df).sum()) if df is not None else None
+        for exp, df in exp_map.items()
+    }
+
+def _chain_changed(state, fingerprint, price):
+    """
+    True if fetched quotes (their fingerprint, at price) differ from the
+    stored chain or its Prob ITM columns were computed at another spot.
+    """
+    return state.quotes_fingerprint != fingerprint or state.chain_spot != price
+
 def auto_refresh_price(self):
     # Check if auto refresh is enabled
     mode = get_state_value("ticker_refresh_mode", "auto")
     if mode != "auto":
         return  # Don't schedule next refresh if in manual mode
     
+    schedule = _get_refresh_schedule(self)
+    session = market_session()
+    charted = _symbols_with_charts(self)
     symbols = list(self.ticker_data.keys())
+    schedule.prune(symbols)
 
     for symbol in symbols:
         state = self.ticker_data.get(symbol)
         if not state or state.is_csv:
             continue
+        if not schedule.price_due(symbol):
+            continue
+        schedule.get(symbol).price_in_flight = True
 
-        def worker(sym=symbol):
+        def worker(sym=symbol, charts_open=symbol in charted):
+            price = None
             try:
                 price = fetch_stock_price(self.client, sym)
                 if price <= 0:
@@ -42,10 +103,13 @@ def auto_refresh_price(self):
                     if sym.startswith("_single_"):
                         return
 
-                    state.price = price
+                    state.set_price(price)
                     ui["price_var"].set(f"${price:.2f}")
-                    # Re-apply highlighting with new price
-                    reapply_highlighting_for_symbol(self, sym)
+                    # Re-apply highlighting with new price (hidden tabs catch up on focus)
+                    if is_tab_visible(self, sym):
+                        reapply_highlighting_for_symbol(self, sym)
+                    else:
+                        ui["_needs_render"] = True
 
                 self.root.after(0, update)
 
@@ -60,13 +124,16 @@ def auto_refresh_price(self):
                     )
             except Exception:
                 pass
+            finally:
+                # Book-keeping happens on the Tk thread to avoid racing the loop
+                self.root.after(
+                    0,
+                    lambda: schedule.record_price(sym, price, session, charts_open)
+                )
 
         threading.Thread(target=worker, daemon=True).start()
 
-    # Only schedule next refresh if in auto mode
-    mode = get_state_value("ticker_refresh_mode", "auto")
-    if mode == "auto":
-        self.root.after(10000, lambda: auto_refresh_price(self))
+    _schedule_tick(self, "_price_refresh_job", auto_refresh_price)
 
 def auto_refresh_options(self):
     # Check if auto refresh is enabled
@@ -74,14 +141,21 @@ def auto_refresh_options(self):
     if mode != "auto":
         return  # Don't schedule next refresh if in manual mode
     
+    schedule = _get_refresh_schedule(self)
+    session = market_session()
+    charted = _symbols_with_charts(self)
     symbols = list(self.ticker_data.keys())
 
     for symbol in symbols:
         state = self.ticker_data.get(symbol)
         if not state or state.is_csv:
             continue
+        if not schedule.options_due(symbol):
+            continue
+        schedule.get(symbol).options_in_flight = True
 
-        def worker(sym=symbol):
+        def worker(sym=symbol, charts_open=symbol in charted):
+            changed = None
             try:
                 state = self.ticker_data.get(sym)
                 if not state:
@@ -89,12 +163,17 @@ def auto_refresh_options(self):
                 price = state.price
 
                 strike_label = get_strike_count_label(self, sym)
-                exp_map, expirations = fetch_exp_map_with_prob_itm(
-                    self.client, sym, price, strike_label
-                )
+                exp_map, expirations = fetch_exp_map(self.client, sym, strike_label)
                 if not expirations:
                     return
 
+                # Identical chain: nothing to store or redraw (and no surface to fit)
+                fingerprint = chain_fingerprint(exp_map)
+                changed = _chain_changed(state, fingerprint, price)
+                if not changed:
+                    return
+                surface = add_prob_itm(sym, exp_map, expirations, price)
+
                 def update():
                     state = self.ticker_data.get(sym)
                     ui = self.ticker_tabs.get(sym)
@@ -109,19 +188,14 @@ def auto_refresh_options(self):
                     if sym.startswith("_single_"):
                         return
 
-                    prev_exp = ui["exp_var"].get()
-                    state.exp_data_map = exp_map
+                    state.set_exp_data_map(exp_map, surface, fingerprint)
                     state.strike_count_label = strike_label
 
                     if ui.get("strike_var"):
                         ui["strike_var"].set(strike_label)
 
-                    ui["exp_dropdown"].configure(values=expirations)
-                    ui["exp_var"].set(
-                        prev_exp if prev_exp in expirations else expirations[0]
-                    )
-
-                    self.update_table_for_symbol(sym, ui["exp_var"].get())
+                    # Only the visible tab redraws; hidden tabs are marked dirty
+                    render_or_defer_tab(self, sym)
 
                 self.root.after(0, update)
 
@@ -136,13 +210,15 @@ def auto_refresh_options(self):
                     )
             except Exception:
                 pass
+            finally:
+                self.root.after(
+                    0,
+                    lambda: schedule.record_options(sym, changed, session, charts_open)
+                )
 
         threading.Thread(target=worker, daemon=True).start()
 
-    # Only schedule next refresh if in auto mode
-    mode = get_state_value("ticker_refresh_mode", "auto")
-    if mode == "auto":
-        self.root.after(30000, lambda: auto_refresh_options(self))
+    _schedule_tick(self, "_options_refresh_job", auto_refresh_options)
 
 def manual_refresh_all_tickers(dashboard):
     """Manually refresh all tickers that have been fetched (both single and multi view)"""
@@ -171,7 +247,7 @@ def manual_refresh_all_tickers(dashboard):
                     def update_price():
                         state = dashboard.ticker_data.get(symbol)
                         if state:
-                            state.price = price
+                            state.set_price(price)
                             # Update UI for multi-view
                             if symbol in dashboard.ticker_tabs:
                                 ui = dashboard.ticker_tabs[symbol]
@@ -187,7 +263,10 @@ def manual_refresh_all_tickers(dashboard):
                                     if ui.get("price_var"):
                                         ui["price_var"].set(f"${price:.2f}")
                             # Re-apply highlighting with new price
-                            reapply_highlighting_for_symbol(dashboard, symbol)
+                            if is_tab_visible(dashboard, symbol) or is_tab_visible(dashboard, single_key):
+                                reapply_highlighting_for_symbol(dashboard, symbol)
+                            elif symbol in dashboard.ticker_tabs:
+                                dashboard.ticker_tabs[symbol]["_needs_render"] = True
                     dashboard.root.after(0, update_price)
                     refreshed_count += 1
             except:
@@ -200,25 +279,22 @@ def manual_refresh_all_tickers(dashboard):
                     continue
                 price = state.price
                 strike_label = get_strike_count_label(dashboard, symbol)
-                exp_map, expirations = fetch_exp_map_with_prob_itm(
+                exp_map, expirations, surface = fetch_exp_map_with_prob_itm(
                     dashboard.client, symbol, price, strike_label
                 )
                 if expirations:
                     def update_options():
                         state = dashboard.ticker_data.get(symbol)
                         if state:
-                            state.exp_data_map = exp_map
+                            state.set_exp_data_map(exp_map, surface)
                             state.strike_count_label = strike_label
                             # Update UI for multi-view
                             if symbol in dashboard.ticker_tabs:
                                 ui = dashboard.ticker_tabs[symbol]
                                 if ui and not ui.get("_is_single_view"):
-                                    prev_exp = ui["exp_var"].get()
                                     if ui.get("strike_var"):
                                         ui["strike_var"].set(strike_label)
-                                    ui["exp_dropdown"].configure(values=expirations)
-                                    ui["exp_var"].set(prev_exp if prev_exp in expirations else expirations[0])
-                                    dashboard.update_table_for_symbol(symbol, ui["exp_var"].get())
+                                    render_or_defer_tab(dashboard, symbol)
                             # Update UI for single-view
                             single_key = f"_single_{symbol}"
                             if single_key in dashboard.ticker_tabs:
@@ -246,7 +322,9 @@ def manual_refresh_all_tickers(dashboard):
                                     if ui.get("exp_var"):
                                         ui["exp_var"].set(selected_exp)
                                     
-                                    dashboard.update_table_for_symbol(symbol, selected_exp)
+                                    # show_single_view re-renders from state when the view opens
+                                    if is_tab_visible(dashboard, single_key):
+                                        dashboard.update_table_for_symbol(single_key, selected_exp)
                     dashboard.root.after(0, update_options)
             except:
                 pass
@@ -3,16 +3,17 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
 from datetime import datetime
-from matplotlib.backends.backend_pdf import PdfPages
-from matplotlib.figure import Figure
-import io
+import threading
 
 from ui import dialogs
-from ui.dashboard.charts_controller import (
-    has_active_chart_windows,
-    regenerate_chart_data
+from ui.chart_export import (
+    cached_plot_data,
+    compute_plot_data,
+    draw_exposure_figure,
+    render_chart_bytes,
+    write_pdf_summary,
 )
-from ui.charts import embed_matplotlib_chart
+from ui.dashboard.charts_controller import has_active_chart_windows, snapshot_exposure_chart
 
 
 def parse_chart_title(title: str) -> dict:
@@ -105,85 +106,41 @@ def find_matching_expiration(self, symbol, date):
     return None
 
 
-def render_chart_figure(self, symbol, date):
-    """Build a matplotlib Figure for the given symbol and expiration date."""
+def snapshot_active_chart(self, symbol, date):
+    """
+    Snapshot the inputs of a chart for headless rendering (Tk thread only:
+    reads the sidebar's model and pricing model). None without data.
+    """
     matching_exp = find_matching_expiration(self, symbol, date)
     if not matching_exp:
         return None
+    return snapshot_exposure_chart(self, symbol, matching_exp)
 
-    chart_data = regenerate_chart_data(self, symbol, matching_exp)
-    if not chart_data:
-        return None
 
-    from ui.charts import compute_bar_width, compute_xticks
-
-    fig = Figure(figsize=(9, 6), dpi=100)
-    ax = fig.add_subplot(111)
-
-    df_plot = chart_data["df_plot"]
-    calls = df_plot[df_plot["Type"] == "CALL"]
-    puts = df_plot[df_plot["Type"] == "PUT"]
-    strikes = sorted(df_plot["Strike"].unique())
-    bar_width = compute_bar_width(strikes)
-
-    ax.bar(
-        calls["Strike"],
-        calls["Exposure_Bn"],
-        width=bar_width,
-        color="#2ECC71",
-        edgecolor="black",
-        linewidth=0.6,
-        label="CALL",
-    )
-    ax.bar(
-        puts["Strike"],
-        puts["Exposure_Bn"],
-        width=bar_width,
-        color="#E74C3C",
-        edgecolor="black",
-        linewidth=0.6,
-        label="PUT",
-    )
-    ax.axhline(0, color="black", linewidth=1)
-
-    if chart_data["zero_gamma"]:
-        ax.axvline(
-            chart_data["zero_gamma"],
-            color="purple",
-            linestyle="--",
-            linewidth=1.5,
-            label="Dealer Flip",
-        )
+def render_chart_figure(self, symbol, date):
+    """Build a matplotlib Figure for the given symbol and expiration date."""
+    snapshot = snapshot_active_chart(self, symbol, date)
+    if snapshot is None:
+        return None
 
-    current_time = datetime.now().strftime("%I:%M %p")
-    ax.set_title(
-        f"{symbol} {chart_data['model_name']} Exposure ({date}) | {current_time}",
-        fontsize=14,
-    )
-    ax.set_xlabel("Strike Price", fontsize=12)
-    ax.set_ylabel(f"{chart_data['model_name']} Exposure (Bn)", fontsize=12)
-    xticks = compute_xticks(strikes)
-    ax.set_xticks(xticks)
-    ax.ticklabel_format(style="plain", axis="x")
-    ax.set_xlim(min(strikes), max(strikes))
-    ax.grid(axis="y", linestyle="--", alpha=0.35)
-    ax.legend()
-    return fig
+    chart_data = cached_plot_data(snapshot)
+    if not chart_data:
+        return None
+    return draw_exposure_figure(chart_data)
 
 
 def export_chart_to_path(self, symbol, date, file_path, file_format="png"):
     """Export a chart to a file path. Returns True on success."""
-    fig = render_chart_figure(self, symbol, date)
-    if fig is None:
+    snapshot = snapshot_active_chart(self, symbol, date)
+    if snapshot is None:
         return False
 
     try:
-        if file_format == "pdf":
-            fig.savefig(file_path, format="pdf", bbox_inches="tight")
-        elif file_format == "jpeg":
-            fig.savefig(file_path, format="jpeg", dpi=150, bbox_inches="tight")
-        else:
-            fig.savefig(file_path, format="png", dpi=150, bbox_inches="tight")
+        data = render_chart_bytes(snapshot, file_format)
+        if data is None:
+            return False
+        with open(file_path, "wb") as f:
+            f.write(data)
         return True
     except Exception:
         return False
@@ -391,56 +348,70 @@ def save_all_to_pdf(self):
     if not file_path:
         return  # User cancelled
     
-    try:
-        # Show progress dialog
-        progress_window = ctk.CTkToplevel(self.root)
-        progress_window.title("Saving PDF")
-        progress_window.geometry("400x150")
-        progress_window.transient(self.root)
-        progress_window.grab_set()
-        
-        progress_label = ctk.CTkLabel(
-            progress_window,
-            text=f"Saving {len(charts)} charts to PDF...",
-            font=ctk.CTkFont(size=12)
-        )
-        progress_label.pack(pady=20)
-        
-        progress_bar = ctk.CTkProgressBar(progress_window)
-        progress_bar.pack(pady=10, padx=20, fill="x")
-        progress_bar.set(0)
-        
-        progress_window.update()
-        
-        # Create PDF
-        with PdfPages(file_path) as pdf:
-            for i, chart in enumerate(charts):
-                # Update progress
-                progress = (i + 1) / len(charts)
-                progress_bar.set(progress)
-                progress_label.configure(text=f"Saving chart {i+1} of {len(charts)}: {chart['symbol']} - {chart['date']}")
-                progress_window.update()
-                
-                # Find matching expiration
-                symbol = chart["symbol"]
-                date = chart["date"]
-
-                fig = render_chart_figure(self, symbol, date)
-                if fig is None:
-                    continue
+    # Snapshot on the Tk thread; exposures are computed in a process pool and
+    # the vector pages drawn on the worker thread
+    snapshots = [
+        snapshot
+        for snapshot in (snapshot_active_chart(self, c["symbol"], c["date"]) for c in charts)
+        if snapshot is not None
+    ]
+    if not snapshots:
+        dialogs.error("Save Error", "Could not export any of the active charts.")
+        return
 
-                pdf.savefig(fig, bbox_inches="tight")
-        
-        progress_window.destroy()
-        
-        dialogs.show_timed_message(
-            self.root,
-            "Success",
-            f"PDF saved with {len(charts)} charts:\n{file_path}",
-            duration_ms=3000
-        )
-        
-    except Exception as e:
-        if 'progress_window' in locals():
-            progress_window.destroy()
-        dialogs.error("Save Error", f"Failed to save PDF:\n{str(e)}")
+    # Show progress dialog
+    progress_window = ctk.CTkToplevel(self.root)
+    progress_window.title("Saving PDF")
+    progress_window.geometry("400x150")
+    progress_window.transient(self.root)
+    progress_window.grab_set()
+
+    progress_label = ctk.CTkLabel(
+        progress_window,
+        text=f"Rendering {len(snapshots)} charts...",
+        font=ctk.CTkFont(size=12)
+    )
+    progress_label.pack(pady=20)
+
+    progress_bar = ctk.CTkProgressBar(progress_window)
+    progress_bar.pack(pady=10, padx=20, fill="x")
+    progress_bar.set(0)
+
+    def show_progress(done, total):
+        try:
+            if progress_window.winfo_exists():
+                progress_bar.set(done / total)
+                progress_label.configure(text=f"Computed chart {done} of {total}")
+        except Exception:
+            pass
+
+    def finish(pages_written, error_message):
+        try:
+            if progress_window.winfo_exists():
+                progress_window.destroy()
+        except Exception:
+            pass
+
+        if error_message:
+            dialogs.error("Save Error", f"Failed to save PDF:\n{error_message}")
+        else:
+            dialogs.show_timed_message(
+                self.root,
+                "Success",
+                f"PDF saved with {pages_written} charts:\n{file_path}",
+                duration_ms=3000
+            )
+
+    def worker():
+        pages_written, error_message = 0, None
+        try:
+            charts_data = compute_plot_data(
+                snapshots,
+                progress=lambda done, total: self.root.after(0, show_progress, done, total),
+            )
+            pages_written = write_pdf_summary(file_path, charts_data)
+        except Exception as e:
+            error_message = str(e)
+        self.root.after(0, finish, pages_written, error_message)
+
+    threading.Thread(target=worker, daemon=True).start()
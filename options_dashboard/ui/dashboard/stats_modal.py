@@ -4,6 +4,7 @@ import numpy as np
 from scipy.stats import norm
 from utils.time import time_to_expiration
 from config import RISK_FREE_RATE, DIVIDEND_YIELD
+from models.iv_surface import normalize_iv
 
 
 def open_stats_modal(root, state, expiration, symbol=None):
@@ -33,18 +34,8 @@ def open_stats_modal(root, state, expiration, symbol=None):
     put_theta = df["Theta_Put"].sum()
     
     # Calculate IV sums (handle percentage conversion if needed)
-    call_iv_sum = 0
-    put_iv_sum = 0
-    for _, row in df.iterrows():
-        iv_call = row.get("IV_Call", 0) or 0
-        iv_put = row.get("IV_Put", 0) or 0
-        # Convert from percentage if needed
-        if iv_call > 1:
-            iv_call = iv_call / 100.0
-        if iv_put > 1:
-            iv_put = iv_put / 100.0
-        call_iv_sum += iv_call
-        put_iv_sum += iv_put
+    call_iv_sum = np.nansum(normalize_iv(df["IV_Call"].to_numpy())) if "IV_Call" in df.columns else 0
+    put_iv_sum = np.nansum(normalize_iv(df["IV_Put"].to_numpy())) if "IV_Put" in df.columns else 0
 
     call_vega = sum(
         bs_vega(S, row["Strike"], T, RISK_FREE_RATE, DIVIDEND_YIELD, row["IV_Call"])
@@ -4,6 +4,8 @@ from tksheet import Sheet
 from style.theme import *
 import customtkinter as ctk
 import pandas as pd
+import numpy as np
+from collections import OrderedDict
 from data.schwab_api import STRIKE_COUNT_OPTIONS
 from state.strike_count_prefs import initial_strike_count_label
 
@@ -44,157 +46,263 @@ def reapply_highlighting_for_symbol(dashboard, symbol):
                 if df is not None and not df.empty:
                     highlight_rows_by_strike(sheet, df, cols, state.price)
 
-def format_row_data(row, cols):
+# Display formats for the options table
+_PERCENT_COLS = ("Prob_ITM_Call", "Prob_ITM_Put")
+_GREEK_PREFIXES = ("Delta_", "Theta_", "Gamma_")
+_GREEK_DECIMALS = 4
+
+# Formatted matrices keyed by (symbol, expiration, data_version, cols)
+_FORMAT_CACHE_MAX = 256
+_format_cache = OrderedDict()
+
+
+def _format_numeric_column(series, fmt, scale=1.0):
+    """Format a column with a printf-style pattern; NaN/blank/non-numeric → ""."""
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+    out = np.full(values.shape, "", dtype=object)
+    mask = np.isfinite(values)
+    if mask.any():
+        out[mask] = np.char.mod(fmt, values[mask] * scale).tolist()
+    return out
+
+
+def _format_text_column(series):
+    """Plain str() of each cell; NaN → ""."""
+    values = series.to_numpy(dtype=object)
+    out = values.astype(str).astype(object)
+    out[pd.isna(values)] = ""
+    return out
+
+
+def format_table_data(df, cols, cache_key=None):
     """
-    Format a DataFrame row for display in tksheet.
-    Formats Prob ITM columns as percentages.
+    Build the full display matrix for tksheet column-by-column.
+    - Prob ITM columns as percentages
+    - Greeks (Delta/Theta/Gamma) with fixed decimals
+    - Everything else as text; NaN shows as blank
+
+    When cache_key (symbol, expiration, data_version) is given the matrix is
+    memoized, so switching back to an already-rendered expiration is free.
     """
-    row_data = []
+    if cache_key is not None:
+        key = (*cache_key, tuple(cols))
+        cached = _format_cache.get(key)
+        if cached is not None:
+            _format_cache.move_to_end(key)
+            return cached
+
+    num_rows = len(df)
+    columns = []
     for c in cols:
-        val = row.get(c, "")
-        # Format Prob ITM columns as percentages
-        if c in ["Prob_ITM_Call", "Prob_ITM_Put"]:
-            try:
-                if pd.notna(val) and val != "":
-                    val = f"{float(val) * 100:.2f}%"
-                else:
-                    val = ""
-            except (ValueError, TypeError):
-                val = ""
+        if c not in df.columns:
+            columns.append(np.full(num_rows, "", dtype=object))
+        elif c in _PERCENT_COLS:
+            columns.append(_format_numeric_column(df[c], "%.2f%%", scale=100.0))
+        elif c.startswith(_GREEK_PREFIXES):
+            columns.append(_format_numeric_column(df[c], f"%.{_GREEK_DECIMALS}f"))
         else:
-            val = str(val) if val != "" else ""
-        row_data.append(val)
-    return row_data
+            columns.append(_format_text_column(df[c]))
+
+    data = np.column_stack(columns).tolist() if columns and num_rows else []
+
+    if cache_key is not None:
+        _format_cache[key] = data
+        while len(_format_cache) > _FORMAT_CACHE_MAX:
+            _format_cache.popitem(last=False)
+    return data
 
 # Bright accents for max open-interest cells (stand out over ITM/OTM row colors)
 _MAX_CALL_OI_BG = "#00e5ff"  # cyan
 _MAX_PUT_OI_BG = "#ff9100"   # amber/orange
 _MAX_OI_FG = "#000000"
 
+# Per-cell highlight codes → (bg, fg); 0 means no highlight
+_HL_NONE = 0
+_HL_ITM_PUT = 1
+_HL_OTM_CALL = 2
+_HL_MAX_CALL_OI = 3
+_HL_MAX_PUT_OI = 4
+_HIGHLIGHT_COLORS = {
+    _HL_ITM_PUT: ("#ffcccc", None),
+    _HL_OTM_CALL: ("#ccffcc", None),
+    _HL_MAX_CALL_OI: (_MAX_CALL_OI_BG, _MAX_OI_FG),
+    _HL_MAX_PUT_OI: (_MAX_PUT_OI_BG, _MAX_OI_FG),
+}
+
+
+def _numeric_column(df, col_name, fill=0.0):
+    """Column as float array; empty/invalid → fill."""
+    if col_name not in df.columns:
+        return np.full(len(df), fill, dtype=float)
+    values = pd.to_numeric(df[col_name], errors="coerce").to_numpy(dtype=float, copy=True)
+    values[~np.isfinite(values)] = fill
+    return values
+
+
+def _max_oi_mask(oi):
+    """Rows holding the highest positive open interest (ties all match)."""
+    if oi.size == 0:
+        return np.zeros(0, dtype=bool)
+    max_oi = oi.max()
+    if max_oi <= 0:
+        return np.zeros(oi.shape, dtype=bool)
+    return oi == max_oi
+
+
+def compute_highlight_codes(df, cols, stock_price):
+    """
+    Build a rows × cols matrix of highlight codes for the options table.
+    - Strike <= stock_price: ITM put columns (light red)
+    - Strike > stock_price: OTM call columns (light green)
+    - Max OI_Call / OI_Put cells override with bright accents
+    """
+    num_rows = len(df)
+    codes = np.zeros((num_rows, len(cols)), dtype=np.int8)
+    if num_rows == 0:
+        return codes
+
+    lowered = [c.lower() for c in cols]
+    put_cols = np.array(["put" in c for c in lowered], dtype=bool)
+    call_cols = np.array(["call" in c for c in lowered], dtype=bool)
+
+    # ITM/OTM row coloring (requires a valid spot price and the Strike column)
+    if "Strike" in cols and stock_price and stock_price > 0:
+        strikes = _numeric_column(df, "Strike")
+        valid = strikes > 0
+        itm = valid & (strikes <= stock_price)
+        otm = valid & (strikes > stock_price)
+        codes[np.ix_(itm, put_cols)] = _HL_ITM_PUT
+        codes[np.ix_(otm, call_cols)] = _HL_OTM_CALL
+
+    # Overlay brightest accents on the peak call / put open-interest cells
+    if "OI_Call" in cols:
+        codes[_max_oi_mask(_numeric_column(df, "OI_Call")), cols.index("OI_Call")] = _HL_MAX_CALL_OI
+    if "OI_Put" in cols:
+        codes[_max_oi_mask(_numeric_column(df, "OI_Put")), cols.index("OI_Put")] = _HL_MAX_PUT_OI
+
+    return codes
 
-def _oi_value(row, col_name: str) -> float:
-    """Parse an OI cell to float; empty/invalid → 0."""
+
+def _apply_highlight(sheet, cells, bg, fg):
     try:
-        val = row.get(col_name, 0)
-        if val is None or val == "" or (isinstance(val, float) and pd.isna(val)):
-            return 0.0
-        return float(val)
-    except (ValueError, TypeError):
-        return 0.0
+        sheet.highlight_cells(cells=cells, bg=bg, fg=fg if fg else False, redraw=False)
+    except TypeError:
+        sheet.highlight_cells(cells=cells, bg=bg, redraw=False)
 
 
-def highlight_max_oi_cells(sheet, df, cols):
+def highlight_rows_by_strike(sheet, df, cols, stock_price):
     """
-    Highlight the OI_Call / OI_Put cells with the highest open interest.
-    Call max → bright cyan; Put max → bright amber. Ties highlight every match.
+    Highlight rows in the sheet based on strike price vs stock price, plus the
+    max OI_Call / OI_Put cells (see compute_highlight_codes).
+
+    The last applied code matrix is kept on the sheet, so a price tick only
+    touches cells whose code changed (rows whose ITM status flipped), using one
+    batched dehighlight plus one batched highlight call per colour.
     """
     if not sheet or df is None or df.empty:
         return
 
-    try:
-        call_col_idx = cols.index("OI_Call")
-    except ValueError:
-        call_col_idx = None
-    try:
-        put_col_idx = cols.index("OI_Put")
-    except ValueError:
-        put_col_idx = None
-
-    if call_col_idx is None and put_col_idx is None:
+    codes = compute_highlight_codes(df, cols, stock_price)
+    prev = getattr(sheet, "_highlight_codes", None)
+
+    full_repaint = prev is None or prev.shape != codes.shape
+    if full_repaint:
+        # Unknown prior state: wipe everything and paint from scratch
+        sheet.dehighlight_cells(all_=True, redraw=False)
+        changed = codes != _HL_NONE
+        stale = np.zeros(codes.shape, dtype=bool)
+    else:
+        changed = codes != prev
+        stale = changed & (prev != _HL_NONE)
+
+    sheet._highlight_codes = codes
+    if not full_repaint and not changed.any():
         return
 
-    call_ois = [_oi_value(row, "OI_Call") for _, row in df.iterrows()]
-    put_ois = [_oi_value(row, "OI_Put") for _, row in df.iterrows()]
-
-    if call_col_idx is not None and call_ois:
-        max_call = max(call_ois)
-        if max_call > 0:
-            for row_idx, oi in enumerate(call_ois):
-                if oi == max_call:
-                    try:
-                        sheet.highlight_cells(
-                            row=row_idx,
-                            column=call_col_idx,
-                            bg=_MAX_CALL_OI_BG,
-                            fg=_MAX_OI_FG,
-                        )
-                    except TypeError:
-                        sheet.highlight_cells(
-                            row=row_idx, column=call_col_idx, bg=_MAX_CALL_OI_BG
-                        )
-
-    if put_col_idx is not None and put_ois:
-        max_put = max(put_ois)
-        if max_put > 0:
-            for row_idx, oi in enumerate(put_ois):
-                if oi == max_put:
-                    try:
-                        sheet.highlight_cells(
-                            row=row_idx,
-                            column=put_col_idx,
-                            bg=_MAX_PUT_OI_BG,
-                            fg=_MAX_OI_FG,
-                        )
-                    except TypeError:
-                        sheet.highlight_cells(
-                            row=row_idx, column=put_col_idx, bg=_MAX_PUT_OI_BG
-                        )
+    if stale.any():
+        rows, columns = np.nonzero(stale)
+        sheet.dehighlight_cells(cells=list(zip(rows.tolist(), columns.tolist())), redraw=False)
 
+    for code, (bg, fg) in _HIGHLIGHT_COLORS.items():
+        rows, columns = np.nonzero(changed & (codes == code))
+        if rows.size:
+            _apply_highlight(sheet, list(zip(rows.tolist(), columns.tolist())), bg, fg)
 
-def highlight_rows_by_strike(sheet, df, cols, stock_price):
+    sheet.redraw()
+
+def _strike_key(df):
+    """Identity of a table's row layout: the ordered tuple of strikes."""
+    if "Strike" not in df.columns:
+        return (len(df),)
+    return tuple(df["Strike"].tolist())
+
+
+def clear_sheet(sheet):
+    """Empty the sheet and forget the last rendered matrix."""
+    sheet.set_sheet_data([])
+    sheet._rendered_data = []
+    sheet._highlight_codes = None
+    sheet._rendered_strikes = ()
+
+
+def render_sheet_rows(sheet, data, strikes):
     """
-    Highlight rows in the sheet based on strike price vs stock price
-    - Strike <= stock_price: light red (#ffcccc) on columns with "put" in name
-    - Strike > stock_price: light green (#ccffcc) on columns with "call" in name
-    Then highlight max OI_Call / OI_Put cells with bright accents.
+    Push a formatted matrix into the sheet, touching only the cells that changed.
+
+    The previously rendered matrix is kept on the sheet. A full set_sheet_data
+    reset only happens when the strike set differs from the last render (or the
+    sheet was repopulated elsewhere); otherwise changed cells are written with
+    set_cell_data and the sheet is redrawn once.
     """
-    if not sheet or df is None or df.empty:
-        return
+    prev_data = getattr(sheet, "_rendered_data", None)
+    prev_strikes = getattr(sheet, "_rendered_strikes", None)
+
+    needs_reset = (
+        prev_data is None
+        or prev_strikes != strikes
+        or len(prev_data) != len(data)
+        or sheet.get_total_rows() != len(data)
+    )
 
-    # Find the Strike column index
-    try:
-        strike_col_idx = cols.index("Strike")
-    except ValueError:
-        strike_col_idx = None
+    if needs_reset:
+        # tksheet keeps a reference to the list it is given and mutates it on
+        # set_cell_data, so hand it a copy to keep cached matrices intact
+        sheet.set_sheet_data([list(row) for row in data])
+        sheet._highlight_codes = None
+    else:
+        changed = False
+        for row_idx, (new_row, old_row) in enumerate(zip(data, prev_data)):
+            if new_row == old_row:
+                continue
+            for col_idx, value in enumerate(new_row):
+                if col_idx >= len(old_row) or old_row[col_idx] != value:
+                    sheet.set_cell_data(row_idx, col_idx, value, redraw=False)
+                    changed = True
+        if changed:
+            sheet.redraw()
 
-    num_rows = len(df)
+    sheet._rendered_data = data
+    sheet._rendered_strikes = strikes
 
-    # First, clear all highlights by setting bg to None/default for all option columns
-    # This ensures old highlights are removed before applying new ones
-    try:
-        for row_idx in range(num_rows):
-            for col_idx, col_name in enumerate(cols):
-                if "call" in col_name.lower() or "put" in col_name.lower():
-                    try:
-                        sheet.highlight_cells(row=row_idx, column=col_idx, bg="")
-                    except Exception:
-                        pass
-    except Exception:
-        pass
-
-    # ITM/OTM row coloring (requires a valid spot price)
-    if strike_col_idx is not None and stock_price and stock_price > 0:
-        for row_idx, (_, row) in enumerate(df.iterrows()):
-            try:
-                strike = float(row.get("Strike", 0) or 0)
-                if strike <= 0:
-                    continue
-
-                if strike <= stock_price:
-                    bg_color = "#ffcccc"
-                    for col_idx, col_name in enumerate(cols):
-                        if "put" in col_name.lower():
-                            sheet.highlight_cells(row=row_idx, column=col_idx, bg=bg_color)
-                else:
-                    bg_color = "#ccffcc"
-                    for col_idx, col_name in enumerate(cols):
-                        if "call" in col_name.lower():
-                            sheet.highlight_cells(row=row_idx, column=col_idx, bg=bg_color)
-            except (ValueError, TypeError):
-                continue
 
-    # Overlay brightest accents on the peak call / put open-interest cells
-    highlight_max_oi_cells(sheet, df, cols)
+def render_table(sheet, df, cols, stock_price, cache_key=None):
+    """
+    Render an expiration's DataFrame into a sheet and re-apply highlighting.
+    Used by both the multi-view tabs and the single view.
+    cache_key is (symbol, expiration, data_version); see format_table_data.
+    """
+    if not sheet or not cols:
+        return
+    if df is None or df.empty:
+        clear_sheet(sheet)
+        return
+
+    data = format_table_data(df, cols, cache_key)
+
+    render_sheet_rows(sheet, data, _strike_key(df))
+
+    # Highlight rows based on strike price vs stock price
+    highlight_rows_by_strike(sheet, df, cols, stock_price)
 
 def rebuild_tabs(self):
     for tab in self.notebook.tabs():
@@ -245,21 +353,9 @@ def rebuild_tabs(self):
                         ui["strike_var"].set(label)
                     
                     # Update expiration dropdown and table if data exists
+                    # (hidden tabs are rendered when they are selected)
                     if state.exp_data_map:
-                        expirations = list(state.exp_data_map.keys())
-                        if expirations:
-                            expirations.sort()
-                            ui["exp_dropdown"].configure(values=expirations)
-                            
-                            # Try to restore previously selected expiration, or use first
-                            current_exp = ui["exp_var"].get()
-                            if current_exp and current_exp in expirations:
-                                ui["exp_var"].set(current_exp)
-                            else:
-                                ui["exp_var"].set(expirations[0])
-                            
-                            # Update table with the selected expiration
-                            self.update_table_for_symbol(symbol, ui["exp_var"].get())
+                        render_or_defer_tab(self, symbol)
     
     # Defer restoration to allow UI to update first
     if hasattr(self, 'root'):
@@ -394,19 +490,75 @@ def update_table_for_symbol(self, symbol, expiration):
     df = state.exp_data_map.get(expiration)
     if df is None or df.empty:
         # Clear the sheet if no data
-        sheet.set_sheet_data([])
+        clear_sheet(sheet)
         return
 
-    # Convert DataFrame to list of lists for tksheet
-    data = []
-    for _, row in df.iterrows():
-        data.append(format_row_data(row, cols))
-    
-    # Update the sheet with new data
-    sheet.set_sheet_data(data)
-    
-    # Highlight rows based on strike price vs stock price
-    highlight_rows_by_strike(sheet, df, cols, state.price)
+    render_table(
+        sheet, df, cols, state.price,
+        cache_key=(actual_symbol, expiration, state.data_version),
+    )
+
+def is_tab_visible(self, tab_key):
+    """
+    True when tab_key's table is on screen: the selected notebook page while the
+    multi view is shown, or the single view for "_single_" entries.
+    """
+    ui = self.ticker_tabs.get(tab_key)
+    if not ui:
+        return False
+    try:
+        if ui.get("_is_single_view"):
+            single_view = getattr(self, "single_view", None)
+            return bool(single_view and single_view.winfo_ismapped())
+
+        notebook = getattr(self, "notebook", None)
+        multi_view = getattr(self, "multi_view", None)
+        if not notebook or not ui.get("tab"):
+            return False
+        if multi_view is not None and not multi_view.winfo_ismapped():
+            return False
+        return notebook.select() == str(ui["tab"])
+    except Exception:
+        return False
+
+def sync_tab_with_state(self, symbol):
+    """
+    Push the stored TickerState for a multi-view tab into its expiration
+    dropdown and table, and clear its pending-render flag.
+    """
+    ui = self.ticker_tabs.get(symbol)
+    state = self.ticker_data.get(symbol)
+    if not ui:
+        return
+    ui["_needs_render"] = False
+    if not state or not state.exp_data_map:
+        return
+
+    expirations = sorted(state.exp_data_map.keys())
+    prev_exp = ui["exp_var"].get()
+    ui["exp_dropdown"].configure(values=expirations)
+    ui["exp_var"].set(prev_exp if prev_exp in expirations else expirations[0])
+    self.update_table_for_symbol(symbol, ui["exp_var"].get())
+
+def render_or_defer_tab(self, symbol):
+    """
+    Render a multi-view tab now if it is visible; otherwise only mark it dirty.
+    Hidden tabs are rendered by render_pending_tab when they get selected, so
+    background refreshes of off-screen tickers cost only the fetch and parse.
+    """
+    ui = self.ticker_tabs.get(symbol)
+    if not ui:
+        return
+    if is_tab_visible(self, symbol):
+        sync_tab_with_state(self, symbol)
+    else:
+        ui["_needs_render"] = True
+
+def render_pending_tab(self, symbol):
+    """Render a tab whose data changed while it was hidden (see render_or_defer_tab)."""
+    ui = self.ticker_tabs.get(symbol)
+    if ui and ui.get("_needs_render"):
+        sync_tab_with_state(self, symbol)
 
 def on_expiration_change(self, event, symbol):
     ui = self.ticker_tabs.get(symbol)
@@ -0,0 +1,171 @@
+"""
+Checks for the chart render cache.
+
+Run from the options_dashboard folder:
+    python -m pytest ui/test_chart_export.py
+"""
+
+from __future__ import annotations
+
+import datetime
+import re
+import sys
+from pathlib import Path
+
+_OPTIONS_DASHBOARD = Path(__file__).resolve().parents[1]
+for path in (_OPTIONS_DASHBOARD, _OPTIONS_DASHBOARD.parent):
+    path_str = str(path)
+    if path_str not in sys.path:
+        sys.path.insert(0, path_str)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from state.ticker_state import TickerState  # noqa: E402
+from ui import chart_export  # noqa: E402
+from ui.chart_export import (  # noqa: E402
+    RenderCache,
+    cached_plot_data,
+    chart_cache_key,
+    compute_plot_data,
+    draw_exposure_figure,
+    render_chart_bytes,
+    render_charts,
+    snapshot_chart,
+    write_pdf_summary,
+)
+
+
+def test_eviction_keeps_total_size_within_cap():
+    cache = RenderCache(max_bytes=100)
+    for i in range(10):
+        cache.put(i, f"chart {i}", 30)
+        assert cache.size <= cache.max_bytes
+    # Only the three most recent entries fit
+    assert [cache.get(i) for i in range(10)] == [None] * 7 + ["chart 7", "chart 8", "chart 9"]
+    assert cache.size == 90
+
+
+def test_get_refreshes_recency():
+    cache = RenderCache(max_bytes=100)
+    cache.put("a", 1, 40)
+    cache.put("b", 2, 40)
+    assert cache.get("a") == 1
+    cache.put("c", 3, 40)   # Evicts "b", the least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_replacing_a_key_counts_its_size_once():
+    cache = RenderCache(max_bytes=100)
+    cache.put("a", 1, 60)
+    cache.put("a", 2, 30)
+    assert cache.size == 30
+    assert cache.get("a") == 2
+
+
+def test_oversized_values_are_not_cached():
+    cache = RenderCache(max_bytes=100)
+    cache.put("small", 1, 50)
+    cache.put("huge", 2, 101)
+    assert cache.get("huge") is None
+    assert cache.get("small") == 1
+    assert cache.size == 50
+
+
+def test_clear_resets_size():
+    cache = RenderCache(max_bytes=100)
+    cache.put("a", 1, 50)
+    cache.clear()
+    assert cache.size == 0 and cache.get("a") is None
+
+
+def test_cache_key_follows_chain_version_and_spot():
+    snapshot = {
+        "symbol": "SPY", "exp": "2026-12-18", "model_name": "Heston",
+        "heston_params": [2.0, 0.04, 0.5, -0.7], "data_version": 7, "spot": 500,
+    }
+    key = chart_cache_key(snapshot)
+    assert key == chart_cache_key(dict(snapshot, heston_params=(2.0, 0.04, 0.5, -0.7), spot=500.0))
+    assert key != chart_cache_key(dict(snapshot, data_version=8))
+    assert key != chart_cache_key(dict(snapshot, spot=501))
+
+
+@pytest.fixture
+def chart_state(monkeypatch):
+    """A flat chain on a TickerState, with a fresh render cache"""
+    monkeypatch.setattr(chart_export, "_render_cache", RenderCache())
+    exp = (datetime.date.today() + datetime.timedelta(days=60)).isoformat() + ":60"
+    chain = pd.DataFrame({
+        "Strike": np.arange(80.0, 121.0, 5.0),
+        "IV_Call": 20.0, "IV_Put": 20.0,
+        "OI_Call": 1000.0, "OI_Put": 800.0,
+    })
+    state = TickerState(symbol="TEST", price=100.0, exp_data_map={exp: chain},
+                        last_updated=datetime.datetime(2026, 1, 2, 9, 30))
+    return state, exp
+
+
+@pytest.fixture
+def encodes(monkeypatch):
+    calls = []
+    figure_bytes = chart_export.figure_bytes
+
+    def counting(fig, file_format="png"):
+        calls.append(file_format)
+        return figure_bytes(fig, file_format)
+
+    monkeypatch.setattr(chart_export, "figure_bytes", counting)
+    return calls
+
+
+def test_rendered_bytes_are_cached_per_format(chart_state, encodes):
+    state, exp = chart_state
+    snapshot = snapshot_chart("TEST", exp.split(":")[0], exp, state, "Gamma")
+    png = render_chart_bytes(snapshot)
+    assert png.startswith(b"\x89PNG")
+    assert render_chart_bytes(snapshot_chart("TEST", exp.split(":")[0], exp, state, "Gamma")) is png
+    assert render_charts([snapshot, snapshot], max_workers=1) == [png, png]
+    assert encodes == ["png"]
+
+    assert render_chart_bytes(snapshot, "pdf").startswith(b"%PDF")
+    assert encodes == ["png", "pdf"]
+
+
+def test_new_chain_misses_the_byte_cache(chart_state, encodes):
+    state, exp = chart_state
+    render_chart_bytes(snapshot_chart("TEST", exp.split(":")[0], exp, state, "Gamma"))
+    state.set_exp_data_map(dict(state.exp_data_map))
+    render_chart_bytes(snapshot_chart("TEST", exp.split(":")[0], exp, state, "Gamma"))
+    assert encodes == ["png", "png"]
+
+
+def test_chart_title_shows_the_chain_time(chart_state):
+    state, exp = chart_state
+    chart_data = cached_plot_data(snapshot_chart("TEST", exp.split(":")[0], exp, state, "Gamma"))
+    title = draw_exposure_figure(chart_data).axes[0].get_title()
+    assert title.endswith("| 09:30 AM")
+
+
+def test_pdf_summary_has_one_vector_page_per_chart(chart_state, tmp_path):
+    state, exp = chart_state
+    snapshots = [snapshot_chart("TEST", exp.split(":")[0], exp, state, model) for model in ("Gamma", "Charm")]
+    charts = compute_plot_data(snapshots, max_workers=1) + [None]
+    path = tmp_path / "summary.pdf"
+    assert write_pdf_summary(path, charts) == 2
+    content = path.read_bytes()
+    assert len(re.findall(rb"/Type\s*/Page\b(?!s)", content)) == 2
+    assert b"/Subtype /Image" not in content
+
+
+def test_pool_plot_data_keeps_snapshot_order(chart_state):
+    state, exp = chart_state
+    models = ("Gamma", "Vanna", "Charm")
+    snapshots = [snapshot_chart("TEST", exp.split(":")[0], exp, state, model) for model in models]
+    progress = []
+    charts = compute_plot_data(snapshots, progress=lambda done, total: progress.append((done, total)), max_workers=2)
+    assert [chart["model_name"] for chart in charts] == list(models)
+    assert progress[-1] == (3, 3)
+    # Cached now: the same objects come back without recomputing
+    assert all(a is b for a, b in zip(compute_plot_data(snapshots), charts))
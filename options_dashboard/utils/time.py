@@ -18,3 +18,36 @@ def time_to_expiration(expiration_str):
     except Exception:
         # Fallback ~1 week
         return 7 / 365.0
+
+# US equity session boundaries (Eastern time, minutes since midnight)
+_PREMARKET_OPEN = 4 * 60
+_REGULAR_OPEN = 9 * 60 + 30
+_REGULAR_CLOSE = 16 * 60
+_AFTER_HOURS_CLOSE = 20 * 60
+
+
+def market_session(now=None):
+    """
+    Classify the current US equity session: "regular", "extended" or "closed".
+    Weekends are closed; exchange holidays are not tracked.
+    If Eastern time can't be resolved (no tz database), assume "regular" so
+    callers never back off by mistake.
+    """
+    try:
+        from zoneinfo import ZoneInfo
+        eastern = ZoneInfo("America/New_York")
+    except Exception:
+        return "regular"
+
+    # Naive datetimes are treated as local time
+    now = datetime.datetime.now(eastern) if now is None else now.astimezone(eastern)
+
+    if now.weekday() >= 5:
+        return "closed"
+
+    minutes = now.hour * 60 + now.minute
+    if _REGULAR_OPEN <= minutes < _REGULAR_CLOSE:
+        return "regular"
+    if _PREMARKET_OPEN <= minutes < _AFTER_HOURS_CLOSE:
+        return "extended"
+    return "closed"